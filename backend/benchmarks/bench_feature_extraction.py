@@ -0,0 +1,54 @@
+"""Micro-benchmark for post feature extraction.
+
+Run from backend/:
+    python -m benchmarks.bench_feature_extraction
+"""
+
+import random
+import timeit
+
+from src.engine.feature_extractor import (
+    extract_post_features,
+    extract_post_features_batch,
+)
+
+# Token mixes roughly matching what users score
+ENGLISH = [
+    "launch", "today", "what", "do", "you", "think?", "great", "thread:", "this",
+    "is", "how", "we", "shipped", "it.", "#AI", "@sela", "https://x.com/a?b=1",
+    "🚀", "reply!", "(1/5)", "the", "new", "feature", "works", "fast",
+]
+KOREAN = [
+    "안녕하세요", "오늘은", "새로운", "기능을", "소개합니다.", "어떻게", "생각하세요?",
+    "#AI", "@sela", "🚀", "정말", "빠릅니다!", "스레드", "🧵", "댓글", "남겨주세요",
+]
+
+
+def make_post(tokens: list[str], length: int, rng: random.Random) -> str:
+    out = ""
+    while len(out) < length:
+        out += rng.choice(tokens) + " "
+    return out[:length]
+
+
+def per_post_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    rng = random.Random(1)
+    print(f"{'input':<22}{'per post':>12}{'batch of 200':>16}")
+    for name, tokens in (("english", ENGLISH), ("korean", KOREAN)):
+        for length in (280, 4000):
+            post = make_post(tokens, length, rng)
+            posts = [make_post(tokens, length, rng) for _ in range(200)]
+            number = 2000 if length <= 280 else 200
+            single = per_post_us(lambda: extract_post_features(post), number)
+            batch = per_post_us(
+                lambda: extract_post_features_batch(posts), max(number // 200, 1)
+            ) / len(posts)
+            print(f"{name + ' ' + str(length) + ' chars':<22}{single:>10.1f}us{batch:>14.1f}us")
+
+
+if __name__ == "__main__":
+    main()
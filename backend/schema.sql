@@ -46,6 +46,17 @@ CREATE TABLE IF NOT EXISTS post_context_cache (
     expires_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '15 minutes')
 );
 
+-- 포스트 해석 캐시 (대상 포스트의 Claude 해석, 컨텍스트 캐시보다 오래 보관)
+CREATE TABLE IF NOT EXISTS post_interpretations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    post_id TEXT UNIQUE NOT NULL,
+    content_hash TEXT NOT NULL,
+    interpretation TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '7 days')
+);
+
 -- 분석 통계 (서비스 사용량 추적)
 CREATE TABLE IF NOT EXISTS analysis_stats (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -61,6 +72,7 @@ CREATE INDEX IF NOT EXISTS idx_profile_cache_expires ON profile_cache(expires_at
 CREATE INDEX IF NOT EXISTS idx_profile_analyses_username ON profile_analyses(x_username);
 CREATE INDEX IF NOT EXISTS idx_post_context_cache_post_id ON post_context_cache(post_id);
 CREATE INDEX IF NOT EXISTS idx_post_context_cache_expires ON post_context_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_post_interpretations_expires ON post_interpretations(expires_at);
 CREATE INDEX IF NOT EXISTS idx_analysis_stats_created ON analysis_stats(created_at DESC);
 
 -- 복합 인덱스 (자주 사용되는 쿼리 패턴 최적화)
@@ -75,6 +87,7 @@ BEGIN
     DELETE FROM profile_cache WHERE expires_at < NOW();
     DELETE FROM profile_analyses WHERE expires_at < NOW();
     DELETE FROM post_context_cache WHERE expires_at < NOW();
+    DELETE FROM post_interpretations WHERE expires_at < NOW();
 END;
 $$ LANGUAGE plpgsql;
 
@@ -89,10 +102,12 @@ $$ LANGUAGE plpgsql;
 ALTER TABLE profile_cache ENABLE ROW LEVEL SECURITY;
 ALTER TABLE profile_analyses ENABLE ROW LEVEL SECURITY;
 ALTER TABLE post_context_cache ENABLE ROW LEVEL SECURITY;
+ALTER TABLE post_interpretations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE analysis_stats ENABLE ROW LEVEL SECURITY;
 
 -- 모든 사용자에게 읽기/쓰기 권한 부여
 CREATE POLICY "Allow all access to profile_cache" ON profile_cache FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow all access to profile_analyses" ON profile_analyses FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow all access to post_context_cache" ON post_context_cache FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "Allow all access to post_interpretations" ON post_interpretations FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow all access to analysis_stats" ON analysis_stats FOR ALL USING (true) WITH CHECK (true);
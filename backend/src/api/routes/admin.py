@@ -2,7 +2,15 @@
 
 from fastapi import APIRouter
 
+from src.cache import get_cache_stats
+from src.db.activity_buffer import get_activity_buffer
+from src.db.cache_cleanup import get_cache_cleanup_stats
 from src.db.supabase_client import SupabaseCache
+from src.services.llm_gateway import get_llm_gateway
+from src.services.sela_api_client import (
+    get_profile_flight_stats,
+    get_profile_store_stats,
+)
 
 router = APIRouter()
 cache = SupabaseCache()
@@ -12,8 +20,9 @@ cache = SupabaseCache()
 async def cleanup_expired_cache():
     """Clean up expired cache entries from all cache tables.
 
-    This endpoint should be called periodically (e.g., hourly via cron)
-    to prevent cache tables from growing indefinitely.
+    The API already runs this periodically in-process (see
+    CACHE_CLEANUP_INTERVAL_SECONDS); this endpoint triggers a run on demand.
+    Only row counts come back from Supabase, not the deleted rows.
 
     Returns:
         dict with count of deleted rows per table
@@ -26,3 +35,21 @@ async def cleanup_expired_cache():
         "deleted": deleted_counts,
         "total_deleted": total_deleted,
     }
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get hit/miss counters for in-process caches and request coalescing.
+
+    "llm" reports Claude token usage per call site, including how much
+    input was served from the provider-side prompt cache.
+    """
+    llm = get_llm_gateway()
+    return {
+        "caches": get_cache_stats(),
+        "profile_scrapes": get_profile_flight_stats(),
+        "profile_store": get_profile_store_stats(),
+        "llm": llm.stats() if llm else {},
+        "activity_log": get_activity_buffer().stats(),
+        "cache_cleanup": get_cache_cleanup_stats(),
+    }
@@ -1,34 +1,46 @@
 """Post analysis API routes."""
 
+import asyncio
+import json
 import re
+from collections.abc import AsyncIterator
 from typing import Literal, Optional
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
-from pydantic import BaseModel
-
-from src.services.score_predictor import ScorePredictor
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from src.config import get_settings
+from src.services.score_predictor import (
+    ScorePredictor,
+    PostAnalysisResult,
+    ContextInfo,
+    QuickTip,
+    ScoringSession,
+)
 from src.services.content_optimizer import ContentOptimizer
-from src.db.supabase_client import SupabaseCache
+from src.db.activity_buffer import get_activity_buffer
 
 router = APIRouter()
+
+MAX_BATCH_DRAFTS = 200
+MAX_BATCH_TOP_K = 10
+
 predictor = ScorePredictor()
 optimizer = ContentOptimizer()
-cache = SupabaseCache()
 
 
-async def _log_activity_background(activity_data: dict) -> None:
-    """Background task to log user activity without blocking main response."""
-    try:
-        await cache.log_user_activity(
-            user_handle=activity_data["user_handle"],
-            action_type=activity_data["action_type"],
-            target_handle=activity_data["target_handle"],
-            target_url=activity_data["target_url"],
-            post_content=activity_data["post_content"],
-            scores=activity_data["scores"],
-            quick_tips=activity_data["quick_tips"],
-        )
-    except Exception as log_error:
-        print(f"Background activity log failed: {log_error}")
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Stream SSE messages without proxy buffering."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 def extract_username_from_url(url: Optional[str]) -> Optional[str]:
@@ -50,6 +62,9 @@ class PostAnalyzeRequest(BaseModel):
     target_post_url: Optional[str] = None
     media_type: Optional[Literal["image", "video", "gif"]] = None
     target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None  # Target post language for reply/quote
+    # Seconds to wait for AI tips before falling back to rule-based ones
+    # (default ANALYZE_BUDGET_SECONDS, 0 = no limit)
+    budget_seconds: Optional[float] = Field(default=None, ge=0, le=60)
 
 
 class ScoresResponse(BaseModel):
@@ -100,8 +115,61 @@ class PostAnalysisResponse(BaseModel):
     context: Optional[ContextResponse] = None
 
 
+def _to_context_response(context: ContextInfo) -> ContextResponse:
+    """Build the API response for a reply/quote target post."""
+    return ContextResponse(
+        target_post_id=context.target_post.tweet_id,
+        target_post_content=context.target_post.content,
+        target_author=context.target_post.username,
+        context_adjustments=context.context_adjustments,
+        recommendations=context.recommendations,
+    )
+
+
+def _to_tip_responses(tips: list[QuickTip]) -> list[QuickTipResponse]:
+    return [
+        QuickTipResponse(
+            tip_id=tip.tip_id,
+            description=tip.description,
+            impact=tip.impact,
+            target_score=tip.target_score,
+            selectable=tip.selectable,
+        )
+        for tip in tips
+    ]
+
+
+def _to_analysis_response(result: PostAnalysisResult) -> PostAnalysisResponse:
+    """Build the API response for one analyzed post."""
+    response = PostAnalysisResponse(
+        scores=ScoresResponse(**result.scores.to_dict()),
+        breakdown=ProbabilitiesResponse(
+            p_favorite=result.probabilities.p_favorite,
+            p_reply=result.probabilities.p_reply,
+            p_repost=result.probabilities.p_repost,
+            p_quote=result.probabilities.p_quote,
+            p_click=result.probabilities.p_click,
+            p_profile_click=result.probabilities.p_profile_click,
+            p_share=result.probabilities.p_share,
+            p_dwell=result.probabilities.p_dwell,
+            p_video_view=result.probabilities.p_video_view,
+            p_follow_author=result.probabilities.p_follow_author,
+            p_not_interested=result.probabilities.p_not_interested,
+            p_block_author=result.probabilities.p_block_author,
+            p_mute_author=result.probabilities.p_mute_author,
+            p_report=result.probabilities.p_report,
+        ),
+        quick_tips=_to_tip_responses(result.quick_tips),
+    )
+
+    if result.context:
+        response.context = _to_context_response(result.context)
+
+    return response
+
+
 @router.post("/analyze", response_model=PostAnalysisResponse)
-async def analyze_post(request: PostAnalyzeRequest, background_tasks: BackgroundTasks):
+async def analyze_post(request: PostAnalyzeRequest):
     """Analyze a post and predict scores."""
     try:
         result = await predictor.predict(
@@ -111,46 +179,10 @@ async def analyze_post(request: PostAnalyzeRequest, background_tasks: Background
             target_post_url=request.target_post_url,
             media_type=request.media_type,
             target_language=request.target_language,
+            budget_seconds=request.budget_seconds,
         )
 
-        response = PostAnalysisResponse(
-            scores=ScoresResponse(**result.scores.to_dict()),
-            breakdown=ProbabilitiesResponse(
-                p_favorite=result.probabilities.p_favorite,
-                p_reply=result.probabilities.p_reply,
-                p_repost=result.probabilities.p_repost,
-                p_quote=result.probabilities.p_quote,
-                p_click=result.probabilities.p_click,
-                p_profile_click=result.probabilities.p_profile_click,
-                p_share=result.probabilities.p_share,
-                p_dwell=result.probabilities.p_dwell,
-                p_video_view=result.probabilities.p_video_view,
-                p_follow_author=result.probabilities.p_follow_author,
-                p_not_interested=result.probabilities.p_not_interested,
-                p_block_author=result.probabilities.p_block_author,
-                p_mute_author=result.probabilities.p_mute_author,
-                p_report=result.probabilities.p_report,
-            ),
-            quick_tips=[
-                QuickTipResponse(
-                    tip_id=tip.tip_id,
-                    description=tip.description,
-                    impact=tip.impact,
-                    target_score=tip.target_score,
-                    selectable=tip.selectable,
-                )
-                for tip in result.quick_tips
-            ],
-        )
-
-        if result.context:
-            response.context = ContextResponse(
-                target_post_id=result.context.target_post.tweet_id,
-                target_post_content=result.context.target_post.content,
-                target_author=result.context.target_post.username,
-                context_adjustments=result.context.context_adjustments,
-                recommendations=result.context.recommendations,
-            )
+        response = _to_analysis_response(result)
 
         # Log user activity in background (non-blocking)
         # Get target_handle from context, or extract from URL as fallback
@@ -160,8 +192,8 @@ async def analyze_post(request: PostAnalyzeRequest, background_tasks: Background
             else extract_username_from_url(request.target_post_url)
         )
 
-        # Prepare data for background task
-        activity_data = {
+        # Queue the activity row; it's written later in a bulk insert
+        get_activity_buffer().add({
             "user_handle": request.username,
             "action_type": request.post_type,
             "target_handle": target_handle,
@@ -172,14 +204,192 @@ async def analyze_post(request: PostAnalyzeRequest, background_tasks: Background
                 {"tip_id": t.tip_id, "description": t.description, "impact": t.impact}
                 for t in result.quick_tips
             ],
-        }
-        background_tasks.add_task(_log_activity_background, activity_data)
+        })
 
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --- Batch Analyze Endpoint ---
+
+class PostBatchAnalyzeRequest(BaseModel):
+    username: str
+    contents: list[str] = Field(min_length=1, max_length=MAX_BATCH_DRAFTS)
+    post_type: Literal["original", "reply", "quote", "thread"] = "original"
+    target_post_url: Optional[str] = None
+    media_type: Optional[Literal["image", "video", "gif"]] = None
+    target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None
+    top_k: int = Field(default=3, ge=0, le=MAX_BATCH_TOP_K)  # Drafts that get AI tips
+    budget_seconds: Optional[float] = Field(default=None, ge=0, le=60)
+
+
+class PostBatchItemResponse(BaseModel):
+    rank: int
+    index: int  # Position in the request's contents
+    content: str
+    overall: float
+    scores: ScoresResponse
+    breakdown: ProbabilitiesResponse
+    quick_tips: list[QuickTipResponse]
+
+
+class PostBatchAnalysisResponse(BaseModel):
+    results: list[PostBatchItemResponse]  # Best overall score first
+    context: Optional[ContextResponse] = None
+
+
+@router.post("/analyze-batch", response_model=PostBatchAnalysisResponse)
+async def analyze_post_batch(request: PostBatchAnalyzeRequest):
+    """Score many drafts for one author, ranked by overall score."""
+    try:
+        ranked = await predictor.predict_many(
+            username=request.username,
+            contents=request.contents,
+            post_type=request.post_type,
+            target_post_url=request.target_post_url,
+            media_type=request.media_type,
+            target_language=request.target_language,
+            top_k=request.top_k,
+            budget_seconds=request.budget_seconds,
+        )
+
+        results = []
+        for rank, item in enumerate(ranked, start=1):
+            analysis = _to_analysis_response(item.result)
+            results.append(PostBatchItemResponse(
+                rank=rank,
+                index=item.index,
+                content=item.content,
+                overall=round(item.result.scores.overall, 1),
+                scores=analysis.scores,
+                breakdown=analysis.breakdown,
+                quick_tips=analysis.quick_tips,
+            ))
+
+        context = ranked[0].result.context if ranked else None
+        return PostBatchAnalysisResponse(
+            results=results,
+            context=_to_context_response(context) if context else None,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- Live Scoring (WebSocket) ---
+
+class LiveDraft(BaseModel):
+    content: str
+    media_type: Optional[Literal["image", "video", "gif"]] = None
+    seq: int = 0  # Echoed back so the client can drop out-of-date replies
+
+
+async def _send_live_tips(
+    websocket: WebSocket,
+    session: ScoringSession,
+    draft: LiveDraft,
+    result: PostAnalysisResult,
+) -> None:
+    """Send advisor tips for a draft once the user pauses on it."""
+    await asyncio.sleep(get_settings().live_tips_delay_seconds)
+    try:
+        tips = await predictor.draft_tips(session, draft.content, result)
+        await websocket.send_json({
+            "type": "tips",
+            "seq": draft.seq,
+            "quick_tips": [t.model_dump() for t in _to_tip_responses(tips)],
+        })
+    except Exception as e:
+        # Same as live_scoring: report, then close with 1011
+        print(f"Live tips error for draft {draft.seq}: {e!r}")
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+
+
+@router.websocket("/live")
+async def live_scoring(
+    websocket: WebSocket,
+    username: str,
+    post_type: Literal["original", "reply", "quote", "thread"] = "original",
+    target_post_url: Optional[str] = None,
+    target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None,
+):
+    """
+    Live scoring channel for the compose editor.
+
+    The author profile and target post are resolved once per connection.
+    Each draft sent as {"content", "media_type", "seq"} gets a "scores"
+    message right away (local scoring with rule-based tips), then a "tips"
+    message with the advisor's tips once the draft has been left unchanged
+    for LIVE_TIPS_DELAY_SECONDS. A newer draft cancels the pending tips.
+    Unexpected errors are reported as an "error" message before the
+    socket is closed with code 1011.
+    """
+    await websocket.accept()
+    tips_task: Optional[asyncio.Task] = None
+    try:
+        try:
+            session = await predictor.open_session(
+                username=username,
+                post_type=post_type,
+                target_post_url=target_post_url,
+                target_language=target_language,
+            )
+        except Exception as e:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=1011)
+            return
+
+        await websocket.send_json({
+            "type": "ready",
+            "context": (
+                _to_context_response(session.context).model_dump()
+                if session.context else None
+            ),
+        })
+
+        while True:
+            try:
+                draft = LiveDraft.model_validate_json(await websocket.receive_text())
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+
+            # The previous draft's tips are obsolete now
+            if tips_task is not None:
+                tips_task.cancel()
+                tips_task = None
+
+            result = predictor.score_draft(session, draft.content, draft.media_type)
+            analysis = _to_analysis_response(result)
+            await websocket.send_json({
+                "type": "scores",
+                "seq": draft.seq,
+                **analysis.model_dump(exclude={"context"}),
+            })
+
+            if draft.content.strip():
+                tips_task = asyncio.create_task(
+                    _send_live_tips(websocket, session, draft, result)
+                )
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        # e.g. a binary frame, which receive_text() rejects with a KeyError
+        print(f"Live scoring error for {username}: {e!r}")
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        if tips_task is not None:
+            tips_task.cancel()
+
+
 # --- Apply Tips Endpoint ---
 
 class TipSelection(BaseModel):
@@ -382,6 +592,31 @@ async def polish_post(request: PolishRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/polish/stream")
+async def polish_post_stream(request: PolishRequest):
+    """Streaming variant of /polish over Server-Sent Events.
+
+    Sends "delta" events ({"text": ...}) as the polished text is generated,
+    then one "done" event with the full PolishResponse. Errors after the
+    stream has started arrive as an "error" event.
+    """
+    async def events():
+        try:
+            async for event, data in optimizer.polish_stream(
+                content=request.content,
+                polish_type=request.polish_type,
+                language=request.language,
+                target_post_content=request.target_post_content,
+            ):
+                if event == "done":
+                    data = PolishResponse.model_validate(data).model_dump()
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return _sse_response(events())
+
+
 # --- Generate Personalized Post Endpoint ---
 
 class PersonalizedPostRequest(BaseModel):
@@ -457,6 +692,34 @@ async def generate_personalized_post(request: PersonalizedPostRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate-personalized/stream")
+async def generate_personalized_post_stream(request: PersonalizedPostRequest):
+    """Streaming variant of /generate-personalized over Server-Sent Events.
+
+    Sends "delta" events ({"text": ...}) with the generated post as it is
+    written, then one "done" event with the full PersonalizedPostResponse
+    (or null, like /generate-personalized). Errors after the stream has
+    started arrive as an "error" event.
+    """
+    async def events():
+        try:
+            async for event, data in optimizer.generate_personalized_post_stream(
+                username=request.username,
+                target_post_content=request.target_post_content,
+                target_author=request.target_author,
+                post_type=request.post_type,
+                language=request.language,
+                persona=request.persona,
+            ):
+                if event == "done" and data is not None:
+                    data = PersonalizedPostResponse.model_validate(data).model_dump()
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return _sse_response(events())
+
+
 # --- Personas Endpoint ---
 
 class PersonaResponse(BaseModel):
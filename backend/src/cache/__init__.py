@@ -0,0 +1,27 @@
+from .backends import (
+    CacheBackend,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    close_cache_backend,
+    get_cache_backend,
+)
+from .memory import TTLCache, get_cache_stats
+from .near_duplicate import NearDuplicateIndex, normalize_text
+from .shared import SharedTTLCache
+from .singleflight import SingleFlight
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "RedisBackend",
+    "SQLiteBackend",
+    "close_cache_backend",
+    "get_cache_backend",
+    "TTLCache",
+    "get_cache_stats",
+    "NearDuplicateIndex",
+    "normalize_text",
+    "SharedTTLCache",
+    "SingleFlight",
+]
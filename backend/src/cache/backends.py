@@ -0,0 +1,197 @@
+"""Shared cache backends.
+
+A backend stores opaque bytes under string keys with a TTL, and is shared by
+every process pointed at it:
+
+- MemoryBackend: in-process only; a stand-in for tests and local runs
+- SQLiteBackend: a SQLite file, shared by workers on the same host
+- RedisBackend: any server speaking the Redis protocol (Redis, Valkey,
+  KeyDB, Dragonfly...), shared across hosts
+
+Which one SharedTTLCache uses is set by CACHE_BACKEND (see get_cache_backend).
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from src.config import get_settings
+
+
+class CacheBackend(ABC):
+    """Key/value store with per-key TTL."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Set a value that expires after ttl_seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete a value if present."""
+
+    async def close(self) -> None:
+        """Release connections (called on application shutdown)."""
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process backend."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        # key -> (value, expires_at)
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if time.monotonic() >= item[1]:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._data[key] = (value, time.monotonic() + ttl_seconds)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class SQLiteBackend(CacheBackend):
+    """Backend in a SQLite file, for workers on the same host.
+
+    Runs in WAL mode so readers don't block the writer. Calls run in a
+    worker thread to keep the event loop free. Expired rows are purged
+    every purge_every writes.
+    """
+
+    def __init__(self, path: str, purge_every: int = 1000):
+        self.path = path
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl_seconds),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisBackend(CacheBackend):
+    """Backend on a Redis-protocol server, for workers across hosts.
+
+    Uses redis-py's asyncio client (the optional "redis" extra). Takes any
+    redis:// or rediss:// (TLS) URL. Up to pool_size connections; callers
+    wait for a free one rather than erroring. Connects time out, and idle
+    connections are health-checked before reuse. Speaks RESP2 so servers
+    without HELLO still work.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 8,
+        timeout_seconds: float = 2.0,
+        health_check_interval: int = 30,
+    ):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                'CACHE_BACKEND=redis needs the redis package (the "redis" extra)'
+            ) from e
+        pool = redis_asyncio.BlockingConnectionPool.from_url(
+            url,
+            max_connections=pool_size,
+            timeout=timeout_seconds,
+            socket_connect_timeout=timeout_seconds,
+            socket_timeout=timeout_seconds,
+            health_check_interval=health_check_interval,
+            protocol=2,
+        )
+        self.client = redis_asyncio.Redis.from_pool(pool)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@lru_cache
+def get_cache_backend() -> Optional[CacheBackend]:
+    """Get the configured shared backend, or None for in-process caching only."""
+    settings = get_settings()
+    if settings.cache_backend == "sqlite":
+        return SQLiteBackend(settings.cache_sqlite_path)
+    if settings.cache_backend == "redis":
+        return RedisBackend(settings.cache_redis_url, pool_size=settings.cache_redis_pool_size)
+    return None
+
+
+async def close_cache_backend() -> None:
+    """Close the shared backend (called on application shutdown)."""
+    backend = get_cache_backend()
+    if backend is not None:
+        await backend.close()
+    get_cache_backend.cache_clear()
@@ -0,0 +1,127 @@
+"""Bounded in-process cache with TTL and stale-while-revalidate support."""
+
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, Optional, TypeVar
+
+V = TypeVar("V")
+
+# Named caches, for the stats endpoint. Anything with a stats() method can
+# be registered.
+_registry: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Report cache.stats() under name in get_cache_stats()."""
+    _registry[name] = cache
+
+
+class TTLCache(Generic[V]):
+    """LRU cache with a size bound and per-entry TTL.
+
+    Entries expire ttl_seconds after being set. With stale_ttl_seconds > 0,
+    expired entries are kept for that much longer and can still be read
+    through get_entry() (flagged as stale) so callers can serve them while
+    refreshing in the background.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_seconds: float = 3600,
+        stale_ttl_seconds: float = 0,
+        name: Optional[str] = None,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        # key -> (value, expires_at)
+        self._data: OrderedDict[Hashable, tuple[V, float]] = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if name:
+            register_cache(name, self)
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Get a fresh value, or default if missing or expired."""
+        entry = self.get_entry(key, allow_stale=False)
+        return default if entry is None else entry[0]
+
+    def get_entry(
+        self,
+        key: Hashable,
+        allow_stale: bool = True,
+    ) -> Optional[tuple[V, bool]]:
+        """Get (value, is_stale), or None if missing or past the stale window."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = item
+        now = time.monotonic()
+        if now >= expires_at + self.stale_ttl_seconds:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        is_stale = now >= expires_at
+        if is_stale and not allow_stale:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        if is_stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return value, is_stale
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Set a value, evicting the least recently used entries over maxsize."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and time.monotonic() < item[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def get_cache_stats() -> dict[str, dict[str, Any]]:
+    """Stats for every named cache in this process."""
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
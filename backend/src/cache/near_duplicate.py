@@ -0,0 +1,138 @@
+"""Near-duplicate text lookup with MinHash LSH."""
+
+import re
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+import numpy as np
+
+from .memory import register_cache
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Universal hashing of 32-bit shingle hashes: (a * x + b) mod p
+_PRIME = np.uint64(4294967311)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: NFKC, casefolded, whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class NearDuplicateIndex:
+    """Find previously indexed texts that are near-duplicates of a query.
+
+    Similarity is the Jaccard index of the texts' character n-gram sets.
+    MinHash signatures split into LSH bands pick the candidates, so a lookup
+    only compares against texts sharing a band rather than the whole index.
+    Candidates are then checked against the exact similarity.
+
+    The index maps texts to caller keys; values live in the caller's cache.
+    Texts are grouped by scope and only match within the same scope.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        threshold: float = 0.85,
+        ngram: int = 3,
+        num_perm: int = 64,
+        bands: int = 16,
+        name: Optional[str] = None,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self._rows = num_perm // bands
+        rng = np.random.default_rng(0)
+        self._a = rng.integers(1, 2**32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint64)
+        # key -> (shingles, bucket keys)
+        self._entries: OrderedDict[Hashable, tuple[frozenset[str], list[tuple]]] = OrderedDict()
+        self._buckets: dict[tuple, set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if name:
+            register_cache(name, self)
+
+    def _shingles(self, text: str) -> frozenset[str]:
+        n = self.ngram
+        if len(text) <= n:
+            return frozenset((text,))
+        return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+    def _bucket_keys(self, scope: Hashable, shingles: frozenset[str]) -> list[tuple]:
+        hashes = np.fromiter(
+            (hash(s) & 0xFFFFFFFF for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        signature = ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+        return [
+            (scope, band, signature[band * self._rows:(band + 1) * self._rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, scope: Hashable, text: str, key: Hashable) -> None:
+        """Index text under key, evicting the oldest entries over maxsize."""
+        self.remove(key)
+        shingles = self._shingles(text)
+        bucket_keys = self._bucket_keys(scope, shingles)
+        for bucket_key in bucket_keys:
+            self._buckets.setdefault(bucket_key, set()).add(key)
+        self._entries[key] = (shingles, bucket_keys)
+        while len(self._entries) > self.maxsize:
+            self.remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def find(self, scope: Hashable, text: str) -> Optional[Hashable]:
+        """Key of the most similar indexed text at or above threshold, if any."""
+        shingles = self._shingles(text)
+        candidates: set[Hashable] = set()
+        for bucket_key in self._bucket_keys(scope, shingles):
+            candidates.update(self._buckets.get(bucket_key, ()))
+
+        best_key, best_similarity = None, self.threshold
+        for key in candidates:
+            other = self._entries[key][0]
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+
+        if best_key is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+        return best_key
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket_key in entry[1]:
+            bucket = self._buckets[bucket_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,147 @@
+"""TTLCache with an optional shared second tier."""
+
+import asyncio
+import pickle
+import time
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from .backends import CacheBackend, get_cache_backend
+from .memory import TTLCache, V
+
+
+class SharedTTLCache(TTLCache[V]):
+    """TTLCache backed by a CacheBackend shared with other workers.
+
+    The in-process cache stays the first tier and keeps its sync API.
+    aget()/aget_entry() fall back to the backend on a local miss, so one
+    worker's result saves the others a recompute. set() writes through to
+    the backend in the background, never delaying the caller.
+
+    Named caches use the configured backend (get_cache_backend()), looked
+    up on each use so one closed on shutdown is never reused; pass backend
+    to pin a specific one. Values are pickled, so the backend must be
+    trusted. Backend errors and slow lookups (past timeout_seconds) count
+    as misses.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_seconds: float = 3600,
+        stale_ttl_seconds: float = 0,
+        name: Optional[str] = None,
+        backend: Optional[CacheBackend] = None,
+        timeout_seconds: float = 0.5,
+    ):
+        super().__init__(maxsize, ttl_seconds, stale_ttl_seconds, name)
+        if backend is not None and not name:
+            raise ValueError("A shared cache needs a name to namespace its keys")
+        self._backend = backend
+        self.timeout_seconds = timeout_seconds
+        self._writes: set[asyncio.Task] = set()
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    @property
+    def backend(self) -> Optional[CacheBackend]:
+        """The pinned backend, else the configured one (None if unnamed)."""
+        if self._backend is not None:
+            return self._backend
+        return get_cache_backend() if self.name else None
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"xeo:{self.name}:{key!r}"
+
+    async def aget(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Get a fresh value from either tier, or default."""
+        entry = await self.aget_entry(key, allow_stale=False)
+        return default if entry is None else entry[0]
+
+    async def aget_entry(
+        self,
+        key: Hashable,
+        allow_stale: bool = True,
+    ) -> Optional[tuple[V, bool]]:
+        """Like get_entry(), checking the shared backend on a local miss."""
+        entry = self.get_entry(key, allow_stale)
+        backend = self.backend
+        if entry is not None or backend is None:
+            return entry
+
+        try:
+            raw = await asyncio.wait_for(
+                backend.get(self._shared_key(key)), timeout=self.timeout_seconds
+            )
+            if raw is None:
+                self.shared_misses += 1
+                return None
+            value, expires_at = pickle.loads(raw)
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"Shared cache {self.name} read failed: {e!r}")
+            return None
+
+        # Expiry is wall-clock so it means the same in every process
+        remaining = expires_at - time.time()
+        is_stale = remaining <= 0
+        if remaining + self.stale_ttl_seconds <= 0 or (is_stale and not allow_stale):
+            self.shared_misses += 1
+            return None
+
+        super().set(key, value, ttl_seconds=remaining)
+        self.shared_hits += 1
+        return value, is_stale
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Set locally, and in the shared backend in the background."""
+        super().set(key, value, ttl_seconds)
+        backend = self.backend
+        if backend is None:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            payload = pickle.dumps((value, time.time() + ttl))
+            self._write(backend.set(
+                self._shared_key(key), payload, ttl + self.stale_ttl_seconds
+            ))
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"Shared cache {self.name} write failed: {e!r}")
+
+    def delete(self, key: Hashable) -> None:
+        super().delete(key)
+        backend = self.backend
+        if backend is not None:
+            self._write(backend.delete(self._shared_key(key)))
+
+    def _write(self, coro) -> None:
+        """Run a backend write in the background (skipped outside a loop)."""
+        try:
+            task = asyncio.get_running_loop().create_task(self._run_write(coro))
+        except RuntimeError:
+            coro.close()
+            return
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _run_write(self, coro) -> None:
+        try:
+            # Off the request path, so writes get more room than reads
+            await asyncio.wait_for(coro, timeout=self.timeout_seconds * 4)
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"Shared cache {self.name} write failed: {e!r}")
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        backend = self.backend
+        if backend is not None:
+            stats.update(
+                backend=type(backend).__name__,
+                shared_hits=self.shared_hits,
+                shared_misses=self.shared_misses,
+                shared_errors=self.shared_errors,
+            )
+        return stats
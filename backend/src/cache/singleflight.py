@@ -0,0 +1,63 @@
+"""Request coalescing for concurrent async calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still running await the same result instead of starting their own. The
+    call runs as a separate task, so a cancelled caller (e.g. a client
+    disconnect) doesn't cancel it for everyone else.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the call already in flight for key."""
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        """Start fn() for key without waiting, or return the call in flight.
+
+        Used for background refreshes: the task is kept referenced until it
+        finishes and its errors are swallowed.
+        """
+        self.calls += 1
+        task = self._calls.get(key)
+        # A finished task stays registered until its done-callback runs
+        if task is None or task.done():
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return task
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> list[Hashable]:
+        """Keys of calls currently in flight."""
+        return list(self._calls)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "executed": self.calls - self.coalesced,
+            "in_flight": len(self._calls),
+        }
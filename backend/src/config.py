@@ -1,6 +1,8 @@
 """Application configuration."""
 
 from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -16,19 +18,94 @@ class Settings(BaseSettings):
     sela_api_key: str = ""
     sela_principal_id: str = ""
 
+    # Sela HTTP transport (shared connection pool)
+    sela_http2: bool = True
+    sela_max_connections: int = 50
+    sela_max_keepalive_connections: int = 20
+    sela_keepalive_expiry: float = 30.0
+    sela_max_concurrency_per_host: int = 20
+
+    # Canonical profile store (one scrape serves any post_count up to it)
+    sela_profile_min_posts: int = 20
+    sela_profile_store_ttl_seconds: float = 300
+    sela_profile_store_max_users: int = 1000
+    # Target-post context by tweet ID: metrics go stale quickly, while
+    # content and author stay valid much longer
+    post_context_cache_size: int = 2000
+    post_metrics_ttl_seconds: float = 120
+    post_context_ttl_seconds: float = 86400
+
     # Supabase
     supabase_url: str = ""
     supabase_anon_key: str = ""
+    supabase_max_workers: int = 8
+    supabase_timeout_seconds: float = 5.0
+    # Activity logging is buffered and written in bulk inserts
+    activity_batch_size: int = 200
+    activity_flush_interval_seconds: float = 5.0
+    activity_queue_size: int = 5000  # Rows past this are dropped
+    # In-process cleanup of expired cache rows (0 disables it)
+    cache_cleanup_interval_seconds: float = 900
 
     # OpenAI
     openai_api_key: str = ""
 
     # Anthropic (Claude API for polish)
     anthropic_api_key: str = ""
+    claude_model: str = "claude-sonnet-4-20250514"
+    claude_max_concurrency: int = 8
+    claude_timeout_seconds: float = 60.0
+    claude_prompt_caching: bool = True
+    claude_log_usage: bool = False  # Print token usage for every call
+
+    # Shared cache tier for profile features, profile analyses and advisor
+    # suggestions: "memory" keeps them per process, "sqlite" shares them
+    # between workers on one host, "redis" across hosts
+    cache_backend: Literal["memory", "sqlite", "redis"] = "memory"
+    cache_sqlite_path: str = "/tmp/xeo-cache.sqlite3"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_redis_pool_size: int = 8
+    cache_backend_timeout_seconds: float = 0.5
+
+    # In-process caches
+    profile_features_cache_size: int = 2000
+    profile_features_ttl_seconds: float = 3600
+    profile_analysis_cache_size: int = 1000
+    profile_analysis_ttl_seconds: float = 3600
+    # Past the TTL, cached profiles are still served for this long while a
+    # background refresh runs
+    profile_stale_grace_seconds: float = 21600
+    suggestion_cache_size: int = 500
+    # Drafts at least this similar (character trigram Jaccard) to a cached
+    # one reuse its suggestions
+    suggestion_similarity_threshold: float = 0.85
+    # Time /post/analyze gives the advisor once it is called (overridable
+    # per request): tips not ready by then are replaced with rule-based
+    # tips, and the Claude call finishes in the background to fill the
+    # suggestion cache. 0 always waits for the advisor
+    analyze_budget_seconds: float = 2.0
+    # /post/live asks the advisor only once a draft has been left unchanged
+    # this long; newer drafts cancel the pending tips (a Claude call already
+    # under way still finishes into the suggestion cache)
+    live_tips_delay_seconds: float = 0.8
+    # Memoized post features/scores, keyed on a hash of the draft
+    post_memo_cache_size: int = 5000
+    post_memo_ttl_seconds: float = 3600
+    # Claude interpretations of target posts, keyed on tweet ID and content
+    # hash (the text of a post doesn't change)
+    interpretation_cache_size: int = 5000
+    interpretation_ttl_seconds: float = 604800
+    # Start generating the interpretation as soon as a post is first looked
+    # up, instead of when /post/context asks for it
+    precompute_interpretations: bool = False
 
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    # Worker processes for `python -m src.serve` (roughly one per CPU core)
+    web_concurrency: int = 1
+    graceful_shutdown_seconds: int = 20
+    log_level: Literal["critical", "error", "warning", "info", "debug", "trace"] = "info"
 
     # CORS (comma-separated origins for production)
     cors_origins: str = "*"
@@ -0,0 +1,133 @@
+"""Write-behind buffer for user activity logging.
+
+Activity rows are queued in memory and written to Supabase in bulk inserts,
+so logging costs one round-trip per batch instead of one per request.
+
+- A batch is flushed once batch_size rows are queued, or flush_interval
+  seconds after the last flush, whichever comes first
+- Only one insert is in flight at a time; if Supabase falls behind, the
+  queue fills up to max_queue rows and further rows are dropped (counted)
+  rather than slowing down requests
+- Rows in a failed insert are dropped (counted), not retried
+- close() flushes everything still queued (called on application shutdown)
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Optional
+
+from src.config import get_settings
+from src.db.supabase_client import SupabaseCache
+
+
+class ActivityBuffer:
+    """Bounded in-process queue of activity rows, flushed in batches."""
+
+    def __init__(
+        self,
+        cache: SupabaseCache,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 5.0,
+        max_queue: int = 5000,
+    ):
+        self.cache = cache
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue = max_queue
+        self._rows: deque[dict[str, Any]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._closed = False
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def add(self, row: dict[str, Any]) -> bool:
+        """Queue a row without waiting. Returns False if it was dropped."""
+        if self._closed or len(self._rows) >= self.max_queue:
+            self.dropped += 1
+            return False
+
+        self._rows.append(row)
+        self.queued += 1
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        if len(self._rows) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    async def _run(self) -> None:
+        """Flush batches until closed and drained."""
+        while self._rows or not self._closed:
+            if not self._closed and len(self._rows) < self.batch_size:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=self.flush_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush_batch()
+
+    async def _flush_batch(self) -> None:
+        """Write up to batch_size queued rows in one insert."""
+        count = min(len(self._rows), self.batch_size)
+        if not count:
+            return
+        batch = [self._rows.popleft() for _ in range(count)]
+        self.batches += 1
+        if await self.cache.log_user_activities(batch):
+            self.written += count
+        else:
+            self.failed += count
+
+    async def close(self, timeout_seconds: float = 10.0) -> None:
+        """Stop accepting rows and flush the ones still queued."""
+        self._closed = True
+        if self._task is None or self._task.done():
+            return
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout_seconds)
+        except Exception as e:
+            print(f"Activity buffer final flush incomplete: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "pending": len(self._rows),
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+_buffer: Optional[ActivityBuffer] = None
+
+
+def get_activity_buffer() -> ActivityBuffer:
+    """Get the process-wide activity buffer."""
+    global _buffer
+    if _buffer is None:
+        settings = get_settings()
+        _buffer = ActivityBuffer(
+            SupabaseCache(),
+            batch_size=settings.activity_batch_size,
+            flush_interval_seconds=settings.activity_flush_interval_seconds,
+            max_queue=settings.activity_queue_size,
+        )
+    return _buffer
+
+
+async def close_activity_buffer() -> None:
+    """Flush and drop the activity buffer (called on application shutdown)."""
+    global _buffer
+    if _buffer is not None:
+        await _buffer.close()
+    _buffer = None
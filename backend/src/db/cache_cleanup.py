@@ -0,0 +1,63 @@
+"""Periodic cleanup of expired Supabase cache rows.
+
+Runs SupabaseCache.cleanup_expired_cache() every CACHE_CLEANUP_INTERVAL_SECONDS
+inside the API process, so expired rows are removed in small, regular
+batches instead of relying on an external cron hitting /admin/cleanup-cache.
+Every worker runs its own loop; the deletes are idempotent.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from src.config import get_settings
+from src.db.supabase_client import SupabaseCache
+
+_task: Optional[asyncio.Task] = None
+_last_run: dict[str, Any] = {}
+
+
+async def _cleanup_loop(interval_seconds: float) -> None:
+    cache = SupabaseCache()
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            deleted = await cache.cleanup_expired_cache()
+            _last_run.update(
+                finished_at=datetime.now(timezone.utc).isoformat(),
+                deleted=deleted,
+            )
+        except Exception as e:
+            print(f"Periodic cache cleanup failed: {e}")
+
+
+def start_cache_cleanup() -> None:
+    """Start the cleanup loop (called on application startup).
+
+    Disabled when CACHE_CLEANUP_INTERVAL_SECONDS is 0.
+    """
+    global _task
+    interval = get_settings().cache_cleanup_interval_seconds
+    if interval > 0 and (_task is None or _task.done()):
+        _task = asyncio.create_task(_cleanup_loop(interval))
+
+
+async def stop_cache_cleanup() -> None:
+    """Stop the cleanup loop (called on application shutdown)."""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def get_cache_cleanup_stats() -> dict[str, Any]:
+    """Result of the last periodic cleanup run."""
+    return {
+        "running": _task is not None and not _task.done(),
+        "interval_seconds": get_settings().cache_cleanup_interval_seconds,
+        **_last_run,
+    }
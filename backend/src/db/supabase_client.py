@@ -5,18 +5,32 @@ Connection Pooling Notes:
 - The @lru_cache decorator ensures a singleton client instance is reused
 - All SupabaseCache instances share the same underlying HTTP connection pool
 - Default httpx limits: 100 max connections, 20 keepalive connections
+
+Concurrency Notes:
+- The supabase client is synchronous; every .execute() runs in a bounded
+  thread pool so cache lookups never block the event loop
+- Each call has a timeout (SUPABASE_TIMEOUT_SECONDS); a timed-out call is
+  treated like any other cache failure
 """
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from functools import lru_cache
 from typing import Any, Optional
 
 from dotenv import load_dotenv
+from postgrest import APIResponse, CountMethod, ReturnMethod
 from supabase import create_client, Client
 
+from src.config import get_settings
+
 load_dotenv()
 
+# Worker threads for blocking supabase calls (shared by all SupabaseCache instances)
+_executor: Optional[ThreadPoolExecutor] = None
+
 
 @lru_cache
 def get_supabase_client() -> Client:
@@ -35,24 +49,54 @@ def get_supabase_client() -> Client:
     return create_client(url, key)
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for supabase calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().supabase_max_workers,
+            thread_name_prefix="supabase",
+        )
+    return _executor
+
+
+def shutdown_supabase_executor() -> None:
+    """Stop the supabase thread pool (called on application shutdown).
+
+    Queued calls still run to completion before the process exits.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
 class SupabaseCache:
     """Cache manager using Supabase."""
 
     def __init__(self):
         self.client = get_supabase_client()
+        self.timeout_seconds = get_settings().supabase_timeout_seconds
+
+    async def _execute(self, query: Any) -> APIResponse:
+        """Run a query's blocking execute() in the thread pool with a timeout."""
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(_get_executor(), query.execute),
+            timeout=self.timeout_seconds,
+        )
 
     # ==================== Profile Cache ====================
 
     async def get_profile_cache(self, username: str) -> Optional[dict[str, Any]]:
         """Get cached profile data if not expired."""
         try:
-            result = (
+            result = await self._execute(
                 self.client.table("profile_cache")
                 .select("*")
                 .eq("x_username", username)
                 .gte("expires_at", datetime.now(timezone.utc).isoformat())
                 .limit(1)
-                .execute()
             )
 
             if result.data:
@@ -70,17 +114,19 @@ class SupabaseCache:
         """Cache profile data with TTL."""
         try:
             # Upsert (insert or update)
-            self.client.table("profile_cache").upsert(
-                {
-                    "x_username": username,
-                    "profile_data": profile_data,
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                    "expires_at": (
-                        datetime.now(timezone.utc) + timedelta(hours=ttl_hours)
-                    ).isoformat(),
-                },
-                on_conflict="x_username",
-            ).execute()
+            await self._execute(
+                self.client.table("profile_cache").upsert(
+                    {
+                        "x_username": username,
+                        "profile_data": profile_data,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "expires_at": (
+                            datetime.now(timezone.utc) + timedelta(hours=ttl_hours)
+                        ).isoformat(),
+                    },
+                    on_conflict="x_username",
+                )
+            )
             return True
         except Exception:
             return False
@@ -88,15 +134,15 @@ class SupabaseCache:
     # ==================== Profile Analysis Cache ====================
 
     async def get_analysis_cache(self, username: str) -> Optional[dict[str, Any]]:
-        """Get cached analysis result if not expired."""
+        """Get the latest cached analysis result if not expired."""
         try:
-            result = (
+            result = await self._execute(
                 self.client.table("profile_analyses")
                 .select("*")
                 .eq("x_username", username)
+                .gte("expires_at", datetime.now(timezone.utc).isoformat())
                 .order("created_at", desc=True)
                 .limit(1)
-                .execute()
             )
 
             if result.data:
@@ -110,20 +156,125 @@ class SupabaseCache:
         username: str,
         scores: dict[str, float],
         analysis_data: dict[str, Any],
+        ttl_seconds: Optional[float] = None,
+    ) -> bool:
+        """Save analysis result.
+
+        Expires after ttl_seconds, or after the table default (1 hour).
+        """
+        row = {
+            "x_username": username,
+            "reach_score": scores.get("reach"),
+            "engagement_score": scores.get("engagement"),
+            "virality_score": scores.get("virality"),
+            "quality_score": scores.get("quality"),
+            "longevity_score": scores.get("longevity"),
+            "analysis_data": analysis_data,
+        }
+        if ttl_seconds is not None:
+            row["expires_at"] = (
+                datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+            ).isoformat()
+        try:
+            await self._execute(self.client.table("profile_analyses").insert(row))
+            return True
+        except Exception:
+            return False
+
+    # ==================== Post Context Cache ====================
+
+    async def get_post_context_cache(self, post_id: str) -> Optional[dict[str, Any]]:
+        """Get cached target-post context if not expired."""
+        try:
+            result = await self._execute(
+                self.client.table("post_context_cache")
+                .select("*")
+                .eq("post_id", post_id)
+                .gte("expires_at", datetime.now(timezone.utc).isoformat())
+                .limit(1)
+            )
+
+            if result.data:
+                return result.data[0]
+            return None
+        except Exception:
+            return None
+
+    async def set_post_context_cache(
+        self,
+        post_id: str,
+        post_url: str,
+        author_username: str,
+        content_data: dict[str, Any],
+        metrics_data: dict[str, Any],
+        ttl_seconds: float,
     ) -> bool:
-        """Save analysis result."""
+        """Cache target-post context (upserted on post_id)."""
+        now = datetime.now(timezone.utc)
         try:
-            self.client.table("profile_analyses").insert(
-                {
-                    "x_username": username,
-                    "reach_score": scores.get("reach"),
-                    "engagement_score": scores.get("engagement"),
-                    "virality_score": scores.get("virality"),
-                    "quality_score": scores.get("quality"),
-                    "longevity_score": scores.get("longevity"),
-                    "analysis_data": analysis_data,
-                }
-            ).execute()
+            await self._execute(
+                self.client.table("post_context_cache").upsert(
+                    {
+                        "post_id": post_id,
+                        "post_url": post_url,
+                        "author_username": author_username,
+                        "content_data": content_data,
+                        "metrics_data": metrics_data,
+                        "updated_at": now.isoformat(),
+                        "expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+                    },
+                    on_conflict="post_id",
+                )
+            )
+            return True
+        except Exception:
+            return False
+
+    # ==================== Post Interpretation Cache ====================
+
+    async def get_post_interpretation(self, post_id: str) -> Optional[dict[str, Any]]:
+        """Get a target post's stored interpretation if not expired."""
+        try:
+            result = await self._execute(
+                self.client.table("post_interpretations")
+                .select("*")
+                .eq("post_id", post_id)
+                .gte("expires_at", datetime.now(timezone.utc).isoformat())
+                .limit(1)
+            )
+
+            if result.data:
+                return result.data[0]
+            return None
+        except Exception:
+            return None
+
+    async def set_post_interpretation(
+        self,
+        post_id: str,
+        content_hash: str,
+        interpretation: str,
+        ttl_seconds: float,
+    ) -> bool:
+        """Store a post's interpretation (upserted on post_id).
+
+        Kept apart from post_context_cache, whose rows expire with the
+        post's metrics, next to the hash of the text it was made from.
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self._execute(
+                self.client.table("post_interpretations").upsert(
+                    {
+                        "post_id": post_id,
+                        "content_hash": content_hash,
+                        "interpretation": interpretation,
+                        "updated_at": now.isoformat(),
+                        "expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+                    },
+                    on_conflict="post_id",
+                )
+            )
             return True
         except Exception:
             return False
@@ -138,13 +289,15 @@ class SupabaseCache:
     ) -> bool:
         """Log analysis event for statistics."""
         try:
-            self.client.table("analysis_stats").insert(
-                {
-                    "x_username": username,
-                    "analysis_type": analysis_type,
-                    "session_id": session_id,
-                }
-            ).execute()
+            await self._execute(
+                self.client.table("analysis_stats").insert(
+                    {
+                        "x_username": username,
+                        "analysis_type": analysis_type,
+                        "session_id": session_id,
+                    }
+                )
+            )
             return True
         except Exception:
             return False
@@ -153,10 +306,9 @@ class SupabaseCache:
         """Get usage statistics for the last N days."""
         try:
             # Total analyses
-            result = (
+            result = await self._execute(
                 self.client.table("analysis_stats")
                 .select("analysis_type", count="exact")
-                .execute()
             )
 
             return {
@@ -174,13 +326,12 @@ class SupabaseCache:
     ) -> Optional[dict[str, Any]]:
         """Get cached Claude suggestion if not expired."""
         try:
-            result = (
+            result = await self._execute(
                 self.client.table("suggestion_cache")
                 .select("*")
                 .eq("content_hash", content_hash)
                 .gte("expires_at", datetime.now(timezone.utc).isoformat())
                 .limit(1)
-                .execute()
             )
 
             if result.data:
@@ -197,49 +348,34 @@ class SupabaseCache:
     ) -> bool:
         """Cache Claude suggestion with TTL."""
         try:
-            self.client.table("suggestion_cache").upsert(
-                {
-                    "content_hash": content_hash,
-                    "suggestion_data": suggestion_data,
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                    "expires_at": (
-                        datetime.now(timezone.utc) + timedelta(minutes=ttl_minutes)
-                    ).isoformat(),
-                },
-                on_conflict="content_hash",
-            ).execute()
+            await self._execute(
+                self.client.table("suggestion_cache").upsert(
+                    {
+                        "content_hash": content_hash,
+                        "suggestion_data": suggestion_data,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "expires_at": (
+                            datetime.now(timezone.utc) + timedelta(minutes=ttl_minutes)
+                        ).isoformat(),
+                    },
+                    on_conflict="content_hash",
+                )
+            )
             return True
         except Exception:
             return False
 
     # ==================== User Activity Tracking ====================
 
-    async def log_user_activity(
-        self,
-        user_handle: str,
-        action_type: str,
-        target_handle: Optional[str] = None,
-        target_url: Optional[str] = None,
-        post_content: Optional[str] = None,
-        scores: Optional[dict[str, float]] = None,
-        quick_tips: Optional[list[dict[str, Any]]] = None,
-    ) -> bool:
-        """Log user activity for analytics."""
+    async def log_user_activities(self, rows: list[dict[str, Any]]) -> bool:
+        """Log many user activity rows in one insert."""
+        if not rows:
+            return True
         try:
-            self.client.table("user_activities").insert(
-                {
-                    "user_handle": user_handle,
-                    "action_type": action_type,
-                    "target_handle": target_handle,
-                    "target_url": target_url,
-                    "post_content": post_content,
-                    "scores": scores,
-                    "quick_tips": quick_tips,
-                }
-            ).execute()
+            await self._execute(self.client.table("user_activities").insert(rows))
             return True
         except Exception as e:
-            print(f"Failed to log user activity: {e}")
+            print(f"Failed to log {len(rows)} user activities: {e}")
             return False
 
     # ==================== Cache Cleanup ====================
@@ -247,50 +383,30 @@ class SupabaseCache:
     async def cleanup_expired_cache(self) -> dict[str, int]:
         """Delete expired cache entries from all cache tables.
 
+        Deletes ask PostgREST for an exact count and a minimal response, so
+        only the row count comes back, not the deleted rows and their JSONB.
+
         Returns:
             dict with count of deleted rows per table
         """
         now = datetime.now(timezone.utc).isoformat()
-        deleted_counts = {
-            "profile_cache": 0,
-            "profile_analyses": 0,
-            "post_context_cache": 0,
-        }
-
-        try:
-            # Clean profile_cache
-            result = (
-                self.client.table("profile_cache")
-                .delete()
-                .lt("expires_at", now)
-                .execute()
-            )
-            deleted_counts["profile_cache"] = len(result.data) if result.data else 0
-        except Exception as e:
-            print(f"Failed to cleanup profile_cache: {e}")
-
-        try:
-            # Clean profile_analyses
-            result = (
-                self.client.table("profile_analyses")
-                .delete()
-                .lt("expires_at", now)
-                .execute()
-            )
-            deleted_counts["profile_analyses"] = len(result.data) if result.data else 0
-        except Exception as e:
-            print(f"Failed to cleanup profile_analyses: {e}")
-
-        try:
-            # Clean post_context_cache
-            result = (
-                self.client.table("post_context_cache")
-                .delete()
-                .lt("expires_at", now)
-                .execute()
-            )
-            deleted_counts["post_context_cache"] = len(result.data) if result.data else 0
-        except Exception as e:
-            print(f"Failed to cleanup post_context_cache: {e}")
+        deleted_counts = {}
+
+        for table in (
+            "profile_cache",
+            "profile_analyses",
+            "post_context_cache",
+            "post_interpretations",
+        ):
+            deleted_counts[table] = 0
+            try:
+                result = await self._execute(
+                    self.client.table(table)
+                    .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+                    .lt("expires_at", now)
+                )
+                deleted_counts[table] = result.count or 0
+            except Exception as e:
+                print(f"Failed to cleanup {table}: {e}")
 
         return deleted_counts
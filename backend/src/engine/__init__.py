@@ -2,6 +2,7 @@ from .feature_extractor import (
     PostFeatures,
     ProfileFeatures,
     extract_post_features,
+    extract_post_features_batch,
     extract_profile_features,
 )
 from .weighted_scorer import (
@@ -14,6 +15,7 @@ __all__ = [
     "PostFeatures",
     "ProfileFeatures",
     "extract_post_features",
+    "extract_post_features_batch",
     "extract_profile_features",
     "WeightedScorer",
     "PentagonScores",
@@ -1,6 +1,7 @@
 """Feature extraction for posts and profiles."""
 
 import re
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Literal
 
@@ -103,6 +104,46 @@ CTA_PATTERN = re.compile(
 )
 THREAD_PATTERN = re.compile(r"🧵|\(\d+/\d+\)|^\d+\.|thread:", re.IGNORECASE)
 
+# extract_post_features gives the same results as running each pattern above
+# over the whole post, but skips every pattern that can't match: most checks
+# are substring tests, and the case-insensitive ones share one lowered copy.
+
+# Non-ASCII characters that re.IGNORECASE treats as ASCII letters, mapped so
+# that lower() agrees with re.IGNORECASE for the patterns below
+_ASCII_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+# CTA_PATTERN can only match if the lowered text contains one of these
+_CTA_KEYWORDS = ("check", "let", "what", "share", "tell", "drop", "comment", "reply", "follow", "like")
+# Case-sensitive CTA_PATTERN for lowered text (IGNORECASE is ~2x slower)
+_CTA_LOWER_PATTERN = re.compile(CTA_PATTERN.pattern)
+_THREAD_COUNTER_PATTERN = re.compile(r"\(\d+/\d+\)")
+_THREAD_NUMBERED_PATTERN = re.compile(r"\d+\.")
+# One match per sentence with non-whitespace text, same as
+# counting non-blank pieces of re.split(r"[.!?]+", content)
+_SENTENCE_PATTERN = re.compile(r"[^.!?\s][^.!?]*")
+
+
+def _lower_for_matching(content: str) -> str:
+    if not content.isascii() and any(c in content for c in "\u0130\u0131\u017f\u212a"):
+        content = content.translate(_ASCII_CASE_FOLD)
+    return content.lower()
+
+
+def _has_cta(lowered: str) -> bool:
+    if any(keyword in lowered for keyword in _CTA_KEYWORDS) or (
+        "rt" in lowered and "if" in lowered
+    ):
+        return _CTA_LOWER_PATTERN.search(lowered) is not None
+    return False
+
+
+def _is_thread_starter(content: str, lowered: str) -> bool:
+    return (
+        "🧵" in content
+        or "thread:" in lowered
+        or ("(" in content and _THREAD_COUNTER_PATTERN.search(content) is not None)
+        or (content[:1].isdigit() and _THREAD_NUMBERED_PATTERN.match(content) is not None)
+    )
+
 
 def extract_post_features(
     content: str,
@@ -111,47 +152,38 @@ def extract_post_features(
 ) -> PostFeatures:
     """Extract features from post content."""
 
-    # Basic counts
-    char_count = len(content)
-    words = content.split()
-    word_count = len(words)
-    sentences = re.split(r"[.!?]+", content)
-    sentence_count = len([s for s in sentences if s.strip()])
-
-    # Emoji
-    emojis = EMOJI_PATTERN.findall(content)
-    emoji_count = len(emojis)
-
-    # Hashtags & Mentions
-    hashtags = HASHTAG_PATTERN.findall(content)
-    mentions = MENTION_PATTERN.findall(content)
-    urls = URL_PATTERN.findall(content)
-
-    # Questions & CTA
-    has_question = bool(QUESTION_PATTERN.search(content))
-    has_cta = bool(CTA_PATTERN.search(content))
+    lowered = _lower_for_matching(content)
 
-    # Thread detection
-    is_thread_starter = bool(THREAD_PATTERN.search(content))
+    # Emoji (every emoji range is non-ASCII)
+    emoji_count = 0 if content.isascii() else len(EMOJI_PATTERN.findall(content))
 
     return PostFeatures(
-        char_count=char_count,
-        word_count=word_count,
-        sentence_count=sentence_count,
-        has_question=has_question,
-        has_cta=has_cta,
+        char_count=len(content),
+        word_count=len(content.split()),
+        sentence_count=len(_SENTENCE_PATTERN.findall(content)),
+        has_question="?" in content,
+        has_cta=_has_cta(lowered),
         has_emoji=emoji_count > 0,
         emoji_count=emoji_count,
         has_media=media_type is not None,
         media_type=media_type,
-        hashtag_count=len(hashtags),
-        mention_count=len(mentions),
-        has_url=len(urls) > 0,
-        is_thread_starter=is_thread_starter,
+        hashtag_count=len(HASHTAG_PATTERN.findall(content)) if "#" in content else 0,
+        mention_count=len(MENTION_PATTERN.findall(content)) if "@" in content else 0,
+        has_url="http" in content and URL_PATTERN.search(content) is not None,
+        is_thread_starter=_is_thread_starter(content, lowered),
         is_quote=is_quote,
     )
 
 
+def extract_post_features_batch(
+    contents: Sequence[str],
+    media_type: Literal["image", "video", "gif", None] = None,
+    is_quote: bool = False,
+) -> list[PostFeatures]:
+    """Extract features from many posts sharing the same media type."""
+    return [extract_post_features(content, media_type, is_quote) for content in contents]
+
+
 def extract_profile_features(profile: ProfileData) -> ProfileFeatures:
     """Extract features from user profile data."""
 
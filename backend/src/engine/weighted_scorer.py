@@ -9,9 +9,12 @@ Calculates 5-dimension scores (pentagon chart):
 - Longevity: How long will this stay relevant
 """
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
 from typing import Optional
 
+import numpy as np
+
 from .feature_extractor import PostFeatures, ProfileFeatures
 
 
@@ -123,6 +126,58 @@ FEATURE_IMPACTS = {
 }
 
 
+# Column layout of the batched scoring arrays
+ACTION_FIELDS = tuple(f.name for f in fields(ActionProbabilities))
+DIMENSIONS = ("reach", "engagement", "virality", "quality", "longevity")
+_ACTION_INDEX = {action: i for i, action in enumerate(ACTION_FIELDS)}
+
+# SCORE_WEIGHTS as a 5x14 matrix (rows: DIMENSIONS, columns: ACTION_FIELDS)
+WEIGHT_MATRIX = np.zeros((len(DIMENSIONS), len(ACTION_FIELDS)))
+for _row, _dimension in enumerate(DIMENSIONS):
+    for _action, _weight in SCORE_WEIGHTS[_dimension].items():
+        WEIGHT_MATRIX[_row, _ACTION_INDEX[_action]] = _weight
+
+# Non-zero weight columns per dimension, in SCORE_WEIGHTS order. Batched
+# scores are summed term by term in this order (rather than via a BLAS
+# matmul, which reorders the sums) so they match calculate_scores exactly.
+_WEIGHT_TERMS = tuple(
+    tuple(
+        (_ACTION_INDEX[action], WEIGHT_MATRIX[row, _ACTION_INDEX[action]])
+        for action in SCORE_WEIGHTS[dimension]
+    )
+    for row, dimension in enumerate(DIMENSIONS)
+)
+
+# Column layout of the post feature matrix
+POST_FEATURE_COLUMNS = (
+    "has_question",
+    "has_cta",
+    "has_emoji",
+    "has_media",
+    "has_video",
+    "optimal_length",
+    "hashtag_count",
+    "is_quote",
+)
+
+
+def pack_post_features(posts: Sequence[PostFeatures]) -> np.ndarray:
+    """Pack posts into an (n, len(POST_FEATURE_COLUMNS)) float matrix."""
+    matrix = np.zeros((len(posts), len(POST_FEATURE_COLUMNS)))
+    for i, post in enumerate(posts):
+        matrix[i] = (
+            post.has_question,
+            post.has_cta,
+            post.has_emoji,
+            post.has_media,
+            post.has_media and post.media_type == "video",
+            post.optimal_length,
+            post.hashtag_count,
+            post.is_quote,
+        )
+    return matrix
+
+
 class WeightedScorer:
     """Calculate weighted scores based on X algorithm."""
 
@@ -152,24 +207,14 @@ class WeightedScorer:
             longevity=calc_dimension("longevity"),
         )
 
-    def estimate_probabilities(
-        self,
-        post_features: PostFeatures,
-        profile_features: ProfileFeatures,
-        context_boost: Optional[dict[str, float]] = None,
+    def _base_probabilities(
+        self, profile_features: ProfileFeatures
     ) -> ActionProbabilities:
-        """
-        Estimate action probabilities from features.
-
-        This is a simplified model based on feature heuristics.
-        In production, this would be replaced by ML model inference.
-        """
-
-        # Base probabilities from profile history
+        """Base probabilities from profile history, before post features."""
         # Ensure minimum engagement rate to prevent scores from collapsing to 0
         base_engagement = max(profile_features.avg_engagement_rate, 0.03)
 
-        probs = ActionProbabilities(
+        return ActionProbabilities(
             p_favorite=max(base_engagement * 0.6, 0.02),
             p_reply=max(base_engagement * 0.15, 0.01),
             p_repost=max(base_engagement * 0.15, 0.01),  # Minimum for virality
@@ -186,6 +231,21 @@ class WeightedScorer:
             p_report=0.0001,
         )
 
+    def estimate_probabilities(
+        self,
+        post_features: PostFeatures,
+        profile_features: ProfileFeatures,
+        context_boost: Optional[dict[str, float]] = None,
+    ) -> ActionProbabilities:
+        """
+        Estimate action probabilities from features.
+
+        This is a simplified model based on feature heuristics.
+        In production, this would be replaced by ML model inference.
+        """
+
+        probs = self._base_probabilities(profile_features)
+
         # Apply feature impacts
         if post_features.has_question:
             for action, boost in self.feature_impacts["has_question"].items():
@@ -248,3 +308,87 @@ class WeightedScorer:
         )
         scores = self.calculate_scores(probs)
         return scores, probs
+
+    def estimate_probabilities_batch(
+        self,
+        post_features: Sequence[PostFeatures],
+        profile_features: ProfileFeatures,
+        context_boost: Optional[dict[str, float]] = None,
+    ) -> np.ndarray:
+        """
+        Estimate action probabilities for many posts by the same author.
+
+        Returns an (n, 14) array with columns in ACTION_FIELDS order. The
+        adjustments are the same column operations, in the same order, as
+        estimate_probabilities, so the results are identical.
+        """
+        features = pack_post_features(post_features)
+        post = {name: features[:, i] for i, name in enumerate(POST_FEATURE_COLUMNS)}
+
+        base = self._base_probabilities(profile_features)
+        probs = np.empty((len(features), len(ACTION_FIELDS)))
+        probs[:] = [getattr(base, action) for action in ACTION_FIELDS]
+
+        def column(action: str) -> np.ndarray:
+            return probs[:, _ACTION_INDEX[action]]
+
+        # Apply feature impacts (flags are 0/1, so unflagged rows add 0.0)
+        for feature in ("has_question", "has_cta", "has_emoji", "has_media"):
+            for action, boost in self.feature_impacts[feature].items():
+                column(action)[:] += post[feature] * boost
+
+        is_video = post["has_video"].astype(bool)
+        column("p_video_view")[is_video] = 0.50
+        column("p_dwell")[:] += post["has_video"] * 0.25
+
+        # Optimal length bonus
+        column("p_dwell")[:] += 0.10 * post["optimal_length"]
+        column("p_favorite")[:] += 0.05 * post["optimal_length"]
+
+        column("p_click")[:] += 0.03 * np.minimum(post["hashtag_count"], 3)
+
+        column("p_quote")[:] -= post["is_quote"] * 0.10
+        column("p_repost")[:] += post["is_quote"] * 0.05
+
+        # Apply context boost (for reply/quote to popular posts)
+        if context_boost:
+            for action, boost in context_boost.items():
+                if action in _ACTION_INDEX:
+                    column(action)[:] *= 1 + boost
+
+        return np.clip(probs, 0.0, 1.0, out=probs)
+
+    def calculate_scores_batch(self, probs: np.ndarray) -> np.ndarray:
+        """
+        Calculate pentagon scores for an (n, 14) probability array.
+
+        Returns an (n, 5) array with columns in DIMENSIONS order.
+        """
+        raw = np.zeros((len(probs), len(DIMENSIONS)))
+        for row, terms in enumerate(_WEIGHT_TERMS):
+            for action, weight in terms:
+                raw[:, row] += probs[:, action] * weight
+
+        # Same 0-100 normalization as calculate_scores
+        scores = np.clip(raw * 200, 0, 100)
+        scores[:, DIMENSIONS.index("quality")] += 50  # Quality baseline is 50
+        return scores
+
+    def analyze_posts(
+        self,
+        post_features: Sequence[PostFeatures],
+        profile_features: ProfileFeatures,
+        context_boost: Optional[dict[str, float]] = None,
+    ) -> list[tuple[PentagonScores, ActionProbabilities]]:
+        """Batched analyze_post for many posts by the same author."""
+        probs = self.estimate_probabilities_batch(
+            post_features, profile_features, context_boost
+        )
+        scores = self.calculate_scores_batch(probs)
+        return [
+            (
+                PentagonScores(*(float(v) for v in score_row)),
+                ActionProbabilities(*(float(v) for v in prob_row)),
+            )
+            for score_row, prob_row in zip(scores, probs)
+        ]
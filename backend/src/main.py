@@ -1,17 +1,43 @@
 """XEO Backend API Server."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import api_router
+from src.cache import close_cache_backend
 from src.config import get_settings
+from src.db.activity_buffer import close_activity_buffer
+from src.db.cache_cleanup import start_cache_cleanup, stop_cache_cleanup
+from src.db.supabase_client import shutdown_supabase_executor
+from src.services.llm_gateway import close_llm_gateway
+from src.services.sela_api_client import close_http_client
+from src.warmup import warm_up
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage process-wide resources shared across requests."""
+    await warm_up()
+    start_cache_cleanup()
+    yield
+    # Shutdown: write out buffered activity, then close pooled connections
+    await stop_cache_cleanup()
+    await close_activity_buffer()
+    await close_http_client()
+    await close_llm_gateway()
+    await close_cache_backend()
+    shutdown_supabase_executor()
+
+
 app = FastAPI(
     title="XEO API",
     description="X Score Optimizer - Post score prediction and optimization",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -33,6 +59,7 @@ async def health_check():
     return {"status": "healthy", "service": "XEO API"}
 
 
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host=settings.host, port=settings.port)
+    from src.serve import main
+    main()
@@ -0,0 +1,31 @@
+"""Production entry point: `python -m src.serve`.
+
+Runs uvicorn with WEB_CONCURRENCY worker processes (see Settings), so
+CPU-bound work - feature extraction, pydantic validation, parsing Claude
+output - spreads across cores. Each worker warms up in the app lifespan
+before it accepts connections.
+
+Workers don't share in-process caches; set CACHE_BACKEND=sqlite (one host)
+or redis (several hosts/replicas) so they share cached profiles and
+suggestions.
+"""
+
+import uvicorn
+
+from src.config import get_settings
+
+
+def main() -> None:
+    settings = get_settings()
+    uvicorn.run(
+        "src.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.web_concurrency,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
+        log_level=settings.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
 """Content optimization service for posts."""
 
+import asyncio
+import hashlib
 import re
 import random
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from typing import Literal, Optional
 
-import anthropic
-
+from src.cache import SharedTTLCache, SingleFlight, normalize_text
 from src.config import get_settings
-from src.services.sela_api_client import SelaAPIClient
-from src.services.x_algorithm_advisor import X_ALGORITHM_KNOWLEDGE
+from src.db.supabase_client import SupabaseCache
+from src.engine.feature_extractor import HASHTAG_PATTERN
+from src.services.json_stream import JsonStringFieldStream
+from src.services.llm_gateway import get_llm_gateway
+from src.services.sela_api_client import SelaAPIClient, TweetData, set_post_cached_hook
+from src.services.x_algorithm_advisor import (
+    PERSONALIZED_INSTRUCTIONS,
+    REWRITE_INSTRUCTIONS,
+    X_ALGORITHM_KNOWLEDGE,
+)
 
 
 # Tip application templates (transform functions accept content and optional language)
@@ -104,6 +114,9 @@ CTA_PHRASES = {
     ],
 }
 
+# Emoji counted when describing polish changes (emoticons, symbols & pictographs)
+_CHANGE_EMOJI_PATTERN = re.compile(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF]")
+
 
 def _add_emoji(content: str) -> str:
     """Add relevant emoji to content."""
@@ -172,17 +185,43 @@ def _add_cta(content: str, language: str = "en") -> str:
     return content + cta
 
 
+# Target-post interpretations, keyed on (tweet ID, content hash). Many users
+# open the same post, and its text never changes; the hash guards against a
+# post whose displayed text differs from the one interpreted (e.g. a quote
+# tweet whose quoted content only loaded later).
+_interpretations: SharedTTLCache[str] = SharedTTLCache(
+    maxsize=get_settings().interpretation_cache_size,
+    ttl_seconds=get_settings().interpretation_ttl_seconds,
+    name="interpretation",
+    timeout_seconds=get_settings().cache_backend_timeout_seconds,
+)
+_interpretation_flights = SingleFlight()
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.md5(normalize_text(content).encode()).hexdigest()
+
+
+def _display_content(tweet: TweetData) -> str:
+    """Text shown (and interpreted) for a target post."""
+    if tweet.is_retweet and not tweet.content:
+        # Retweet with no content - this shouldn't happen but handle gracefully
+        return "[Retweet - original content not available]"
+    if tweet.is_quote and tweet.quote_content:
+        # Quote tweet - combine user's commentary with quoted content
+        return f"{tweet.content}\n\n[Quoted]: {tweet.quote_content}"
+    return tweet.content
+
+
 class ContentOptimizer:
     """Service for optimizing post content."""
 
     def __init__(self):
         self.client = SelaAPIClient()
-        settings = get_settings()
-        self.anthropic_client = (
-            anthropic.Anthropic(api_key=settings.anthropic_api_key)
-            if settings.anthropic_api_key
-            else None
-        )
+        self.llm = get_llm_gateway()
+        self.store = SupabaseCache()
+        if get_settings().precompute_interpretations:
+            set_post_cached_hook(self._precompute_interpretation)
 
     async def apply_tips(
         self,
@@ -203,7 +242,7 @@ class ContentOptimizer:
         selected_tips = selected_tips[:3]
 
         # If Claude is available, use AI-powered optimization
-        if self.anthropic_client and selected_tips:
+        if self.llm and selected_tips:
             result = await self._apply_tips_with_ai(
                 original_content, selected_tips, language
             )
@@ -236,17 +275,7 @@ class ContentOptimizer:
             else:
                 tip_descriptions.append(tip_id)
 
-        system_prompt = f"""{X_ALGORITHM_KNOWLEDGE}
-
-You are an X (Twitter) content optimization expert. Your task is to rewrite content to maximize engagement based on the X algorithm while applying the requested improvements.
-
-RULES:
-1. Output MUST be in {target_lang}
-2. Keep the original message intent intact
-3. Apply all requested improvements naturally
-4. Make the content feel authentic, not robotic
-5. Optimize for the X algorithm factors mentioned in the knowledge base
-6. Return ONLY the optimized content, no explanations"""
+        system_prompt = f"Output language: {target_lang}"
 
         user_prompt = f"""Rewrite this content applying these improvements:
 
@@ -261,10 +290,11 @@ RULES:
 Return ONLY the optimized content:"""
 
         try:
-            message = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            message = await self.llm.create(
                 max_tokens=500,
+                system_prefix=(X_ALGORITHM_KNOWLEDGE, REWRITE_INSTRUCTIONS),
                 system=system_prompt,
+                tag="apply_tips",
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
@@ -452,16 +482,10 @@ Return ONLY the optimized content:"""
             tips.append("🎯 Large account post - high exposure expected")
 
         # Handle retweets and quote tweets - get the actual content
-        display_content = tweet.content
-        if tweet.is_retweet and not tweet.content:
-            # Retweet with no content - this shouldn't happen but handle gracefully
-            display_content = "[Retweet - original content not available]"
-        elif tweet.is_quote and tweet.quote_content:
-            # Quote tweet - combine user's commentary with quoted content
-            display_content = f"{tweet.content}\n\n[Quoted]: {tweet.quote_content}"
+        display_content = _display_content(tweet)
 
-        # Generate interpretation for abstract/complex posts
-        interpretation = await self._generate_interpretation(display_content)
+        # Interpretation for abstract/complex posts (cached per post)
+        interpretation = await self._get_interpretation(tweet.tweet_id, display_content)
 
         return {
             "post_id": tweet.tweet_id,
@@ -504,19 +528,76 @@ Return ONLY the optimized content:"""
             "interpretation": interpretation,
         }
 
-    async def _generate_interpretation(self, content: str) -> Optional[str]:
-        """Generate a simple interpretation of abstract/complex posts using Claude."""
-        if not self.anthropic_client:
-            return None
+    async def _get_interpretation(self, post_id: str, content: str) -> Optional[str]:
+        """Get a post's interpretation from the cache, or generate it.
 
+        Checked in memory (or the shared cache tier), then in Supabase;
+        concurrent requests for the same post share one Claude call.
+        """
         # Skip interpretation for very short or simple posts
         if len(content) < 20:
             return None
 
+        key = (post_id, _content_hash(content))
+        cached = await _interpretations.aget(key)
+        if cached is not None:
+            return cached
+
+        return await _interpretation_flights.do(
+            key, lambda: self._load_interpretation(post_id, key[1], content)
+        )
+
+    async def _load_interpretation(
+        self,
+        post_id: str,
+        content_hash: str,
+        content: str,
+    ) -> Optional[str]:
+        """Read an interpretation from Supabase, or generate and store one."""
+        interpretation = await self._get_stored_interpretation(post_id, content_hash)
+        if interpretation is None:
+            interpretation = await self._generate_interpretation(content)
+            if interpretation is None:
+                return None
+            # Save to Supabase (async, don't wait)
+            asyncio.create_task(
+                self.store.set_post_interpretation(
+                    post_id,
+                    content_hash,
+                    interpretation,
+                    ttl_seconds=_interpretations.ttl_seconds,
+                )
+            )
+
+        _interpretations.set((post_id, content_hash), interpretation)
+        return interpretation
+
+    async def _get_stored_interpretation(
+        self,
+        post_id: str,
+        content_hash: str,
+    ) -> Optional[str]:
+        row = await self.store.get_post_interpretation(post_id)
+        if not row or row.get("content_hash") != content_hash:
+            return None
+        return row.get("interpretation")
+
+    async def _precompute_interpretation(self, tweet: TweetData) -> None:
+        """Warm the interpretation cache for a newly looked-up post."""
+        try:
+            await self._get_interpretation(tweet.tweet_id, _display_content(tweet))
+        except Exception as e:
+            print(f"Interpretation precompute failed for {tweet.tweet_id}: {e}")
+
+    async def _generate_interpretation(self, content: str) -> Optional[str]:
+        """Generate a simple interpretation of abstract/complex posts using Claude."""
+        if not self.llm:
+            return None
+
         try:
-            message = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+            message = await self.llm.create(
                 max_tokens=150,
+                tag="interpretation",
                 messages=[
                     {
                         "role": "user",
@@ -640,11 +721,98 @@ Respond in the same language as the post. Just give the interpretation directly
         }
         target_lang_name = lang_names.get(detected_language, "English")
 
-        if not self.anthropic_client:
+        if not self.llm:
             # Fallback without API: minimal transformations
             return self._polish_fallback(content, polish_type, detected_language)
 
-        # Build prompt based on polish type
+        system_prompt, user_prompt = self._build_polish_prompts(
+            content, polish_type, target_lang_name, target_post_content
+        )
+
+        try:
+            message = await self.llm.create(
+                max_tokens=500,
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ],
+                system=system_prompt,
+                tag="polish",
+            )
+
+            polished_content = message.content[0].text.strip()
+            return self._polish_result(
+                content, polished_content, polish_type, detected_language
+            )
+
+        except Exception as e:
+            # Fallback on API error
+            return self._polish_fallback(content, polish_type, detected_language)
+
+    async def polish_stream(
+        self,
+        content: str,
+        polish_type: Literal["grammar", "twitter", "280char", "translate_en", "translate_ko", "translate_zh"],
+        language: Optional[str] = None,
+        target_post_content: Optional[str] = None,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """Streaming variant of polish.
+
+        Yields ("delta", {"text": ...}) events as Claude produces the polished
+        text, then one ("done", result) event with the same result polish
+        would return. Falls back like polish if Claude is unavailable or fails.
+        """
+        detected_language = language or self._detect_language(content)
+        lang_names = {
+            "ko": "Korean",
+            "en": "English",
+            "ja": "Japanese",
+            "zh": "Chinese"
+        }
+        target_lang_name = lang_names.get(detected_language, "English")
+
+        if not self.llm:
+            yield "done", self._polish_fallback(content, polish_type, detected_language)
+            return
+
+        system_prompt, user_prompt = self._build_polish_prompts(
+            content, polish_type, target_lang_name, target_post_content
+        )
+
+        chunks = []
+        try:
+            async for text in self.llm.stream(
+                max_tokens=500,
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ],
+                system=system_prompt,
+                tag="polish",
+            ):
+                # Leading whitespace is stripped from the final result too
+                if not chunks:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                chunks.append(text)
+                yield "delta", {"text": text}
+        except Exception as e:
+            print(f"Claude streaming error in polish: {e}")
+            yield "done", self._polish_fallback(content, polish_type, detected_language)
+            return
+
+        polished_content = "".join(chunks).strip()
+        yield "done", self._polish_result(
+            content, polished_content, polish_type, detected_language
+        )
+
+    def _build_polish_prompts(
+        self,
+        content: str,
+        polish_type: str,
+        target_lang_name: str,
+        target_post_content: Optional[str] = None,
+    ) -> tuple[str, str]:
+        """Build the (system, user) prompts for a polish type."""
         if polish_type == "grammar":
             system_prompt = f"""You are a social media content editor. Your job is to:
 1. Fix grammar, spelling, and punctuation errors
@@ -741,36 +909,30 @@ Text: {content}
 
 Return ONLY the Chinese translation, nothing else."""
 
-        try:
-            message = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=500,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ],
-                system=system_prompt,
-            )
+        return system_prompt, user_prompt
 
-            polished_content = message.content[0].text.strip()
-
-            # Generate changes description
-            changes = self._describe_changes(content, polished_content, polish_type)
-
-            return {
-                "original_content": content,
-                "polished_content": polished_content,
-                "polish_type": polish_type,
-                "language_detected": detected_language,
-                "changes": changes,
-                "character_count": {
-                    "original": len(content),
-                    "polished": len(polished_content),
-                },
-            }
+    def _polish_result(
+        self,
+        content: str,
+        polished_content: str,
+        polish_type: str,
+        detected_language: str,
+    ) -> dict:
+        """Build the polish response for Claude's polished text."""
+        # Generate changes description
+        changes = self._describe_changes(content, polished_content, polish_type)
 
-        except Exception as e:
-            # Fallback on API error
-            return self._polish_fallback(content, polish_type, detected_language)
+        return {
+            "original_content": content,
+            "polished_content": polished_content,
+            "polish_type": polish_type,
+            "language_detected": detected_language,
+            "changes": changes,
+            "character_count": {
+                "original": len(content),
+                "polished": len(polished_content),
+            },
+        }
 
     def _polish_fallback(
         self,
@@ -838,8 +1000,8 @@ Return ONLY the Chinese translation, nothing else."""
                 })
 
         # Check for emoji additions
-        orig_emoji = len(re.findall(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF]", original))
-        polished_emoji = len(re.findall(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF]", polished))
+        orig_emoji = len(_CHANGE_EMOJI_PATTERN.findall(original))
+        polished_emoji = len(_CHANGE_EMOJI_PATTERN.findall(polished))
         if polished_emoji > orig_emoji:
             changes.append({
                 "type": "added_emoji",
@@ -847,8 +1009,8 @@ Return ONLY the Chinese translation, nothing else."""
             })
 
         # Check for hashtag additions
-        orig_tags = len(re.findall(r"#\w+", original))
-        polished_tags = len(re.findall(r"#\w+", polished))
+        orig_tags = len(HASHTAG_PATTERN.findall(original))
+        polished_tags = len(HASHTAG_PATTERN.findall(polished))
         if polished_tags > orig_tags:
             changes.append({
                 "type": "added_hashtags",
@@ -902,9 +1064,108 @@ Return ONLY the Chinese translation, nothing else."""
         Returns:
             dict with generated_content, style_analysis, confidence score, and persona info
         """
-        if not self.anthropic_client:
+        if not self.llm:
+            return None
+
+        system_prefix, system_prompt, user_prompt, recent_posts, persona_info = (
+            await self._build_personalized_prompts(
+                username, target_post_content, target_author, post_type, language, persona
+            )
+        )
+
+        try:
+            message = await self.llm.create(
+                max_tokens=1000,
+                system_prefix=system_prefix,
+                system=system_prompt,
+                tag="personalized",
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+
+            response_text = message.content[0].text
+
+            # Parse JSON response
+            result = self._parse_json_response(response_text)
+            if result:
+                return self._personalized_result(
+                    result, username, post_type, target_author, recent_posts, persona_info
+                )
+
+            return None
+
+        except Exception as e:
+            print(f"Claude API error in generate_personalized_post: {e}")
             return None
 
+    async def generate_personalized_post_stream(
+        self,
+        username: str,
+        target_post_content: str,
+        target_author: str,
+        post_type: Literal["reply", "quote"],
+        language: str = "en",
+        persona: Optional[str] = None,
+    ) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        """Streaming variant of generate_personalized_post.
+
+        Claude answers with a JSON envelope; "generated_content" is decoded
+        from the partial JSON and yielded as ("delta", {"text": ...}) events
+        while it streams. The last event is ("done", result), where result is
+        what generate_personalized_post would return (None on failure).
+        """
+        if not self.llm:
+            yield "done", None
+            return
+
+        system_prefix, system_prompt, user_prompt, recent_posts, persona_info = (
+            await self._build_personalized_prompts(
+                username, target_post_content, target_author, post_type, language, persona
+            )
+        )
+
+        content_stream = JsonStringFieldStream("generated_content")
+        chunks = []
+        try:
+            async for text in self.llm.stream(
+                max_tokens=1000,
+                system_prefix=system_prefix,
+                system=system_prompt,
+                tag="personalized",
+                messages=[{"role": "user", "content": user_prompt}],
+            ):
+                chunks.append(text)
+                delta = content_stream.feed(text)
+                if delta:
+                    yield "delta", {"text": delta}
+        except Exception as e:
+            print(f"Claude streaming error in generate_personalized_post: {e}")
+            yield "done", None
+            return
+
+        result = self._parse_json_response("".join(chunks))
+        yield "done", (
+            self._personalized_result(
+                result, username, post_type, target_author, recent_posts, persona_info
+            )
+            if result
+            else None
+        )
+
+    async def _build_personalized_prompts(
+        self,
+        username: str,
+        target_post_content: str,
+        target_author: str,
+        post_type: str,
+        language: str,
+        persona: Optional[str],
+    ) -> tuple[tuple[str, ...], str, str, list[str], Optional[dict]]:
+        """Build the (system_prefix, system, user) prompts for a personalized post.
+
+        The prefix holds the cacheable blocks: the shared instructions, then
+        the persona instruction when one is set. Also returns the user's
+        recent posts and the persona info, which shape the final response.
+        """
         # Fetch user's recent 5 posts for style analysis
         recent_posts = []
         try:
@@ -935,34 +1196,11 @@ Return ONLY the Chinese translation, nothing else."""
             except ValueError:
                 pass  # Invalid persona, ignore
 
-        # Build prompt based on whether we have recent posts
-        system_prompt = f"""{X_ALGORITHM_KNOWLEDGE}
-
-You are an expert at analyzing content context and generating personalized responses.
-{persona_instruction}
-
-CRITICAL: Before generating any response, you MUST first deeply understand the target post:
-1. What is the main topic or subject?
-2. What specific claims, opinions, or questions are being made?
-3. What is the tone and sentiment (excited, frustrated, curious, etc.)?
-4. What would be a meaningful response that directly engages with these points?
-
-Your task:
-1. FIRST: Thoroughly analyze the target post's content and context
-2. THEN: Analyze the user's writing style from their recent posts (if available)
-3. FINALLY: Generate a {post_type} that DIRECTLY RESPONDS to the target post's specific points
-   {' while following the specified persona style' if persona else ''}
-
-The response MUST:
-- Reference or address specific points from the target post
-- NOT be generic or off-topic
-- Show clear understanding of what the target post is saying
-
-Style Analysis Guidelines:
-- Tone: formal vs casual, serious vs humorous
-- Emoji usage: frequency, types, positions
-- Sentence structure: short vs long, simple vs complex
-
+        # Static blocks first so the cached prefix matches across calls
+        system_prefix = (X_ALGORITHM_KNOWLEDGE, PERSONALIZED_INSTRUCTIONS)
+        if persona_instruction:
+            system_prefix += (persona_instruction,)
+        system_prompt = f"""Post type to generate: {post_type}{' (follow the persona style above)' if persona_instruction else ''}
 IMPORTANT: The generated content MUST be in {target_lang}."""
 
         if recent_posts:
@@ -1038,39 +1276,32 @@ Respond in this exact JSON format (ALL fields are REQUIRED - do not skip any):
 
 IMPORTANT: You MUST include the "target_analysis" object in your response. This is required for quality assurance."""
 
-        try:
-            message = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1000,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-            )
-
-            response_text = message.content[0].text
+        return system_prefix, system_prompt, user_prompt, recent_posts, persona_info
 
-            # Parse JSON response
-            result = self._parse_json_response(response_text)
-            if result:
-                response_data = {
-                    "username": username,
-                    "generated_content": result.get("generated_content", ""),
-                    "target_analysis": result.get("target_analysis", {}),
-                    "style_analysis": result.get("style_analysis", {}),
-                    "confidence": result.get("confidence", 0.5 if not recent_posts else 0.8),
-                    "reasoning": result.get("reasoning", ""),
-                    "post_type": post_type,
-                    "target_author": target_author,
-                }
-                # Add persona info if used
-                if persona_info:
-                    response_data["persona"] = persona_info
-                return response_data
-
-            return None
-
-        except Exception as e:
-            print(f"Claude API error in generate_personalized_post: {e}")
-            return None
+    def _personalized_result(
+        self,
+        result: dict,
+        username: str,
+        post_type: str,
+        target_author: str,
+        recent_posts: list[str],
+        persona_info: Optional[dict],
+    ) -> dict:
+        """Build the personalized post response from Claude's parsed JSON."""
+        response_data = {
+            "username": username,
+            "generated_content": result.get("generated_content", ""),
+            "target_analysis": result.get("target_analysis", {}),
+            "style_analysis": result.get("style_analysis", {}),
+            "confidence": result.get("confidence", 0.5 if not recent_posts else 0.8),
+            "reasoning": result.get("reasoning", ""),
+            "post_type": post_type,
+            "target_author": target_author,
+        }
+        # Add persona info if used
+        if persona_info:
+            response_data["persona"] = persona_info
+        return response_data
 
     def _parse_json_response(self, text: str) -> Optional[dict]:
         """Parse JSON from Claude's response."""
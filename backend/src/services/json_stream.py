@@ -0,0 +1,104 @@
+"""Incremental extraction of a string field from streamed JSON text."""
+
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+def _decode(raw: str) -> str:
+    """Decode the raw (escaped) contents of a JSON string."""
+    try:
+        return json.loads('"' + raw + '"')
+    except ValueError:
+        return raw  # Invalid escape: pass it through as written
+
+
+class JsonStringFieldStream:
+    """Decode one string field of a JSON object while the JSON is streaming.
+
+    Feed text chunks as they arrive; each call returns the part of the
+    field's value decoded so far that hasn't been returned yet. Text outside
+    the JSON object (e.g. a ```json fence) is ignored, and only a key (a
+    string followed by ':') matches, never a string value that happens to
+    contain the field name.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.done = False
+        self._in_string = False
+        self._escape = ""  # Pending escape sequence, e.g. "\\u00"
+        self._high_surrogate = ""  # "\\uD83D" waiting for its low half
+        self._string: list[str] | None = []  # Current string, while it could be the key
+        self._last_string: str | None = None
+        self._awaiting_value = False
+        self._capturing = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return newly decoded text of the field."""
+        out: list[str] = []
+        for char in chunk:
+            if self.done:
+                break
+            if self._capturing:
+                self._feed_value(char, out)
+            elif self._in_string:
+                self._feed_string(char)
+            elif self._awaiting_value:
+                if char == '"':
+                    self._capturing = True
+                    self._awaiting_value = False
+                elif char not in _WHITESPACE:
+                    self._awaiting_value = False  # Not a string value
+            elif char == '"':
+                self._in_string = True
+                self._string = []
+            elif char == ":" and self._last_string == self.field:
+                self._awaiting_value = True
+            elif char not in _WHITESPACE:
+                self._last_string = None
+        return "".join(out)
+
+    def _feed_string(self, char: str) -> None:
+        """Track a string that isn't being captured (it may be a key)."""
+        if self._escape:
+            self._escape = ""
+            if self._string is not None:
+                self._string.extend(("\\", char))
+        elif char == "\\":
+            self._escape = "\\"
+        elif char == '"':
+            self._in_string = False
+            self._last_string = (
+                _decode("".join(self._string)) if self._string is not None else None
+            )
+        elif self._string is not None:
+            self._string.append(char)
+            # Longer than any escaped form of the key: can't be it
+            if len(self._string) > 6 * len(self.field):
+                self._string = None
+
+    def _feed_value(self, char: str, out: list[str]) -> None:
+        """Decode one character of the captured string value."""
+        if self._escape:
+            self._escape += char
+            if self._escape[1] == "u" and len(self._escape) < 6:
+                return
+            escape, self._escape = self._escape, ""
+            if escape[1] == "u" and escape[2:4].upper() in ("D8", "D9", "DA", "DB"):
+                self._high_surrogate = escape
+                return
+            out.append(_decode(self._high_surrogate + escape))
+            self._high_surrogate = ""
+            return
+
+        if char == "\\":
+            self._escape = "\\"
+            return
+        if self._high_surrogate:
+            out.append(_decode(self._high_surrogate))
+            self._high_surrogate = ""
+        if char == '"':
+            self.done = True
+        else:
+            out.append(char)
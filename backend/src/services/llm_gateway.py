@@ -0,0 +1,210 @@
+"""Async gateway for Claude API calls."""
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from functools import lru_cache
+from typing import Any, Optional
+
+import anthropic
+from anthropic.types import Message
+
+from src.config import get_settings
+
+
+class ClaudeGateway:
+    """Shared async Claude client for all services.
+
+    One AsyncAnthropic instance (and its connection pool) is reused across
+    requests, and a per-process semaphore caps concurrent Claude calls so a
+    burst of slow completions can't exhaust the worker.
+
+    Static system-prompt blocks passed as system_prefix are marked for
+    provider-side prompt caching. Token usage, including cache reads and
+    writes, is tallied per tag for stats(). A marked call that neither
+    reads nor writes the cache (e.g. a prefix under the model's minimum
+    cacheable length) is counted as uncached_prefix_calls and logged.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        max_concurrency: int = 8,
+        timeout_seconds: float = 60.0,
+        prompt_caching: bool = True,
+        log_usage: bool = False,
+    ):
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=timeout_seconds,
+        )
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.prompt_caching = prompt_caching
+        self.log_usage = log_usage
+        self._semaphore: asyncio.Semaphore | None = None
+        self._usage: dict[str, dict[str, int]] = {}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _message_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: Optional[str],
+        system_prefix: Sequence[str],
+    ) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": messages,
+        }
+        if system_prefix:
+            # Cache breakpoint after each static block; the caller keeps
+            # them byte-identical across calls so the cached prefix matches
+            blocks: list[dict[str, Any]] = []
+            for text in system_prefix:
+                block: dict[str, Any] = {"type": "text", "text": text}
+                if self.prompt_caching:
+                    block["cache_control"] = {"type": "ephemeral"}
+                blocks.append(block)
+            if system:
+                blocks.append({"type": "text", "text": system})
+            kwargs["system"] = blocks
+        elif system is not None:
+            kwargs["system"] = system
+        return kwargs
+
+    def _record_usage(self, tag: str, usage: Any, cache_marked: bool = False) -> None:
+        """Tally token usage for a finished call."""
+        if usage is None:
+            return
+        counts = {
+            "input_tokens": usage.input_tokens or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "output_tokens": usage.output_tokens or 0,
+        }
+        totals = self._usage.setdefault(
+            tag, dict.fromkeys(("calls", *counts, "uncached_prefix_calls"), 0)
+        )
+        totals["calls"] += 1
+        for key, value in counts.items():
+            totals[key] += value
+
+        if cache_marked and not (
+            counts["cache_read_input_tokens"] or counts["cache_creation_input_tokens"]
+        ):
+            totals["uncached_prefix_calls"] += 1
+            print(
+                f"Claude prompt cache not used [{tag}]: the cached system prefix "
+                f"may be shorter than the model's minimum"
+            )
+
+        if self.log_usage:
+            print(
+                f"Claude usage [{tag}]: input={counts['input_tokens']} "
+                f"cache_read={counts['cache_read_input_tokens']} "
+                f"cache_write={counts['cache_creation_input_tokens']} "
+                f"output={counts['output_tokens']}"
+            )
+
+    async def create(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: Optional[str] = None,
+        system_prefix: Sequence[str] = (),
+        tag: str = "default",
+    ) -> Message:
+        """Create a Claude message without blocking the event loop.
+
+        Args:
+            messages: Conversation messages
+            max_tokens: Maximum tokens to generate
+            system: Per-call (uncached) system prompt text
+            system_prefix: Static system blocks to cache, sent before system
+            tag: Name to tally usage under in stats()
+        """
+        kwargs = self._message_kwargs(messages, max_tokens, system, system_prefix)
+        async with self._get_semaphore():
+            message = await self.client.messages.create(**kwargs)
+        self._record_usage(
+            tag, getattr(message, "usage", None), self._cache_marked(system_prefix)
+        )
+        return message
+
+    async def stream(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: Optional[str] = None,
+        system_prefix: Sequence[str] = (),
+        tag: str = "default",
+    ) -> AsyncIterator[str]:
+        """Stream a Claude message, yielding text deltas as they arrive.
+
+        Takes the same arguments as create. The concurrency slot is held
+        until the stream finishes or the consumer stops iterating.
+        """
+        kwargs = self._message_kwargs(messages, max_tokens, system, system_prefix)
+        async with self._get_semaphore():
+            async with self.client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                message = await stream.get_final_message()
+        self._record_usage(
+            tag, getattr(message, "usage", None), self._cache_marked(system_prefix)
+        )
+
+    def _cache_marked(self, system_prefix: Sequence[str]) -> bool:
+        return self.prompt_caching and bool(system_prefix)
+
+    def stats(self) -> dict[str, Any]:
+        """Token usage per tag, with the share of input served from cache."""
+        stats = {}
+        for tag, totals in self._usage.items():
+            prompt_tokens = (
+                totals["input_tokens"]
+                + totals["cache_read_input_tokens"]
+                + totals["cache_creation_input_tokens"]
+            )
+            stats[tag] = {
+                **totals,
+                "cached_input_ratio": round(
+                    totals["cache_read_input_tokens"] / prompt_tokens, 4
+                ) if prompt_tokens else 0.0,
+            }
+        return stats
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+
+@lru_cache
+def get_llm_gateway() -> Optional[ClaudeGateway]:
+    """Get the singleton Claude gateway, or None if no API key is configured."""
+    settings = get_settings()
+    if not settings.anthropic_api_key:
+        return None
+
+    return ClaudeGateway(
+        api_key=settings.anthropic_api_key,
+        model=settings.claude_model,
+        max_concurrency=settings.claude_max_concurrency,
+        timeout_seconds=settings.claude_timeout_seconds,
+        prompt_caching=settings.claude_prompt_caching,
+        log_usage=settings.claude_log_usage,
+    )
+
+
+async def close_llm_gateway() -> None:
+    """Close the Claude gateway (called on application shutdown)."""
+    gateway = get_llm_gateway()
+    if gateway is not None:
+        await gateway.close()
+    get_llm_gateway.cache_clear()
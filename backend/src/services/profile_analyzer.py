@@ -1,10 +1,15 @@
 """Profile analysis service."""
 
+import asyncio
 import re
 from collections import Counter
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
 
+from src.cache import SharedTTLCache, SingleFlight
+from src.config import get_settings
+from src.db.supabase_client import SupabaseCache
 from src.engine import (
     extract_profile_features,
     WeightedScorer,
@@ -105,31 +110,117 @@ class ProfileAnalysisResult:
     summary: str
     raw_data: Optional[ProfileData] = None
 
+    def to_data(self, post_count: int) -> dict[str, Any]:
+        """Serialize for the profile_analyses table (raw_data is not stored)."""
+        return {
+            "post_count": post_count,
+            "username": self.username,
+            "scores": asdict(self.scores),
+            "features": asdict(self.features),
+            "insights": [asdict(i) for i in self.insights],
+            "recommendations": [asdict(r) for r in self.recommendations],
+            "summary": self.summary,
+        }
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> "ProfileAnalysisResult":
+        return cls(
+            username=data["username"],
+            scores=PentagonScores(**data["scores"]),
+            features=ProfileFeatures(**data["features"]),
+            insights=[Insight(**i) for i in data["insights"]],
+            recommendations=[Recommendation(**r) for r in data["recommendations"]],
+            summary=data["summary"],
+        )
+
 
 class ProfileAnalyzer:
-    """Service for analyzing X profiles."""
+    """Service for analyzing X profiles.
+
+    Results are cached in two tiers: in-process, then the Supabase
+    profile_analyses table, which workers share and which survives restarts.
+    """
 
     def __init__(self):
+        settings = get_settings()
         self.client = SelaAPIClient()
         self.scorer = WeightedScorer()
+        self.store = SupabaseCache()
+        self.ttl_seconds = settings.profile_analysis_ttl_seconds
+        self._cache = SharedTTLCache(
+            maxsize=settings.profile_analysis_cache_size,
+            ttl_seconds=settings.profile_analysis_ttl_seconds,
+            stale_ttl_seconds=settings.profile_stale_grace_seconds,
+            name="profile_analysis",
+            timeout_seconds=settings.cache_backend_timeout_seconds,
+        )
+        self._refreshes = SingleFlight()
 
     async def analyze(
         self,
         username: str,
         post_count: int = 20,
+        refresh: bool = False,
     ) -> ProfileAnalysisResult:
         """
         Analyze a user's X profile.
 
+        A cached analysis past its TTL is returned as-is while a background
+        refresh replaces it, as long as it's within the stale grace window.
+        On an in-process miss, an unexpired analysis saved by any worker is
+        reused before scraping.
+
         Args:
             username: X username (without @)
             post_count: Number of recent posts to analyze
+            refresh: Skip all caches and re-scrape the profile
 
         Returns:
             ProfileAnalysisResult with scores, insights, and recommendations
         """
+        key = (username.lower(), post_count)
+
+        if not refresh:
+            entry = await self._cache.aget_entry(key)
+            if entry is not None:
+                result, is_stale = entry
+                if is_stale:
+                    self._refreshes.start(
+                        key, lambda: self._run_analysis(username, post_count)
+                    )
+                return result
+
+        return await self._refreshes.do(
+            key,
+            lambda: self._run_analysis(
+                username, post_count, max_age_seconds=0 if refresh else None
+            ),
+        )
+
+    async def _run_analysis(
+        self,
+        username: str,
+        post_count: int,
+        max_age_seconds: Optional[float] = None,
+    ) -> ProfileAnalysisResult:
+        """Load a shared analysis, or fetch and analyze the profile.
+
+        max_age_seconds=0 (refresh) skips the shared tier. Results are
+        cached in both tiers.
+        """
+        key = (username.lower(), post_count)
+
+        if max_age_seconds != 0:
+            stored = await self._load_stored_analysis(username, post_count)
+            if stored is not None:
+                result, ttl_seconds = stored
+                self._cache.set(key, result, ttl_seconds=ttl_seconds)
+                return result
+
         # Fetch profile data
-        response = await self.client.get_twitter_profile(username, post_count)
+        response = await self.client.get_twitter_profile(
+            username, post_count, max_age_seconds=max_age_seconds
+        )
 
         if not response.success or not response.profile:
             raise ValueError(f"Failed to fetch profile: {response.error}")
@@ -151,7 +242,7 @@ class ProfileAnalyzer:
         # Generate summary
         summary = self._generate_summary(profile, features, scores)
 
-        return ProfileAnalysisResult(
+        result = ProfileAnalysisResult(
             username=username,
             scores=scores,
             features=features,
@@ -160,6 +251,37 @@ class ProfileAnalyzer:
             summary=summary,
             raw_data=profile,
         )
+        self._cache.set(key, result)
+        # Share with other workers (async, don't wait)
+        asyncio.create_task(self.store.save_analysis(
+            username.lower(),
+            scores.to_dict(),
+            result.to_data(post_count),
+            ttl_seconds=self.ttl_seconds,
+        ))
+        return result
+
+    async def _load_stored_analysis(
+        self,
+        username: str,
+        post_count: int,
+    ) -> Optional[tuple[ProfileAnalysisResult, float]]:
+        """Get an unexpired shared analysis and its remaining lifetime."""
+        row = await self.store.get_analysis_cache(username.lower())
+        if not row:
+            return None
+        try:
+            data = row["analysis_data"]
+            if data["post_count"] != post_count:
+                return None
+            expires_at = datetime.fromisoformat(row["expires_at"])
+            ttl_seconds = (expires_at - datetime.now(timezone.utc)).total_seconds()
+            if ttl_seconds <= 0:
+                return None
+            return ProfileAnalysisResult.from_data(data), ttl_seconds
+        except Exception as e:
+            print(f"Ignoring unreadable profile analysis for {username}: {e}")
+            return None
 
     def _calculate_profile_scores(self, features: ProfileFeatures) -> PentagonScores:
         """Calculate pentagon scores from profile features."""
@@ -1,18 +1,24 @@
 """Score prediction service for posts."""
 
 import asyncio
+import hashlib
 import re
-from dataclasses import dataclass, field
+from dataclasses import astuple, dataclass, field
+from datetime import datetime, timezone
 from functools import lru_cache
 from typing import Literal, Optional
 
+from src.cache import SharedTTLCache, SingleFlight, TTLCache
+from src.config import get_settings
 from src.engine import (
     extract_post_features,
+    extract_post_features_batch,
     extract_profile_features,
     WeightedScorer,
     PentagonScores,
     ActionProbabilities,
     PostFeatures,
+    ProfileFeatures,
 )
 from src.services.sela_api_client import SelaAPIClient, TweetData
 from src.services.x_algorithm_advisor import XAlgorithmAdvisor
@@ -56,6 +62,23 @@ def detect_language(text: str) -> str:
     return result
 
 
+def post_memo_key(
+    content: str,
+    media_type: Optional[str] = None,
+    is_quote: bool = False,
+) -> tuple:
+    """Key for memoized post features: a digest of the text plus the flags
+    that change extraction. The text is hashed as-is, since every character
+    counts toward the features."""
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+    return (digest, media_type, is_quote)
+
+
+def profile_version(profile_features: ProfileFeatures) -> tuple:
+    """Fingerprint of profile features; changes whenever any value does."""
+    return astuple(profile_features)
+
+
 @dataclass
 class QuickTip:
     """Structured quick tip for post optimization."""
@@ -84,6 +107,64 @@ class PostAnalysisResult:
     context: Optional[ContextInfo] = None
 
 
+@dataclass
+class ScoringSession:
+    """A compose session's author profile and target post, resolved once."""
+    post_type: str
+    profile_features: ProfileFeatures
+    context: Optional[ContextInfo] = None
+    context_boost: Optional[dict[str, float]] = None
+    target_language: Optional[str] = None
+
+
+@dataclass
+class RankedPostResult:
+    """A draft's analysis within a batch, with its position in the request."""
+    index: int
+    content: str
+    result: PostAnalysisResult
+
+
+def build_target_context(
+    target_post: TweetData,
+) -> tuple[ContextInfo, dict[str, float]]:
+    """Context info and score boosts for a reply/quote to target_post."""
+    context_boost = {}
+    adjustments = {}
+    recommendations = []
+
+    # Large account bonus
+    if target_post.views_count > 100000:
+        context_boost["p_click"] = 0.25
+        context_boost["p_profile_click"] = 0.20
+        adjustments["large_account_bonus"] = "+25%"
+        recommendations.append("Large account post - high exposure expected")
+
+    # Freshness bonus (if posted within last hour)
+    if target_post.posted_at:
+        age_minutes = (datetime.now(timezone.utc) - target_post.posted_at).total_seconds() / 60
+
+        if age_minutes < 60:
+            context_boost["p_click"] = context_boost.get("p_click", 0) + 0.15
+            adjustments["freshness_bonus"] = "+15%"
+            recommendations.append(f"Post was created {int(age_minutes)} minutes ago - freshness bonus applied")
+
+    # Reply competition penalty
+    if target_post.replies_count > 1000:
+        penalty = -0.10
+        context_boost["p_click"] = context_boost.get("p_click", 0) + penalty
+        adjustments["reply_competition"] = "-10%"
+        recommendations.append(f"Currently {target_post.replies_count:,} replies - stand out with a unique perspective")
+
+    context = ContextInfo(
+        target_post=target_post,
+        context_adjustments=adjustments,
+        recommendations=recommendations,
+    )
+
+    return context, context_boost
+
+
 class ScorePredictor:
     """Service for predicting post scores."""
 
@@ -92,7 +173,30 @@ class ScorePredictor:
         self.scorer = WeightedScorer()
         self.advisor = XAlgorithmAdvisor()
         self.cache = SupabaseCache()
-        self._profile_cache: dict[str, any] = {}
+        settings = get_settings()
+        self._profile_cache = SharedTTLCache(
+            maxsize=settings.profile_features_cache_size,
+            ttl_seconds=settings.profile_features_ttl_seconds,
+            stale_ttl_seconds=settings.profile_stale_grace_seconds,
+            name="profile_features",
+            timeout_seconds=settings.cache_backend_timeout_seconds,
+        )
+        self._profile_loads = SingleFlight()
+        # Editor debounces re-send identical drafts; skip recomputing them.
+        # Kept in-process only: recomputing beats a round-trip to a shared tier
+        self._features_memo = TTLCache(
+            maxsize=settings.post_memo_cache_size,
+            ttl_seconds=settings.post_memo_ttl_seconds,
+            name="post_features",
+        )
+        self._scores_memo = TTLCache(
+            maxsize=settings.post_memo_cache_size,
+            ttl_seconds=settings.post_memo_ttl_seconds,
+            name="post_scores",
+        )
+        # Advisor calls that ran past their request's budget, still filling
+        # the suggestion cache
+        self._background_tips: set[asyncio.Task] = set()
 
     async def predict(
         self,
@@ -102,6 +206,7 @@ class ScorePredictor:
         target_post_url: Optional[str] = None,
         media_type: Optional[Literal["image", "video", "gif"]] = None,
         target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None,
+        budget_seconds: Optional[float] = None,
     ) -> PostAnalysisResult:
         """
         Predict scores for a post.
@@ -112,16 +217,18 @@ class ScorePredictor:
             post_type: Type of post
             target_post_url: URL of target post (for reply/quote)
             media_type: Type of media attached
+            budget_seconds: Time the advisor gets once called (default
+                            ANALYZE_BUDGET_SECONDS); past it, rule-based
+                            tips replace the advisor's
 
         Returns:
             PostAnalysisResult with scores and recommendations
         """
-        # Extract post features (sync, fast)
-        post_features = extract_post_features(
-            content,
-            media_type=media_type,
-            is_quote=(post_type == "quote"),
-        )
+        tips_budget = self._tips_budget(budget_seconds)
+
+        # Extract post features (sync, fast, memoized)
+        memo_key = post_memo_key(content, media_type, post_type == "quote")
+        post_features = self._extract_post_features(memo_key, content)
 
         # PARALLEL EXECUTION: Fetch profile and context simultaneously
         if post_type in ("reply", "quote") and target_post_url:
@@ -137,8 +244,9 @@ class ScorePredictor:
             context = None
             context_boost = None
 
-        # Calculate scores (sync, fast)
-        scores, probs = self.scorer.analyze_post(
+        # Calculate scores (sync, fast, memoized)
+        scores, probs = self._analyze_post(
+            memo_key,
             post_features,
             profile_features,
             context_boost,
@@ -162,6 +270,7 @@ class ScorePredictor:
             post_type=post_type,
             target_content=target_content,
             target_language=detected_language,
+            budget_seconds=tips_budget,
         )
 
         return PostAnalysisResult(
@@ -172,19 +281,200 @@ class ScorePredictor:
             context=context,
         )
 
+    async def predict_many(
+        self,
+        username: str,
+        contents: list[str],
+        post_type: Literal["original", "reply", "quote", "thread"] = "original",
+        target_post_url: Optional[str] = None,
+        media_type: Optional[Literal["image", "video", "gif"]] = None,
+        target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None,
+        top_k: int = 0,
+        budget_seconds: Optional[float] = None,
+    ) -> list[RankedPostResult]:
+        """
+        Score many drafts by the same author in one pass.
+
+        The profile (and target post context) is resolved once and shared by
+        every draft. Advisor tips are requested only for the top_k drafts by
+        overall score; the rest get rule-based tips.
+
+        Args:
+            username: Author's X username
+            contents: Draft contents to score
+            post_type: Type of post (shared by all drafts)
+            target_post_url: URL of target post (for reply/quote)
+            media_type: Type of media attached (shared by all drafts)
+            target_language: Language for tips (detected if omitted)
+            top_k: Number of top drafts to request advisor tips for
+            budget_seconds: Time the advisor gets once called (default
+                            ANALYZE_BUDGET_SECONDS); past it, rule-based
+                            tips replace the advisor's
+
+        Returns:
+            RankedPostResult list, best overall score first
+        """
+        tips_budget = self._tips_budget(budget_seconds)
+
+        if post_type in ("reply", "quote") and target_post_url:
+            profile_features, (context, context_boost) = await asyncio.gather(
+                self._get_profile_features(username),
+                self._analyze_context(target_post_url),
+            )
+        else:
+            profile_features = await self._get_profile_features(username)
+            context = None
+            context_boost = None
+
+        target_content = context.target_post.content if context else None
+
+        all_features = extract_post_features_batch(
+            contents,
+            media_type=media_type,
+            is_quote=(post_type == "quote"),
+        )
+        analyses = self.scorer.analyze_posts(
+            all_features,
+            profile_features,
+            context_boost,
+        )
+
+        ranked = [
+            RankedPostResult(
+                index=index,
+                content=content,
+                result=PostAnalysisResult(
+                    scores=scores,
+                    probabilities=probs,
+                    features=post_features,
+                    quick_tips=[],
+                    context=context,
+                ),
+            )
+            for index, (content, post_features, (scores, probs)) in enumerate(
+                zip(contents, all_features, analyses)
+            )
+        ]
+        ranked.sort(key=lambda r: r.result.scores.overall, reverse=True)
+
+        def language_for(content: str) -> str:
+            if target_language:
+                return target_language
+            return detect_language(target_content or content)
+
+        # Advisor tips for the top drafts only, requested concurrently
+        top = ranked[:max(top_k, 0)]
+        tips = await asyncio.gather(*(
+            self._generate_algorithm_tips(
+                content=r.content,
+                scores=r.result.scores,
+                features=r.result.features,
+                post_type=post_type,
+                target_content=target_content,
+                target_language=language_for(r.content),
+                budget_seconds=tips_budget,
+            )
+            for r in top
+        ))
+        for r, quick_tips in zip(top, tips):
+            r.result.quick_tips = quick_tips
+        for r in ranked[len(top):]:
+            r.result.quick_tips = self._generate_fallback_tips(
+                r.result.features, r.result.scores, language_for(r.content)
+            )
+
+        return ranked
+
+    def _extract_post_features(self, memo_key: tuple, content: str) -> PostFeatures:
+        """extract_post_features, memoized on post_memo_key."""
+        features = self._features_memo.get(memo_key)
+        if features is None:
+            _, media_type, is_quote = memo_key
+            features = extract_post_features(
+                content,
+                media_type=media_type,
+                is_quote=is_quote,
+            )
+            self._features_memo.set(memo_key, features)
+        return features
+
+    def _analyze_post(
+        self,
+        memo_key: tuple,
+        post_features: PostFeatures,
+        profile_features: ProfileFeatures,
+        context_boost: Optional[dict[str, float]] = None,
+    ) -> tuple[PentagonScores, ActionProbabilities]:
+        """WeightedScorer.analyze_post, memoized on the post and profile.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+        key = (
+            memo_key,
+            profile_version(profile_features),
+            tuple(sorted(context_boost.items())) if context_boost else None,
+        )
+        result = self._scores_memo.get(key)
+        if result is None:
+            result = self.scorer.analyze_post(
+                post_features,
+                profile_features,
+                context_boost,
+            )
+            self._scores_memo.set(key, result)
+        return result
+
     async def _get_profile_features(self, username: str):
-        """Get profile features (with multi-layer caching)."""
-        # Layer 1: In-memory cache (fastest)
-        if username in self._profile_cache:
-            return self._profile_cache[username]
+        """Get profile features (with multi-layer caching).
+
+        Features past their TTL but within the stale grace window are
+        returned immediately while one background refresh per user fetches
+        new ones, so scoring never waits on a scrape for a known user.
+        """
+        # Layer 1: In-memory cache (fastest), then the shared cache tier
+        entry = await self._profile_cache.aget_entry(username)
+        if entry is not None:
+            cached_features, is_stale = entry
+            if is_stale:
+                self._profile_loads.start(
+                    username, lambda: self._load_profile_features(username)
+                )
+            return cached_features
+
+        features = await self._profile_loads.do(
+            username, lambda: self._load_profile_features(username)
+        )
+        if features is not None:
+            return features
+
+        # Return default features if fetch fails
+        from src.engine.feature_extractor import ProfileFeatures
+        return ProfileFeatures(
+            username=username,
+            tweet_count=0,
+            avg_engagement_rate=0.02,
+            avg_likes=100,
+            avg_retweets=10,
+            avg_replies=5,
+            avg_views=1000,
+            retweet_ratio=0.2,
+            quote_ratio=0.1,
+            media_ratio=0.5,
+            engagement_consistency=0.7,
+        )
 
+    async def _load_profile_features(self, username: str):
+        """Load profile features from Supabase or Sela into the memory cache.
+
+        Returns None if the profile can't be fetched.
+        """
         # Layer 2: Supabase cache (persistent, 1-hour TTL)
         try:
             cached = await self.cache.get_profile_cache(username)
             if cached and cached.get("profile_data"):
                 from src.engine.feature_extractor import ProfileFeatures
                 features = ProfileFeatures(**cached["profile_data"])
-                self._profile_cache[username] = features
+                self._profile_cache.set(username, features)
                 return features
         except Exception:
             pass  # Continue to API call if cache fails
@@ -194,7 +484,7 @@ class ScorePredictor:
 
         if response.success and response.profile:
             features = extract_profile_features(response.profile)
-            self._profile_cache[username] = features
+            self._profile_cache.set(username, features)
 
             # Save to Supabase cache (async, don't wait)
             try:
@@ -206,69 +496,99 @@ class ScorePredictor:
 
             return features
 
-        # Return default features if fetch fails
-        from src.engine.feature_extractor import ProfileFeatures
-        return ProfileFeatures(
-            username=username,
-            tweet_count=0,
-            avg_engagement_rate=0.02,
-            avg_likes=100,
-            avg_retweets=10,
-            avg_replies=5,
-            avg_views=1000,
-            retweet_ratio=0.2,
-            quote_ratio=0.1,
-            media_ratio=0.5,
-            engagement_consistency=0.7,
+        return None
+
+    async def open_session(
+        self,
+        username: str,
+        post_type: Literal["original", "reply", "quote", "thread"] = "original",
+        target_post_url: Optional[str] = None,
+        target_language: Optional[Literal["ko", "en", "ja", "zh"]] = None,
+    ) -> ScoringSession:
+        """Resolve the profile (and target post) for scoring many drafts."""
+        if post_type in ("reply", "quote") and target_post_url:
+            profile_features, (context, context_boost) = await asyncio.gather(
+                self._get_profile_features(username),
+                self._analyze_context(target_post_url),
+            )
+        else:
+            profile_features = await self._get_profile_features(username)
+            context = None
+            context_boost = None
+
+        return ScoringSession(
+            post_type=post_type,
+            profile_features=profile_features,
+            context=context,
+            context_boost=context_boost,
+            target_language=target_language,
         )
 
+    def score_draft(
+        self,
+        session: ScoringSession,
+        content: str,
+        media_type: Optional[Literal["image", "video", "gif"]] = None,
+    ) -> PostAnalysisResult:
+        """Score a draft locally (no I/O), with rule-based tips."""
+        memo_key = post_memo_key(content, media_type, session.post_type == "quote")
+        post_features = self._extract_post_features(memo_key, content)
+        scores, probs = self._analyze_post(
+            memo_key,
+            post_features,
+            session.profile_features,
+            session.context_boost,
+        )
+        return PostAnalysisResult(
+            scores=scores,
+            probabilities=probs,
+            features=post_features,
+            quick_tips=self._generate_fallback_tips(
+                post_features, scores, self._session_language(session, content)
+            ),
+            context=session.context,
+        )
+
+    async def draft_tips(
+        self,
+        session: ScoringSession,
+        content: str,
+        result: PostAnalysisResult,
+    ) -> list[QuickTip]:
+        """Advisor tips for a draft scored by score_draft()."""
+        return await self._generate_algorithm_tips(
+            content=content,
+            scores=result.scores,
+            features=result.features,
+            post_type=session.post_type,
+            target_content=session.context.target_post.content if session.context else None,
+            target_language=self._session_language(session, content),
+        )
+
+    @staticmethod
+    def _session_language(session: ScoringSession, content: str) -> str:
+        if session.target_language:
+            return session.target_language
+        if session.context:
+            return detect_language(session.context.target_post.content)
+        return detect_language(content)
+
     async def _analyze_context(
         self,
         target_post_url: str,
     ) -> tuple[Optional[ContextInfo], Optional[dict[str, float]]]:
-        """Analyze target post context for reply/quote."""
+        """Analyze target post context for reply/quote.
 
+        The post comes from the client's post context cache, so repeated
+        analyze calls share one lookup; the boosts are rebuilt each time
+        from its current metrics and age.
+        """
         target_post = await self.client.get_post_context(target_post_url)
 
         if not target_post:
             return None, None
 
-        # Calculate context boosts
-        context_boost = {}
-        adjustments = {}
-        recommendations = []
-
-        # Large account bonus
-        if target_post.views_count > 100000:
-            context_boost["p_click"] = 0.25
-            context_boost["p_profile_click"] = 0.20
-            adjustments["large_account_bonus"] = "+25%"
-            recommendations.append("Large account post - high exposure expected")
-
-        # Freshness bonus (if posted within last hour)
-        if target_post.posted_at:
-            from datetime import datetime, timezone
-            age_minutes = (datetime.now(timezone.utc) - target_post.posted_at).total_seconds() / 60
-
-            if age_minutes < 60:
-                context_boost["p_click"] = context_boost.get("p_click", 0) + 0.15
-                adjustments["freshness_bonus"] = "+15%"
-                recommendations.append(f"Post was created {int(age_minutes)} minutes ago - freshness bonus applied")
-
-        # Reply competition penalty
-        if target_post.replies_count > 1000:
-            penalty = -0.10
-            context_boost["p_click"] = context_boost.get("p_click", 0) + penalty
-            adjustments["reply_competition"] = "-10%"
-            recommendations.append(f"Currently {target_post.replies_count:,} replies - stand out with a unique perspective")
-
-        context = ContextInfo(
-            target_post=target_post,
-            context_adjustments=adjustments,
-            recommendations=recommendations,
-        )
-
-        return context, context_boost
+        return build_target_context(target_post)
 
     async def _generate_algorithm_tips(
         self,
@@ -278,8 +598,15 @@ class ScorePredictor:
         post_type: str = "original",
         target_content: Optional[str] = None,
         target_language: Optional[str] = None,
+        budget_seconds: Optional[float] = None,
     ) -> list[QuickTip]:
-        """Generate X Algorithm-based improvement tips using Claude AI."""
+        """Generate X Algorithm-based improvement tips using Claude AI.
+
+        If the advisor hasn't answered within budget_seconds of being
+        called (None waits for it), the rule-based tips are returned
+        instead and the advisor call keeps running in the background, so
+        its result is cached for the next analyze of the same draft.
+        """
         try:
             # Language priority: 1) explicit target_language, 2) target_content, 3) user content
             if target_language:
@@ -289,14 +616,23 @@ class ScorePredictor:
             else:
                 language = detect_language(content)
 
-            result = await self.advisor.analyze_and_suggest(
+            advice = asyncio.ensure_future(self.advisor.analyze_and_suggest(
                 content=content,
                 current_scores=scores,
                 post_features=features,
                 post_type=post_type,
                 target_post_content=target_content,
                 language=language,
-            )
+            ))
+            if budget_seconds is None:
+                result = await advice
+            else:
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(advice), budget_seconds)
+                except asyncio.TimeoutError:
+                    self._background_tips.add(advice)
+                    advice.add_done_callback(self._finish_background_tips)
+                    return self._generate_fallback_tips(features, scores, language)
 
             tips = []
             for i, suggestion in enumerate(result.get("suggestions", [])[:5]):
@@ -327,6 +663,18 @@ class ScorePredictor:
                 language = detect_language(content)
             return self._generate_fallback_tips(features, scores, language)
 
+    @staticmethod
+    def _tips_budget(budget_seconds: Optional[float]) -> Optional[float]:
+        """Seconds the advisor gets once called, or None to always wait."""
+        if budget_seconds is None:
+            budget_seconds = get_settings().analyze_budget_seconds
+        return budget_seconds if budget_seconds > 0 else None
+
+    def _finish_background_tips(self, task: asyncio.Task) -> None:
+        self._background_tips.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Background algorithm tips failed: {task.exception()}")
+
     def _is_tip_selectable(self, action: str) -> bool:
         """Determine if a tip can be auto-applied."""
         # Tips that require user input or external action
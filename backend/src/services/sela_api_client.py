@@ -6,17 +6,133 @@ Supports:
 - TWITTER_POST: Scrape Twitter posts (currently limited)
 """
 
+import asyncio
+import importlib.util
+import math
 import os
-from datetime import datetime
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
+from urllib.parse import urlparse
 
 import httpx
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, PrivateAttr
 
+from src.cache import SharedTTLCache, SingleFlight
+from src.config import get_settings
+from src.db.supabase_client import SupabaseCache
+
 load_dotenv()
 
+# HTTP/2 needs the optional `h2` package (installed via httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Shared transport: one connection pool per process, reused by every
+# SelaAPIClient instance and closed by the app lifespan on shutdown.
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client for Sela API requests.
+
+    Keeps TCP/TLS connections alive between scrapes instead of paying a
+    full handshake per request. The client is rebuilt if it was closed or
+    if it belongs to a different event loop (e.g. between test runs).
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if (
+        _http_client is None
+        or _http_client.is_closed
+        or _http_client_loop is not loop
+    ):
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            http2=settings.sela_http2 and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.sela_max_connections,
+                max_keepalive_connections=settings.sela_max_keepalive_connections,
+                keepalive_expiry=settings.sela_keepalive_expiry,
+            ),
+            timeout=90,
+        )
+        _http_client_loop = loop
+        _host_semaphores.clear()
+    return _http_client
+
+
+def _get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Get the concurrency cap for requests to the host of `url`."""
+    host = urlparse(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(
+            get_settings().sela_max_concurrency_per_host
+        )
+    return _host_semaphores[host]
+
+
+# Concurrent profile scrapes of the same user share one request
+_profile_flights = SingleFlight()
+
+
+def get_profile_flight_stats() -> dict[str, Any]:
+    """Request coalescing counters for profile scrapes."""
+    return _profile_flights.stats()
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client, _http_client_loop
+
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+    _host_semaphores.clear()
+
+
+# Timeline search steps for locating a post in its author's recent tweets
+POST_LOOKUP_STEPS = (50, 100, 150, 200)
+
+# X snowflake IDs encode creation time as ms since this epoch in bits 22+
+SNOWFLAKE_EPOCH_MS = 1288834974657
+
+# How long to skip TWITTER_POST scrapes after one came back empty
+POST_SCRAPE_RETRY_SECONDS = 600
+
+
+def snowflake_to_datetime(tweet_id: str) -> datetime | None:
+    """Decode the creation time embedded in a tweet ID."""
+    try:
+        timestamp_ms = (int(tweet_id) >> 22) + SNOWFLAKE_EPOCH_MS
+        return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        # Not a number, or too large to be a timestamp
+        return None
+
+
+def parse_post_url(post_url: str) -> tuple[str, str] | None:
+    """Parse (username, tweet_id) from a post URL.
+
+    Format: https://x.com/username/status/tweet_id
+    """
+    try:
+        parts = post_url.split("?")[0].rstrip("/").split("/")
+        if "status" in parts:
+            status_idx = parts.index("status")
+            return parts[status_idx - 1], parts[status_idx + 1]
+    except (ValueError, IndexError):
+        pass
+    return None
+
 
 class ScrapeType(str, Enum):
     TWITTER_PROFILE = "TWITTER_PROFILE"
@@ -293,9 +409,159 @@ class ScrapeResponse(BaseModel):
         return None
 
 
+@dataclass
+class _StoredProfile:
+    """Largest timeline slice fetched for a user."""
+    profile: ProfileData
+    post_count: int  # postCount requested when it was scraped
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def covers(self, post_count: int) -> bool:
+        """Whether this slice can answer a request for post_count posts.
+
+        A short response isn't taken to mean the timeline ended (Sela may
+        just have under-delivered), so only the requested count counts.
+        """
+        return self.post_count >= post_count
+
+
+class ProfileStore:
+    """Canonical per-user store of the largest recent timeline slice.
+
+    Services ask for different slices of the same timeline (5, 10, 20,
+    50-200 posts). Any request for N posts is answered from a fresh slice
+    with at least N posts, so one scrape serves all of them.
+    """
+
+    def __init__(self, max_users: int = 1000, ttl_seconds: float = 300):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._profiles: OrderedDict[str, _StoredProfile] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        username: str,
+        post_count: int,
+        max_age_seconds: float | None = None,
+    ) -> ProfileData | None:
+        """Get the newest post_count posts if a fresh enough slice covers them."""
+        key = username.lower()
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        entry = self._profiles.get(key)
+
+        if entry is None or entry.age > max_age or not entry.covers(post_count):
+            self.misses += 1
+            return None
+
+        self._profiles.move_to_end(key)
+        self.hits += 1
+        return ProfileData(
+            username=entry.profile.username,
+            tweets=entry.profile.tweets[:post_count],
+            job_id=entry.profile.job_id,
+        )
+
+    def put(self, username: str, profile: ProfileData, post_count: int) -> None:
+        """Store a scraped slice unless a larger fresh slice is already kept."""
+        key = username.lower()
+        entry = self._profiles.get(key)
+        if (
+            entry is not None
+            and entry.age <= self.ttl_seconds
+            and entry.post_count > post_count
+        ):
+            return
+
+        self._profiles[key] = _StoredProfile(
+            profile=profile,
+            post_count=post_count,
+            fetched_at=time.monotonic(),
+        )
+        self._profiles.move_to_end(key)
+        while len(self._profiles) > self.max_users:
+            self._profiles.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "users": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_profile_store = ProfileStore(
+    max_users=get_settings().sela_profile_store_max_users,
+    ttl_seconds=get_settings().sela_profile_store_ttl_seconds,
+)
+
+
+def get_profile_store_stats() -> dict[str, Any]:
+    """Hit/miss counters for the canonical profile store."""
+    return _profile_store.stats()
+
+
+# Target-post context by tweet ID. Metrics are fresh for
+# POST_METRICS_TTL_SECONDS; past that the entry (whose content and author
+# don't change) is still served for POST_CONTEXT_TTL_SECONDS while one
+# background scrape refreshes it.
+_post_contexts: SharedTTLCache[TweetData] = SharedTTLCache(
+    maxsize=get_settings().post_context_cache_size,
+    ttl_seconds=get_settings().post_metrics_ttl_seconds,
+    stale_ttl_seconds=get_settings().post_context_ttl_seconds,
+    name="post_context",
+    timeout_seconds=get_settings().cache_backend_timeout_seconds,
+)
+_post_flights = SingleFlight()
+
+# Called in the background with each post a lookup adds to the post context
+# cache, by whichever client looked it up (e.g. to precompute its
+# interpretation)
+_on_post_cached: Callable[[TweetData], Awaitable[Any]] | None = None
+
+POST_METRIC_FIELDS = {"likes_count", "retweets_count", "replies_count", "views_count"}
+
+
+def set_post_cached_hook(hook: Callable[[TweetData], Awaitable[Any]] | None) -> None:
+    """Set the callback run for each newly cached post (None to clear).
+
+    One hook serves every SelaAPIClient, so posts looked up by any service
+    reach it.
+    """
+    global _on_post_cached
+    _on_post_cached = hook
+
+
+def _limit_posts(response: ScrapeResponse, post_count: int) -> ScrapeResponse:
+    """Trim a profile response to at most post_count tweets."""
+    profile = response.profile
+    if not profile or len(profile.tweets) <= post_count:
+        return response
+
+    return ScrapeResponse(
+        success=response.success,
+        data=response.data,
+        error=response.error,
+        profile=ProfileData(
+            username=profile.username,
+            tweets=profile.tweets[:post_count],
+            job_id=profile.job_id,
+        ),
+    )
+
+
 class SelaAPIClient:
     """Client for Sela Network scraping API."""
 
+    # Shared across instances: TWITTER_POST scrapes are skipped until then
+    _post_scrape_disabled_until: float = 0.0
+
     def __init__(
         self,
         base_url: str | None = None,
@@ -313,6 +579,8 @@ class SelaAPIClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        # Supabase tier of the post context cache (created on first use)
+        self.post_store: SupabaseCache | None = None
 
     async def _scrape(
         self,
@@ -338,43 +606,78 @@ class SelaAPIClient:
         if reply_count is not None:
             payload["replyCount"] = reply_count
 
-        async with httpx.AsyncClient(
-            timeout=max(timeout_ms / 1000 + 30, 90)
-        ) as client:
-            try:
+        endpoint = f"{self.base_url}/api/rpc/scrapeUrl"
+        client = get_http_client()
+
+        try:
+            async with _get_host_semaphore(endpoint):
                 response = await client.post(
-                    f"{self.base_url}/api/rpc/scrapeUrl",
+                    endpoint,
                     headers=self.headers,
                     json=payload,
+                    timeout=max(timeout_ms / 1000 + 30, 90),
                 )
-                response.raise_for_status()
-                data = response.json()
-                return ScrapeResponse(success=True, data=data)
-            except httpx.HTTPStatusError as e:
-                return ScrapeResponse(
-                    success=False,
-                    error=f"HTTP {e.response.status_code}: {e.response.text}",
-                )
-            except httpx.RequestError as e:
-                return ScrapeResponse(success=False, error=str(e))
+            response.raise_for_status()
+            data = response.json()
+            return ScrapeResponse(success=True, data=data)
+        except httpx.HTTPStatusError as e:
+            return ScrapeResponse(
+                success=False,
+                error=f"HTTP {e.response.status_code}: {e.response.text}",
+            )
+        except httpx.RequestError as e:
+            return ScrapeResponse(success=False, error=str(e))
 
     async def get_twitter_profile(
         self,
         username: str,
         post_count: int = 20,
+        max_age_seconds: float | None = None,
     ) -> ScrapeResponse:
         """
         Scrape a Twitter user profile with recent posts.
 
+        Served from the canonical profile store when a fresh slice with at
+        least post_count posts exists. Otherwise scrapes at least
+        SELA_PROFILE_MIN_POSTS posts so the slice can answer later, larger
+        requests too. Concurrent calls for the same user share a single
+        in-flight scrape when it requests at least post_count posts.
+
         Args:
             username: Twitter username (without @)
             post_count: Number of recent posts to retrieve (default: 20)
+            max_age_seconds: Oldest stored slice to accept (default: store
+                TTL; 0 forces a fresh scrape)
 
         Returns:
             ScrapeResponse with profile data including recent posts
         """
         # Remove @ if present
         username = username.lstrip("@")
+
+        stored = _profile_store.get(username, post_count, max_age_seconds)
+        if stored is not None:
+            return ScrapeResponse(success=True, profile=stored)
+
+        # Join an in-flight scrape of the same user that covers post_count
+        fetch_count = max(post_count, get_settings().sela_profile_min_posts)
+        key = (username.lower(), fetch_count)
+        for in_flight in _profile_flights.in_flight():
+            if in_flight[0] == key[0] and in_flight[1] >= post_count:
+                key = in_flight
+                break
+
+        response = await _profile_flights.do(
+            key, lambda: self._fetch_twitter_profile(username, key[1])
+        )
+        return _limit_posts(response, post_count)
+
+    async def _fetch_twitter_profile(
+        self,
+        username: str,
+        post_count: int,
+    ) -> ScrapeResponse:
+        """Scrape a Twitter user profile (uncoalesced)."""
         url = f"https://x.com/{username}"
         response = await self._scrape(
             url,
@@ -385,6 +688,8 @@ class SelaAPIClient:
         # Parse profile data
         if response.success:
             response.profile = response.parse_profile()
+            if response.profile:
+                _profile_store.put(username, response.profile, post_count)
 
         return response
 
@@ -416,7 +721,13 @@ class SelaAPIClient:
         """
         Get context for a specific post.
 
-        Searches through user's recent posts (up to 200) to find the target tweet.
+        Cached by tweet ID in memory (or the shared cache tier) and in
+        Supabase, so many users replying to the same post share one lookup.
+        Once the metrics are older than POST_METRICS_TTL_SECONDS the cached
+        post is still returned while one background lookup refreshes it.
+
+        A lookup tries a direct TWITTER_POST scrape first, then searches the
+        author's recent posts (up to 200) for the target tweet.
 
         Args:
             post_url: Full URL of the Twitter post
@@ -425,30 +736,236 @@ class SelaAPIClient:
         Returns:
             TweetData if found, None otherwise
         """
-        # Parse username and tweet_id from URL
-        # Format: https://x.com/username/status/tweet_id
+        parsed = parse_post_url(post_url)
+        if not parsed:
+            return None
+        username, tweet_id = parsed
+
+        entry = await _post_contexts.aget_entry(tweet_id)
+        if entry is not None:
+            tweet, metrics_stale = entry
+            if metrics_stale:
+                self._refresh_post_context(post_url, username, tweet_id)
+            return tweet
+
+        return await _post_flights.do(
+            tweet_id, lambda: self._load_post_context(post_url, username, tweet_id)
+        )
+
+    def _refresh_post_context(self, post_url: str, username: str, tweet_id: str) -> None:
+        """Look the post up again in the background (once per tweet)."""
+        _post_flights.start(
+            ("refresh", tweet_id),
+            lambda: self._fetch_post_context(post_url, username, tweet_id),
+        )
+
+    async def _load_post_context(
+        self,
+        post_url: str,
+        username: str,
+        tweet_id: str,
+    ) -> TweetData | None:
+        """Load a post from Supabase, or look it up."""
+        stored = await self._get_stored_post_context(tweet_id)
+        if stored is None:
+            return await self._fetch_post_context(post_url, username, tweet_id)
+
+        tweet, metrics_age = stored
+        metrics_ttl = _post_contexts.ttl_seconds
+        _post_contexts.set(tweet_id, tweet, ttl_seconds=metrics_ttl - metrics_age)
+        if metrics_age >= metrics_ttl:
+            self._refresh_post_context(post_url, username, tweet_id)
+        return tweet
+
+    async def _fetch_post_context(
+        self,
+        post_url: str,
+        username: str,
+        tweet_id: str,
+    ) -> TweetData | None:
+        """Look a post up via Sela and cache it in both tiers."""
+        tweet = await self._find_post_direct(post_url, tweet_id)
+        if not tweet:
+            tweet = await self._find_post_in_timeline(username, tweet_id)
+        if not tweet:
+            return None
+
+        _post_contexts.set(tweet_id, tweet)
+        # Save to Supabase (async, don't wait)
+        asyncio.create_task(self._save_post_context(tweet_id, tweet))
+        if _on_post_cached is not None:
+            asyncio.create_task(_on_post_cached(tweet))
+        return tweet
+
+    async def _save_post_context(self, tweet_id: str, tweet: TweetData) -> None:
+        """Store a post in Supabase, metrics apart from the immutable fields."""
         try:
-            parts = post_url.rstrip("/").split("/")
-            if "status" in parts:
-                status_idx = parts.index("status")
-                username = parts[status_idx - 1]
-                tweet_id = parts[status_idx + 1]
-            else:
+            await self._get_post_store().set_post_context_cache(
+                tweet_id,
+                tweet.full_url,
+                tweet.username,
+                content_data=tweet.model_dump(mode="json", exclude=POST_METRIC_FIELDS),
+                metrics_data={
+                    **tweet.model_dump(include=POST_METRIC_FIELDS),
+                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                },
+                ttl_seconds=get_settings().post_context_ttl_seconds,
+            )
+        except Exception as e:
+            print(f"Failed to store post context for {tweet_id}: {e}")
+
+    async def _get_stored_post_context(
+        self,
+        tweet_id: str,
+    ) -> tuple[TweetData, float] | None:
+        """Get a post from Supabase and the age of its metrics in seconds."""
+        try:
+            row = await self._get_post_store().get_post_context_cache(tweet_id)
+            if not row:
                 return None
-        except (ValueError, IndexError):
+            metrics = dict(row["metrics_data"])
+            fetched_at = datetime.fromisoformat(metrics.pop("fetched_at"))
+            tweet = TweetData(**row["content_data"], **metrics)
+        except Exception as e:
+            print(f"Ignoring unreadable post context for {tweet_id}: {e}")
             return None
+        return tweet, (datetime.now(timezone.utc) - fetched_at).total_seconds()
 
-        # Search through profile tweets incrementally (50 -> 100 -> 150 -> 200)
-        for post_count in [50, 100, 150, 200]:
-            response = await self.get_twitter_profile(username, post_count=post_count)
-            if response.profile:
-                for tweet in response.profile.tweets:
-                    if tweet.tweet_id == tweet_id:
-                        return tweet
+    def _get_post_store(self) -> SupabaseCache:
+        if self.post_store is None:
+            self.post_store = SupabaseCache()
+        return self.post_store
+
+    async def _find_post_direct(
+        self,
+        post_url: str,
+        tweet_id: str,
+    ) -> TweetData | None:
+        """Look up a post with a single TWITTER_POST scrape.
+
+        The endpoint may return empty results; after it answers with an empty
+        result it is skipped for POST_SCRAPE_RETRY_SECONDS so lookups don't
+        pay for it. Failed requests (HTTP errors, timeouts) don't count.
+        """
+        if time.monotonic() < SelaAPIClient._post_scrape_disabled_until:
+            return None
+
+        response = await self._scrape(
+            post_url,
+            ScrapeType.TWITTER_POST,
+            reply_count=0,
+            timeout_ms=15000,
+        )
+        if not response.success or not response.data:
+            return None
+
+        inner_data = response.data.get("data") or {}
+        result = inner_data.get("result") or []
+        if isinstance(result, dict):
+            result = [result]
+        for item in result:
+            tweet = TweetData.from_api_response(item)
+            if tweet.tweet_id == tweet_id:
+                return tweet
+
+        if not result:
+            SelaAPIClient._post_scrape_disabled_until = (
+                time.monotonic() + POST_SCRAPE_RETRY_SECONDS
+            )
+        return None
+
+    async def _find_post_in_timeline(
+        self,
+        username: str,
+        tweet_id: str,
+    ) -> TweetData | None:
+        """Search the author's recent posts for a tweet.
+
+        Keeps an index of tweet IDs already checked so each step only scans
+        new tweets, and stops as soon as the timeline reaches past the
+        tweet's creation time. The Sela API has no pagination cursor, so
+        instead of walking every step the next post_count is estimated from
+        the author's posting rate; tweets that are clearly beyond the last
+        200 posts are not searched at all.
+
+        Stored profile slices fetched before the tweet was created can't
+        contain it, so only slices newer than the tweet are accepted.
+        """
+        target_time = snowflake_to_datetime(tweet_id)
+        max_age_seconds = None
+        if target_time is not None:
+            max_age_seconds = max(
+                (datetime.now(timezone.utc) - target_time).total_seconds(), 0
+            )
+        seen: set[str] = set()
+        post_count = POST_LOOKUP_STEPS[0]
+
+        while post_count:
+            response = await self.get_twitter_profile(
+                username, post_count=post_count, max_age_seconds=max_age_seconds
+            )
+            if not response.profile:
+                post_count = self._next_lookup_step(post_count)
+                continue
+
+            tweets = response.profile.tweets
+            for tweet in tweets:
+                if tweet.tweet_id in seen:
+                    continue
+                if tweet.tweet_id == tweet_id:
+                    return tweet
+                seen.add(tweet.tweet_id)
+
+            post_count = self._estimate_lookup_count(tweets, target_time, post_count)
 
         # Tweet not found in recent 200 posts
         return None
 
+    def _next_lookup_step(self, post_count: int) -> int | None:
+        """Get the next step after post_count, or None at the end."""
+        for step in POST_LOOKUP_STEPS:
+            if step > post_count:
+                return step
+        return None
+
+    def _estimate_lookup_count(
+        self,
+        tweets: list[TweetData],
+        target_time: datetime | None,
+        post_count: int,
+    ) -> int | None:
+        """Estimate how many posts must be fetched to reach target_time.
+
+        Returns None when the tweet cannot be in the searchable range.
+        """
+        # Timeline is newest-first; the last entry is the oldest regular post
+        # (the first one may be an older pinned tweet)
+        oldest = tweets[-1].posted_at if tweets else None
+        if target_time is None or oldest is None:
+            return self._next_lookup_step(post_count)
+        if oldest.tzinfo is None:
+            # Sela timestamps without an offset are UTC
+            oldest = oldest.replace(tzinfo=timezone.utc)
+
+        # Already scanned past the tweet's creation time
+        if oldest <= target_time:
+            return None
+
+        now = datetime.now(timezone.utc)
+        covered_seconds = (now - oldest).total_seconds()
+        if covered_seconds <= 0:
+            return self._next_lookup_step(post_count)
+
+        # Posts needed to reach target_time at the author's posting rate
+        needed = len(tweets) * (now - target_time).total_seconds() / covered_seconds
+        if needed > POST_LOOKUP_STEPS[-1] * 1.5:
+            return None
+
+        for step in POST_LOOKUP_STEPS:
+            if step > post_count and step >= math.ceil(needed):
+                return step
+        return self._next_lookup_step(post_count)
+
 
 # Convenience functions for testing
 async def test_profile(username: str = "elonmusk") -> ProfileData | None:
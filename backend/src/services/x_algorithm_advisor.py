@@ -4,11 +4,17 @@ import asyncio
 import hashlib
 import json
 from typing import Optional, Literal
-import anthropic
 
+from src.cache import (
+    NearDuplicateIndex,
+    SharedTTLCache,
+    SingleFlight,
+    normalize_text,
+)
 from src.config import get_settings
 from src.engine import PostFeatures, PentagonScores
 from src.db.supabase_client import SupabaseCache
+from src.services.llm_gateway import get_llm_gateway
 
 # X Algorithm Knowledge Base - Key factors that affect scoring
 X_ALGORITHM_KNOWLEDGE = """
@@ -69,8 +75,150 @@ X_ALGORITHM_KNOWLEDGE = """
 6. **First 50 characters are crucial** - Hook readers immediately
 7. **Controversial/opinion content** - Increases reply and quote, but risks negative signals
 8. **Thread format** - Increases dwell time and follow probability
+
+## How Pentagon Scores Are Weighted
+
+Each score is a weighted sum of predicted action probabilities (p_*), scaled to 0-100.
+Negative weights mean the action pulls the score down.
+
+### Reach
+- p_click 0.40, p_profile_click 0.30, p_dwell 0.30
+
+### Engagement
+- p_favorite 0.35, p_reply 0.35, p_quote 0.15, p_not_interested -0.15
+
+### Virality
+- p_repost 0.40, p_quote 0.30, p_share 0.30
+
+### Quality
+- p_favorite 0.25, p_dwell 0.25
+- p_not_interested -0.20, p_block_author -0.15, p_mute_author -0.10, p_report -0.30
+
+### Longevity
+- p_dwell 0.30, p_video_view 0.25, p_follow_author 0.25, p_favorite 0.20
+
+### Overall Score
+- Weighted average: reach 25%, engagement 25%, virality 20%, quality 15%, longevity 15%
+- Reach and engagement dominate; a post that is only viral but low quality scores poorly overall
+
+## Feature Effects on Action Probabilities
+
+| Feature | Effect |
+|---|---|
+| Question | p_reply +0.15, p_favorite +0.05 |
+| Call to action | p_reply +0.10, p_click +0.08 |
+| Emoji | p_favorite +0.05, p_dwell +0.03 |
+| Image or media | p_click +0.20, p_dwell +0.15, p_repost +0.10 |
+| Video | p_video_view 0.50, p_dwell +0.25 |
+| Optimal length | up to p_dwell +0.10, p_favorite +0.05 |
+| Hashtags | p_click +0.03 each, counted up to 3 |
+| Quote post | p_quote -0.10, p_repost +0.05 |
+
+Effects add up, so combining a question with media lifts engagement and reach together.
+All probabilities are clamped to the range 0-1.
+
+## Reply and Quote Context
+
+When the content replies to or quotes another post, the target post changes the outlook:
+- **Large account** (target has over 100k views): p_click +25%, p_profile_click +20%
+- **Fresh post** (target posted under 60 minutes ago): p_click +15%
+- **Crowded thread** (target has over 1,000 replies): p_click -10%; a unique angle is needed to stand out
+- Early, specific replies to large accounts are the most efficient way to gain profile visits
+- Generic replies ("Great post!", "So true") add nothing and get buried in crowded threads
+
+## Negative Signal Risks
+
+Negative actions hit quality hardest, and quality also gates distribution:
+- **report** (-0.30) - Misleading claims, harassment, spammy links
+- **not_interested** (-0.20 quality, -0.15 engagement) - Off-topic, repetitive, clickbait hooks that don't deliver
+- **block_author** (-0.15) - Hostile or insulting tone toward the reader or the target author
+- **mute_author** (-0.10) - Posting too often, hashtag stuffing, engagement bait
+
+Avoid:
+- More than 3 hashtags or unrelated trending hashtags
+- All-caps, excessive punctuation, or emoji walls
+- "Like if you agree / RT if..." style engagement bait
+- Provocation without substance; controversy helps only when the argument is real
+
+## Writing Guidance
+
+- Lead with the most interesting claim, number, or question in the first line
+- One idea per post; move extra detail into a thread
+- Concrete specifics (numbers, names, examples) increase dwell and saves
+- Match the audience's language and register; translated-sounding text lowers quality
+- End with a question or a clear next step when replies matter more than reach
+- Keep the author's voice: rewrites that sound generic lose follow_author intent
 """
 
+# Task instructions for the X-algorithm prompts. Each call sends the
+# knowledge base and then its own task's instructions as two cached system
+# blocks: the knowledge base is shared by every caller, and the task block
+# is shared by calls of the same task. The output language, post type and
+# other per-request details go in the per-call system text after them.
+SUGGESTION_INSTRUCTIONS = """You are an X (Twitter) content optimization expert. Analyze the given content and provide specific, actionable suggestions to improve pentagon scores based on X algorithm knowledge.
+
+IMPORTANT RULES:
+1. All suggestions and optimized content MUST be in the output language given below
+2. Provide 3-5 specific suggestions with expected score improvements
+3. Each suggestion must reference which X algorithm factor it targets
+4. Be specific - don't give generic advice
+5. The optimized_content should implement the top suggestions
+6. Keep the original message intent intact
+
+Provide suggestions in this JSON format:
+{
+  "suggestions": [
+    {
+      "target_score": "engagement",
+      "improvement": "+15%",
+      "action": "Specific action to take (in target language)",
+      "reason": "Increases p_reply probability in X algorithm",
+      "priority": "high"
+    }
+  ],
+  "optimized_content": "Improved content (in target language)",
+  "score_predictions": {
+    "reach": "+5%",
+    "engagement": "+15%",
+    "virality": "+8%",
+    "quality": "+0%",
+    "longevity": "+3%"
+  }
+}"""
+
+REWRITE_INSTRUCTIONS = """You are an X (Twitter) content optimization expert. Your task is to rewrite content to maximize engagement based on the X algorithm while applying the requested improvements.
+
+RULES:
+1. Output MUST be in the output language given below
+2. Keep the original message intent intact
+3. Apply all requested improvements naturally
+4. Make the content feel authentic, not robotic
+5. Optimize for the X algorithm factors mentioned in the knowledge base
+6. Return ONLY the optimized content, no explanations"""
+
+PERSONALIZED_INSTRUCTIONS = """You are an expert at analyzing content context and generating personalized responses.
+
+CRITICAL: Before generating any response, you MUST first deeply understand the target post:
+1. What is the main topic or subject?
+2. What specific claims, opinions, or questions are being made?
+3. What is the tone and sentiment (excited, frustrated, curious, etc.)?
+4. What would be a meaningful response that directly engages with these points?
+
+Your task:
+1. FIRST: Thoroughly analyze the target post's content and context
+2. THEN: Analyze the user's writing style from their recent posts (if available)
+3. FINALLY: Generate a post of the type given below that DIRECTLY RESPONDS to the target post's specific points
+
+The response MUST:
+- Reference or address specific points from the target post
+- NOT be generic or off-topic
+- Show clear understanding of what the target post is saying
+
+Style Analysis Guidelines:
+- Tone: formal vs casual, serious vs humorous
+- Emoji usage: frequency, types, positions
+- Sentence structure: short vs long, simple vs complex"""
+
 # Structured output format for suggestions
 SUGGESTION_SCHEMA = {
     "type": "object",
@@ -128,24 +276,69 @@ class XAlgorithmAdvisor:
 
     def __init__(self):
         settings = get_settings()
-        self.client = (
-            anthropic.Anthropic(api_key=settings.anthropic_api_key)
-            if settings.anthropic_api_key
-            else None
-        )
+        self.llm = get_llm_gateway()
         self.cache = SupabaseCache()
-        self._memory_cache: dict[str, dict] = {}  # In-memory cache
+        self._memory_cache = SharedTTLCache(
+            maxsize=settings.suggestion_cache_size,
+            ttl_seconds=3600,  # Matches the Supabase suggestion TTL
+            name="suggestions",
+            timeout_seconds=settings.cache_backend_timeout_seconds,
+        )
+        # Cached drafts by text, so small edits while typing reuse suggestions
+        self._similar = NearDuplicateIndex(
+            maxsize=settings.suggestion_cache_size,
+            threshold=settings.suggestion_similarity_threshold,
+            name="suggestions_similar",
+        )
+        self._flights = SingleFlight()
 
     def _get_cache_key(
         self,
-        content: str,
+        normalized_content: str,
         scores: PentagonScores,
-        language: str,
+        scope: tuple[str, str, str],
     ) -> str:
-        """Generate cache key from content and context."""
-        cache_data = f"{content[:100]}|{scores.reach:.0f}|{scores.engagement:.0f}|{language}"
+        """Generate cache key from the full normalized content and context."""
+        cache_data = "|".join((
+            normalized_content,
+            f"{scores.reach:.0f}",
+            f"{scores.engagement:.0f}",
+            *scope,
+        ))
         return hashlib.md5(cache_data.encode()).hexdigest()
 
+    def _get_cache_scope(
+        self,
+        post_type: str,
+        target_post_content: Optional[str],
+        language: str,
+    ) -> tuple[str, str, str]:
+        """Context a cached suggestion is only valid within."""
+        target_hash = hashlib.md5(
+            normalize_text(target_post_content or "").encode()
+        ).hexdigest()
+        return language, post_type, target_hash
+
+    async def _get_cached(
+        self,
+        cache_key: str,
+        normalized_content: str,
+        scope: tuple[str, str, str],
+    ) -> Optional[dict]:
+        """Look up an exact match, then a near-duplicate draft.
+
+        Exact matches also come from the shared cache tier; the
+        near-duplicate index only covers drafts seen by this process.
+        """
+        cached = await self._memory_cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+        similar_key = self._similar.find(scope, normalized_content)
+        if similar_key is not None:
+            return self._memory_cache.get(similar_key)
+        return None
+
     async def analyze_and_suggest(
         self,
         content: str,
@@ -161,21 +354,53 @@ class XAlgorithmAdvisor:
         Returns:
             dict with suggestions, optimized_content, and score_predictions
         """
-        if not self.client:
+        if not self.llm:
             return self._fallback_suggestions(content, current_scores, post_features, language)
 
         # Check cache first
-        cache_key = self._get_cache_key(content, current_scores, language)
-
-        # Layer 1: In-memory cache
-        if cache_key in self._memory_cache:
-            return self._memory_cache[cache_key]
+        normalized_content = normalize_text(content)
+        scope = self._get_cache_scope(post_type, target_post_content, language)
+        cache_key = self._get_cache_key(normalized_content, current_scores, scope)
+
+        # Layer 1: In-memory/shared cache, including near-duplicate drafts
+        cached = await self._get_cached(cache_key, normalized_content, scope)
+        if cached is not None:
+            return cached
+
+        # Concurrent requests for the same draft share one lookup and call
+        return await self._flights.do(
+            cache_key,
+            lambda: self._load_suggestions(
+                cache_key,
+                normalized_content,
+                scope,
+                content,
+                current_scores,
+                post_features,
+                post_type,
+                target_post_content,
+                language,
+            ),
+        )
 
+    async def _load_suggestions(
+        self,
+        cache_key: str,
+        normalized_content: str,
+        scope: tuple[str, str, str],
+        content: str,
+        current_scores: PentagonScores,
+        post_features: PostFeatures,
+        post_type: str,
+        target_post_content: Optional[str],
+        language: str,
+    ) -> dict:
+        """Read suggestions from Supabase, or ask Claude and cache them."""
         # Layer 2: Supabase cache
         try:
             cached = await self.cache.get_suggestion_cache(cache_key)
             if cached:
-                self._memory_cache[cache_key] = cached
+                self._remember(cache_key, normalized_content, scope, cached)
                 return cached
         except Exception:
             pass
@@ -187,18 +412,7 @@ class XAlgorithmAdvisor:
         lang_names = {"ko": "Korean", "en": "English", "ja": "Japanese", "zh": "Chinese"}
         target_lang = lang_names.get(language, "Korean")
 
-        system_prompt = f"""{X_ALGORITHM_KNOWLEDGE}
-
-You are an X (Twitter) content optimization expert. Analyze the given content and provide specific, actionable suggestions to improve pentagon scores based on X algorithm knowledge.
-
-IMPORTANT RULES:
-1. All suggestions and optimized content MUST be in {target_lang}
-2. Provide 3-5 specific suggestions with expected score improvements
-3. Each suggestion must reference which X algorithm factor it targets
-4. Be specific - don't give generic advice
-5. The optimized_content should implement the top suggestions
-6. Keep the original message intent intact
-"""
+        system_prompt = f"Output language: {target_lang}"
 
         user_prompt = f"""Analyze this content and provide optimization suggestions:
 
@@ -221,34 +435,14 @@ IMPORTANT RULES:
 - Longevity: {current_scores.longevity:.1f}
 
 **Post Type:** {post_type}
-{context_info}
-
-Provide suggestions in this JSON format:
-{{
-  "suggestions": [
-    {{
-      "target_score": "engagement",
-      "improvement": "+15%",
-      "action": "Specific action to take (in target language)",
-      "reason": "Increases p_reply probability in X algorithm",
-      "priority": "high"
-    }}
-  ],
-  "optimized_content": "Improved content (in target language)",
-  "score_predictions": {{
-    "reach": "+5%",
-    "engagement": "+15%",
-    "virality": "+8%",
-    "quality": "+0%",
-    "longevity": "+3%"
-  }}
-}}"""
+{context_info}"""
 
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
+            message = await self.llm.create(
                 max_tokens=1000,  # Reduced from 1500 for faster response
+                system_prefix=(X_ALGORITHM_KNOWLEDGE, SUGGESTION_INSTRUCTIONS),
                 system=system_prompt,
+                tag="advisor",
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
@@ -258,9 +452,7 @@ Provide suggestions in this JSON format:
             result = self._parse_json_response(response_text)
             if result:
                 # Save to cache (async, don't wait)
-                self._memory_cache[cache_key] = result
-                if len(self._memory_cache) > 500:  # Limit memory cache size
-                    self._memory_cache.pop(next(iter(self._memory_cache)))
+                self._remember(cache_key, normalized_content, scope, result)
                 try:
                     asyncio.create_task(
                         self.cache.set_suggestion_cache(cache_key, result, ttl_minutes=60)
@@ -275,6 +467,16 @@ Provide suggestions in this JSON format:
             print(f"Claude API error: {e}")
             return self._fallback_suggestions(content, current_scores, post_features, language)
 
+    def _remember(
+        self,
+        cache_key: str,
+        normalized_content: str,
+        scope: tuple[str, str, str],
+        result: dict,
+    ) -> None:
+        self._memory_cache.set(cache_key, result)
+        self._similar.add(scope, normalized_content, cache_key)
+
     def _build_context(
         self,
         features: PostFeatures,
@@ -0,0 +1,65 @@
+"""Per-worker warm start.
+
+Each worker process builds its service singletons and runs the scoring
+paths once in the app lifespan. Uvicorn only accepts connections after
+lifespan startup, so the first real requests don't pay for lazy imports,
+client construction or first-call setup.
+"""
+
+import time
+
+from src.cache import get_cache_backend
+from src.db.supabase_client import get_supabase_client
+from src.engine import (
+    ProfileFeatures,
+    WeightedScorer,
+    extract_post_features,
+    extract_post_features_batch,
+)
+from src.services.llm_gateway import get_llm_gateway
+from src.services.sela_api_client import get_http_client
+
+_SAMPLE_POSTS = [
+    "Just shipped our new feature 🚀 What do you think? #AI @sela https://x.com",
+    "오늘 새로운 기능을 출시했습니다! 어떻게 생각하세요? 🧵 (1/3)",
+]
+
+
+async def warm_up() -> None:
+    """Build singletons and exercise hot paths."""
+    started = time.perf_counter()
+
+    # Clients and connection pools
+    get_http_client()
+    get_llm_gateway()
+    get_cache_backend()
+    try:
+        get_supabase_client()
+    except Exception as e:
+        print(f"Warm-up: Supabase client unavailable: {e}")
+
+    # Lazily imported in request paths
+    from src.services.personas import PERSONA_REGISTRY, get_persona_for_prompt
+
+    for persona_id in PERSONA_REGISTRY:
+        get_persona_for_prompt(persona_id, "ko")
+        get_persona_for_prompt(persona_id, "en")
+
+    # Feature extraction and the (numpy) batch scorer
+    posts = extract_post_features_batch(_SAMPLE_POSTS)
+    extract_post_features(_SAMPLE_POSTS[0], media_type="image")
+    WeightedScorer().analyze_posts(posts, ProfileFeatures(
+        username="warmup",
+        tweet_count=0,
+        avg_engagement_rate=0.02,
+        avg_likes=100,
+        avg_retweets=10,
+        avg_replies=5,
+        avg_views=1000,
+        retweet_ratio=0.2,
+        quote_ratio=0.1,
+        media_ratio=0.5,
+        engagement_consistency=0.7,
+    ))
+
+    print(f"Worker warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms")
@@ -0,0 +1,64 @@
+# backend/tests/test_activity_buffer.py
+import asyncio
+
+import pytest
+from src.db.activity_buffer import ActivityBuffer
+
+
+class _FakeCache:
+    def __init__(self, ok: bool = True, delay: float = 0):
+        self.ok = ok
+        self.delay = delay
+        self.batches = []
+
+    async def log_user_activities(self, rows):
+        await asyncio.sleep(self.delay)
+        self.batches.append(rows)
+        return self.ok
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_full_batches_and_on_interval():
+    """배치 크기 도달 시 즉시, 나머지는 시간 경과 후 일괄 기록"""
+    cache = _FakeCache()
+    buffer = ActivityBuffer(cache, batch_size=3, flush_interval_seconds=0.05)
+
+    for i in range(4):
+        assert buffer.add({"user_handle": f"u{i}"})
+    await asyncio.sleep(0.01)
+    assert [len(b) for b in cache.batches] == [3]
+
+    await asyncio.sleep(0.1)
+    assert [len(b) for b in cache.batches] == [3, 1]
+    assert buffer.stats()["written"] == 4
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_drops_when_full_and_flushes_on_close():
+    """큐가 가득 차면 드롭, 종료 시 남은 행 모두 기록"""
+    cache = _FakeCache(delay=0.01)
+    buffer = ActivityBuffer(cache, batch_size=2, flush_interval_seconds=60, max_queue=5)
+
+    results = [buffer.add({"n": i}) for i in range(7)]
+    assert results.count(False) == 2
+
+    await buffer.close()
+    assert sum(len(b) for b in cache.batches) == 5
+    assert all(len(b) <= 2 for b in cache.batches)
+    assert not buffer.add({"n": 99})
+
+    stats = buffer.stats()
+    assert stats["pending"] == 0
+    assert stats["written"] == 5
+    assert stats["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_buffer_counts_failed_inserts():
+    """기록 실패 행 수 집계"""
+    buffer = ActivityBuffer(_FakeCache(ok=False), batch_size=10, flush_interval_seconds=60)
+    buffer.add({"n": 1})
+    buffer.add({"n": 2})
+    await buffer.close()
+    assert buffer.stats()["failed"] == 2
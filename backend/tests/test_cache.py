@@ -0,0 +1,129 @@
+# backend/tests/test_cache.py
+import asyncio
+
+import pytest
+from src.cache import NearDuplicateIndex, SingleFlight, TTLCache, normalize_text
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr("src.cache.memory.time.monotonic", fake)
+    return fake
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    """LRU 크기 제한 테스트"""
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recent
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(clock):
+    """TTL 만료 테스트"""
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=300)
+
+    clock.now += 61
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert "a" not in cache
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["expirations"] == 1
+
+
+def test_ttl_cache_serves_stale_within_window(clock):
+    """Stale-while-revalidate 윈도우 테스트"""
+    cache = TTLCache(maxsize=10, ttl_seconds=60, stale_ttl_seconds=30)
+    cache.set("a", 1)
+
+    assert cache.get_entry("a") == (1, False)
+    clock.now += 70
+    assert cache.get("a") is None
+    assert cache.get_entry("a") == (1, True)
+    clock.now += 30
+    assert cache.get_entry("a") is None
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """동시 호출 병합 테스트"""
+    flights = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flights.stats() == {"calls": 5, "coalesced": 4, "executed": 1, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_resets():
+    """에러 전파 후 다음 호출은 새로 실행"""
+    flights = SingleFlight()
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await flights.do("key", fail)
+
+    async def succeed():
+        return 1
+
+    assert await flights.do("key", succeed) == 1
+
+
+def test_normalize_text():
+    """정규화: NFKC, 대소문자, 공백 통일"""
+    assert normalize_text("  Hello\n\tＷｏｒｌｄ  ") == "hello world"
+
+
+def test_near_duplicate_index_matches_small_edits():
+    """작은 수정은 같은 항목으로 매칭, 다른 글과 다른 범위는 불일치"""
+    index = NearDuplicateIndex(maxsize=10, threshold=0.8)
+    draft = "we just shipped the new scoring engine, what do you think about it?"
+    index.add("en", draft, "key-1")
+    index.add("en", "completely unrelated post about coffee and mornings", "key-2")
+
+    assert index.find("en", draft) == "key-1"
+    assert index.find("en", draft.replace("think", "thnk")) == "key-1"
+    assert index.find("en", draft + " 🚀") == "key-1"
+    assert index.find("ko", draft) is None
+    assert index.find("en", "a totally different draft about launch plans") is None
+    assert index.stats()["hits"] == 3
+
+
+def test_near_duplicate_index_evicts_oldest():
+    """최대 크기 초과 시 오래된 항목 제거"""
+    index = NearDuplicateIndex(maxsize=2, threshold=0.9)
+    for i, text in enumerate(["first draft text here", "second draft text", "third one now"]):
+        index.add(None, text, i)
+
+    assert len(index) == 2
+    assert index.find(None, "first draft text here") is None
+    assert index.find(None, "third one now") == 2
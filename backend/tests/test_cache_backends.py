@@ -0,0 +1,193 @@
+# backend/tests/test_cache_backends.py
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from src.cache import (
+    MemoryBackend,
+    RedisBackend,
+    SharedTTLCache,
+    SQLiteBackend,
+    close_cache_backend,
+    get_cache_backend,
+)
+from src.config import get_settings
+
+
+async def _read_command(reader):
+    """Read one RESP array of bulk strings, as clients send commands."""
+    line = await reader.readline()
+    if not line.startswith(b"*"):
+        raise ConnectionError("Connection closed by client")
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class _FakeRedisServer:
+    """Minimal RESP server supporting the commands RedisBackend sends."""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        authed = self.password is None
+        while True:
+            try:
+                args = await _read_command(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            name = args[0].decode().upper()
+            self.commands.append(name)
+            if name == "AUTH":
+                authed = args[-1].decode() == self.password
+                reply = b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n"
+            elif not authed:
+                reply = b"-NOAUTH Authentication required\r\n"
+            elif name == "SELECT":
+                reply = b"+OK\r\n"
+            elif name == "SET":
+                self.data[args[1]] = (args[2], time.monotonic() + int(args[4]) / 1000)
+                reply = b"+OK\r\n"
+            elif name == "GET":
+                value, expires_at = self.data.get(args[1], (None, 0))
+                if value is None or time.monotonic() >= expires_at:
+                    reply = b"$-1\r\n"
+                else:
+                    reply = b"$%d\r\n%s\r\n" % (len(value), value)
+            elif name == "DEL":
+                reply = b":%d\r\n" % int(self.data.pop(args[1], None) is not None)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+        yield backend
+        await backend.close()
+    else:
+        pytest.importorskip("redis")
+        fake = _FakeRedisServer(password="secret")
+        server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        backend = RedisBackend(f"redis://:secret@127.0.0.1:{port}/2", pool_size=2)
+        yield backend
+        await backend.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_get_set_expire_delete(backend):
+    """백엔드 공통 동작: 저장, 조회, 만료, 삭제"""
+    assert await backend.get("missing") is None
+
+    await backend.set("a", b"\x00binary\r\n", ttl_seconds=60)
+    await backend.set("short", b"x", ttl_seconds=0.05)
+    assert await backend.get("a") == b"\x00binary\r\n"
+
+    await asyncio.sleep(0.1)
+    assert await backend.get("short") is None
+
+    await backend.delete("a")
+    assert await backend.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_pools_connections():
+    """Redis 백엔드: 인증/DB 선택 후 연결 재사용"""
+    pytest.importorskip("redis")
+    fake = _FakeRedisServer(password="secret")
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    backend = RedisBackend(f"redis://:secret@127.0.0.1:{port}/2", pool_size=2)
+
+    await asyncio.gather(*(backend.set(f"k{i}", b"v", 60) for i in range(10)))
+    assert fake.connections <= 2
+    assert fake.commands.count("AUTH") == fake.connections
+    assert fake.commands.count("SELECT") == fake.connections
+
+    await backend.close()
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_serves_other_workers(tmp_path):
+    """공유 캐시: 다른 워커가 저장한 값을 재사용, 만료는 벽시계 기준"""
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    worker_a = SharedTTLCache(ttl_seconds=0.1, stale_ttl_seconds=60, name="t", backend=backend)
+    worker_b = SharedTTLCache(ttl_seconds=0.1, stale_ttl_seconds=60, name="t", backend=backend)
+
+    worker_a.set(("user", 20), {"score": 1})
+    await asyncio.gather(*worker_a._writes)
+
+    assert await worker_b.aget_entry(("user", 20)) == ({"score": 1}, False)
+    assert worker_b.stats()["shared_hits"] == 1
+    # Now in worker B's local tier
+    assert worker_b.get(("user", 20)) == {"score": 1}
+
+    # Past the TTL, another worker still gets it, flagged stale
+    await asyncio.sleep(0.15)
+    worker_c = SharedTTLCache(ttl_seconds=0.1, stale_ttl_seconds=60, name="t", backend=backend)
+    assert await worker_c.aget_entry(("user", 20)) == ({"score": 1}, True)
+    assert await worker_c.aget(("user", 20)) is None
+
+    # Different names don't share keys
+    other = SharedTTLCache(name="other", backend=backend)
+    assert await other.aget(("user", 20)) is None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_treats_backend_errors_as_misses():
+    """백엔드 오류는 캐시 미스로 처리"""
+
+    class _BrokenBackend(MemoryBackend):
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ttl_seconds):
+            raise ConnectionError("down")
+
+    cache = SharedTTLCache(name="broken", backend=_BrokenBackend())
+    cache.set("k", 1)
+    await asyncio.gather(*cache._writes)
+    assert await cache.aget("k") == 1  # Local tier still works
+    assert await cache.aget("other") is None
+    assert cache.stats()["shared_errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_looks_up_backend_after_close(tmp_path, monkeypatch):
+    """공유 캐시: 종료 시 닫힌 백엔드 대신 새로 설정된 백엔드 사용"""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "cache_backend", "sqlite")
+    monkeypatch.setattr(settings, "cache_sqlite_path", str(tmp_path / "cache.sqlite3"))
+    get_cache_backend.cache_clear()
+    try:
+        cache = SharedTTLCache(name="lazy")
+        assert SharedTTLCache().backend is None  # Unnamed caches stay local
+        closed = cache.backend
+        assert isinstance(closed, SQLiteBackend)
+
+        await close_cache_backend()
+        cache.set("k", 1)
+        await asyncio.gather(*cache._writes)
+        assert cache.backend is not closed
+        assert cache.stats()["shared_errors"] == 0
+        assert await SharedTTLCache(name="lazy").aget("k") == 1
+    finally:
+        await close_cache_backend()
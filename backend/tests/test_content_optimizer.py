@@ -66,3 +66,195 @@ async def test_optimize():
 
     assert result["original_content"] == "오늘 날씨 좋다"
     assert len(result["optimized_versions"]) >= 1
+
+
+class _FakeStreamingLLM:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self, **kwargs):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_polish_stream_forwards_deltas():
+    """폴리시 스트리밍: 델타 후 최종 결과 전달"""
+    optimizer = ContentOptimizer()
+    optimizer.llm = _FakeStreamingLLM(["\n", " Hello", " world", "! 🚀\n"])
+
+    events = [e async for e in optimizer.polish_stream("hello world", "twitter", language="en")]
+
+    assert [name for name, _ in events] == ["delta", "delta", "delta", "done"]
+    assert "".join(data["text"] for name, data in events if name == "delta") == "Hello world! 🚀\n"
+    result = events[-1][1]
+    assert result["polished_content"] == "Hello world! 🚀"
+    assert result["character_count"]["polished"] == len("Hello world! 🚀")
+
+
+@pytest.mark.asyncio
+async def test_generate_personalized_stream_extracts_generated_content():
+    """개인화 포스트 스트리밍: JSON에서 generated_content만 점진적으로 전달"""
+    from unittest.mock import AsyncMock
+
+    optimizer = ContentOptimizer()
+    optimizer.client.get_twitter_profile = AsyncMock(side_effect=Exception("offline"))
+    envelope = (
+        '{"target_analysis": {"main_topic": "AI"}, '
+        '"generated_content": "Totally agree \\u2014 '
+        'ship it!", "style_analysis": {}, "confidence": 0.7, "reasoning": "r"}'
+    )
+    optimizer.llm = _FakeStreamingLLM([envelope[i:i + 9] for i in range(0, len(envelope), 9)])
+
+    events = [
+        e async for e in optimizer.generate_personalized_post_stream(
+            username="me", target_post_content="AI is great", target_author="you",
+            post_type="reply",
+        )
+    ]
+
+    text = "".join(data["text"] for name, data in events if name == "delta")
+    assert text == "Totally agree — ship it!"
+    name, result = events[-1]
+    assert name == "done"
+    assert result["generated_content"] == text
+    assert result["target_author"] == "you"
+
+
+@pytest.mark.asyncio
+async def test_interpretation_cached_per_post():
+    """포스트 해석: 트윗 ID와 내용 해시로 캐시, 동시 요청은 Claude 호출 1회"""
+    import asyncio
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    from src.services import content_optimizer
+
+    content_optimizer._interpretations.clear()
+    content = "The map is not the territory, and the model is not the user."
+
+    optimizer = ContentOptimizer()
+    optimizer.store = AsyncMock()
+    optimizer.store.get_post_interpretation.return_value = None
+
+    async def create(**kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(content=[SimpleNamespace(text=" Models simplify. ")])
+
+    optimizer.llm = SimpleNamespace(create=AsyncMock(side_effect=create))
+
+    results = await asyncio.gather(
+        *(optimizer._get_interpretation("888001", content) for _ in range(5))
+    )
+    assert results == ["Models simplify."] * 5
+    assert optimizer.llm.create.await_count == 1
+
+    # Whitespace-only differences hit the cache; other text does not
+    assert await optimizer._get_interpretation("888001", f"  {content}\n") == "Models simplify."
+    assert optimizer.llm.create.await_count == 1
+    await asyncio.sleep(0)
+    optimizer.store.set_post_interpretation.assert_awaited_once()
+    saved = optimizer.store.set_post_interpretation.await_args
+    assert saved.kwargs["ttl_seconds"] == content_optimizer._interpretations.ttl_seconds
+
+    # A cold worker reuses the stored interpretation
+    content_optimizer._interpretations.clear()
+    other = ContentOptimizer()
+    other.store = AsyncMock()
+    other.store.get_post_interpretation.return_value = {
+        "interpretation": "Models simplify.",
+        "content_hash": content_optimizer._content_hash(content),
+    }
+    other.llm = SimpleNamespace(create=AsyncMock())
+    assert await other._get_interpretation("888001", content) == "Models simplify."
+    other.llm.create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_precompute_hook_covers_posts_looked_up_by_other_clients(monkeypatch):
+    """해석 미리 계산: 다른 서비스의 클라이언트가 조회한 포스트도 대상"""
+    import asyncio
+    from datetime import datetime, timezone
+    from unittest.mock import AsyncMock
+
+    from src.config import get_settings
+    from src.services import sela_api_client
+    from src.services.sela_api_client import SelaAPIClient, TweetData
+
+    monkeypatch.setattr(get_settings(), "precompute_interpretations", True)
+    sela_api_client._post_contexts.clear()
+    tweet = TweetData(
+        tweet_id="888101",
+        username="someone",
+        content="Ship small changes, and ship them often.",
+        posted_at=datetime.now(timezone.utc),
+        tweet_url="/someone/status/888101",
+    )
+
+    optimizer = ContentOptimizer()
+    optimizer._get_interpretation = AsyncMock()
+    try:
+        # e.g. the score predictor's own client
+        other = SelaAPIClient(base_url="http://sela.test", api_key="test")
+        other.post_store = AsyncMock()
+        other.post_store.get_post_context_cache.return_value = None
+        other._find_post_direct = AsyncMock(return_value=tweet)
+        await other.get_post_context("https://x.com/someone/status/888101")
+        await asyncio.sleep(0)
+        optimizer._get_interpretation.assert_awaited_once_with("888101", tweet.content)
+    finally:
+        sela_api_client.set_post_cached_hook(None)
+
+@pytest.mark.asyncio
+async def test_x_algorithm_callers_share_one_cacheable_prefix():
+    """어드바이저/팁 적용/개인화 포스트가 같은 1024토큰 이상의 지식 베이스 접두사 뒤에 자기 작업 지시만 전송"""
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    from src.engine import PentagonScores, extract_post_features
+    from src.services.x_algorithm_advisor import (
+        PERSONALIZED_INSTRUCTIONS,
+        REWRITE_INSTRUCTIONS,
+        SUGGESTION_INSTRUCTIONS,
+        X_ALGORITHM_KNOWLEDGE,
+        XAlgorithmAdvisor,
+    )
+
+    # Conservative estimate (>= 4.5 characters per token) of the provider's
+    # 1024-token minimum for a cached prefix
+    assert len(X_ALGORITHM_KNOWLEDGE) >= 1024 * 4.5
+
+    reply = SimpleNamespace(content=[SimpleNamespace(
+        text='{"suggestions": [], "generated_content": "ok", "optimized_content": "ok"}'
+    )])
+    llm = SimpleNamespace(create=AsyncMock(return_value=reply))
+
+    advisor = XAlgorithmAdvisor()
+    advisor.llm = llm
+    advisor.cache = AsyncMock()
+    advisor.cache.get_suggestion_cache.return_value = None
+    content = "Prompt caching only pays off when the prefix is long enough"
+    await advisor.analyze_and_suggest(
+        content,
+        PentagonScores(reach=50, engagement=40, virality=30, quality=60, longevity=20),
+        extract_post_features(content),
+        language="en",
+    )
+
+    optimizer = ContentOptimizer()
+    optimizer.llm = llm
+    optimizer.client.get_twitter_profile = AsyncMock(side_effect=Exception("offline"))
+    await optimizer._apply_tips_with_ai(content, [{"tip_id": "add_emoji"}], "en")
+    await optimizer.generate_personalized_post(
+        username="me", target_post_content="AI is great", target_author="you",
+        post_type="reply", language="en",
+    )
+
+    calls = llm.create.await_args_list
+    assert len(calls) == 3
+    assert all(c.kwargs["system_prefix"][0] is X_ALGORITHM_KNOWLEDGE for c in calls)
+    task_instructions = [SUGGESTION_INSTRUCTIONS, REWRITE_INSTRUCTIONS, PERSONALIZED_INSTRUCTIONS]
+    assert [c.kwargs["system_prefix"][1] for c in calls] == task_instructions
+    for call, own in zip(calls, task_instructions):
+        sent = "".join(call.kwargs["system_prefix"]) + call.kwargs["system"]
+        assert all(other not in sent for other in task_instructions if other is not own)
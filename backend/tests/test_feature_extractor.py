@@ -42,3 +42,78 @@ def test_extract_profile_features():
     assert features.avg_engagement_rate > 0
     assert features.avg_likes == 150
     assert features.retweet_ratio == 0.5
+
+
+def _reference_post_features(content, media_type=None, is_quote=False):
+    """Straightforward one-regex-per-signal extraction to check against."""
+    import re
+    from src.engine.feature_extractor import (
+        CTA_PATTERN, EMOJI_PATTERN, HASHTAG_PATTERN, MENTION_PATTERN,
+        QUESTION_PATTERN, THREAD_PATTERN, URL_PATTERN,
+    )
+
+    sentences = re.split(r"[.!?]+", content)
+    emoji_count = len(EMOJI_PATTERN.findall(content))
+    return PostFeatures(
+        char_count=len(content),
+        word_count=len(content.split()),
+        sentence_count=len([s for s in sentences if s.strip()]),
+        has_question=bool(QUESTION_PATTERN.search(content)),
+        has_cta=bool(CTA_PATTERN.search(content)),
+        has_emoji=emoji_count > 0,
+        emoji_count=emoji_count,
+        has_media=media_type is not None,
+        media_type=media_type,
+        hashtag_count=len(HASHTAG_PATTERN.findall(content)),
+        mention_count=len(MENTION_PATTERN.findall(content)),
+        has_url=len(URL_PATTERN.findall(content)) > 0,
+        is_thread_starter=bool(THREAD_PATTERN.search(content)),
+        is_quote=is_quote,
+    )
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "   ",
+    "...!?",
+    "Check  THIS out",
+    "ReTweet? RT if you agree",
+    "CHECK　OUT the Kelvin liKe if",  # ideographic space, Kelvin sign
+    "ſhare your thoughts",  # long s
+    "LİKE IF you do, foılow",  # dotted/dotless i
+    "1. First point",
+    "１. fullwidth digit start (１/２)",
+    "Thread: part one (1/3) 🧵",
+    "#日本語 @名前 #tag#tag @@x https://x.com/a?b=#c",
+    "안녕하세요! 어떻게 생각하세요? 댓글 남겨주세요 🙏",
+    "comments follows replying recomment",
+])
+def test_extract_post_features_matches_reference(content):
+    """단일 패스 추출기와 기준 구현의 결과 일치 (엣지 케이스)"""
+    assert extract_post_features(content) == _reference_post_features(content)
+
+
+def test_extract_post_features_matches_reference_fuzz():
+    """무작위 텍스트에 대한 기준 구현과의 일치"""
+    import random
+
+    rng = random.Random(7)
+    pieces = [
+        " ", "  ", "\n", "　", ".", "!", "?", "...", "#", "@", "(", ")", "/", "1", "12",
+        "３", "http", "https://", "x.com", "check", "this", "out", "let", "me", "know",
+        "what", "do", "you", "think", "share", "your", "tell", "drop", "a", "comment",
+        "reply", "follow", "rt", "if", "like", "thread:", "THREAD", "Reply", "K",
+        "ſ", "İ", "ı", "🧵", "🚀", "😀", "✅", "안녕", "日本", "_", "é",
+    ]
+    for _ in range(3000):
+        content = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        assert extract_post_features(content) == _reference_post_features(content), content
+
+
+def test_extract_post_features_batch():
+    """배치 피처 추출"""
+    from src.engine.feature_extractor import extract_post_features_batch
+
+    contents = ["Hello world!", "What do you think? 🤔", ""]
+    batch = extract_post_features_batch(contents, media_type="video", is_quote=True)
+    assert batch == [extract_post_features(c, "video", True) for c in contents]
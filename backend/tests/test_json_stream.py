@@ -0,0 +1,52 @@
+# backend/tests/test_json_stream.py
+import json
+import random
+
+from src.services.json_stream import JsonStringFieldStream
+
+
+def _feed_in_chunks(stream, text, rng):
+    out = ""
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 8)
+        out += stream.feed(text[i:i + n])
+        i += n
+    return out
+
+
+def test_extracts_field_across_chunk_boundaries():
+    """청크 경계와 무관하게 필드 값을 디코딩"""
+    value = 'Great point 👋 "quoted"\nnext line \\ é 한국어  '
+    envelope = {
+        "target_analysis": {
+            "main_topic": 'mentions "generated_content": inside a value',
+            "key_points": ["a", "b"],
+        },
+        "generated_content": value,
+        "confidence": 0.8,
+    }
+    rng = random.Random(3)
+    for ensure_ascii in (True, False):
+        text = "```json\n" + json.dumps(envelope, ensure_ascii=ensure_ascii, indent=2) + "\n```"
+        for _ in range(50):
+            stream = JsonStringFieldStream("generated_content")
+            assert _feed_in_chunks(stream, text, rng) == value
+            assert stream.done
+
+
+def test_streams_value_before_json_is_complete():
+    """JSON이 끝나기 전에 부분 값을 반환"""
+    stream = JsonStringFieldStream("generated_content")
+    assert stream.feed('{"generated_content": "Hel') == "Hel"
+    assert stream.feed('lo wor') == "lo wor"
+    assert not stream.done
+    assert stream.feed('ld", "confidence": 0.9}') == "ld"
+    assert stream.done
+
+
+def test_ignores_non_string_values_and_other_keys():
+    """문자열이 아닌 값과 다른 키는 무시"""
+    stream = JsonStringFieldStream("generated_content")
+    assert stream.feed('{"generated_content": null, "other": "x"}') == ""
+    assert not stream.done
@@ -0,0 +1,146 @@
+# backend/tests/test_llm_gateway.py
+import asyncio
+
+import pytest
+from src.services.llm_gateway import ClaudeGateway
+
+
+@pytest.mark.asyncio
+async def test_gateway_limits_concurrent_calls():
+    """동시 Claude 호출 수 제한 테스트"""
+    gateway = ClaudeGateway(api_key="test", model="test-model", max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def create(**kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return kwargs
+
+    gateway.client.messages.create = create
+
+    results = await asyncio.gather(*(
+        gateway.create(messages=[{"role": "user", "content": "hi"}], max_tokens=10)
+        for _ in range(6)
+    ))
+
+    assert peak == 2
+    assert results[0]["model"] == "test-model"
+    assert "system" not in results[0]
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_streams_text_deltas():
+    """스트리밍 텍스트 델타 전달 테스트"""
+    gateway = ClaudeGateway(api_key="test", model="test-model", max_concurrency=1)
+    seen = {}
+
+    class FakeStream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        @property
+        async def text_stream(self):
+            for text in ("Hel", "lo"):
+                yield text
+
+        async def get_final_message(self):
+            return None
+
+    def stream(**kwargs):
+        seen.update(kwargs)
+        return FakeStream()
+
+    gateway.client.messages.stream = stream
+
+    deltas = [
+        text async for text in gateway.stream(
+            messages=[{"role": "user", "content": "hi"}], max_tokens=10, system="sys"
+        )
+    ]
+
+    assert deltas == ["Hel", "lo"]
+    assert seen["system"] == "sys" and seen["model"] == "test-model"
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_caches_system_prefix_and_tallies_usage():
+    """시스템 프롬프트 접두사 캐싱 및 토큰 사용량 집계 테스트"""
+    from types import SimpleNamespace
+
+    gateway = ClaudeGateway(api_key="test", model="test-model")
+    seen = []
+
+    async def create(**kwargs):
+        seen.append(kwargs)
+        cached = len(seen) > 1
+        return SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=40,
+            output_tokens=100,
+            cache_read_input_tokens=1200 if cached else 0,
+            cache_creation_input_tokens=0 if cached else 1200,
+        ))
+
+    gateway.client.messages.create = create
+
+    for lang in ("Korean", "English"):
+        await gateway.create(
+            messages=[{"role": "user", "content": "hi"}],
+            max_tokens=10,
+            system_prefix=("static knowledge",),
+            system=f"Output language: {lang}",
+            tag="advisor",
+        )
+
+    # Same byte-stable cached block on both calls, dynamic text after it
+    assert seen[0]["system"][0] == seen[1]["system"][0] == {
+        "type": "text",
+        "text": "static knowledge",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert seen[1]["system"][1] == {"type": "text", "text": "Output language: English"}
+
+    stats = gateway.stats()["advisor"]
+    assert stats["calls"] == 2
+    assert stats["cache_read_input_tokens"] == 1200
+    assert stats["cache_creation_input_tokens"] == 1200
+    assert stats["input_tokens"] == 80
+    assert stats["cached_input_ratio"] == round(1200 / 2480, 4)
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_counts_calls_whose_prefix_was_not_cached():
+    """캐시 표시된 접두사가 캐시되지 않으면 uncached_prefix_calls로 집계"""
+    from types import SimpleNamespace
+
+    gateway = ClaudeGateway(api_key="test", model="test-model")
+
+    async def create(**kwargs):
+        return SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=300,
+            output_tokens=10,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ))
+
+    gateway.client.messages.create = create
+
+    await gateway.create(
+        messages=[{"role": "user", "content": "hi"}],
+        max_tokens=10,
+        system_prefix=("too short to cache",),
+        tag="advisor",
+    )
+    await gateway.create(messages=[{"role": "user", "content": "hi"}], max_tokens=10, tag="advisor")
+
+    assert gateway.stats()["advisor"]["uncached_prefix_calls"] == 1
+    await gateway.close()
@@ -0,0 +1,168 @@
+# backend/tests/test_main.py
+from fastapi.testclient import TestClient
+from src.main import app
+
+
+def test_warm_up_runs_before_serving(monkeypatch):
+    """lifespan 시작 시 워밍업이 끝난 뒤에 요청을 처리"""
+    from unittest.mock import AsyncMock
+
+    import src.main
+
+    warm_up = AsyncMock()
+    monkeypatch.setattr(src.main, "warm_up", warm_up)
+
+    with TestClient(app) as client:  # Runs the lifespan
+        warm_up.assert_awaited_once()
+        assert client.get("/health").status_code == 200
+
+
+def _mock_live_session(monkeypatch):
+    """Patch the live route's predictor to open a canned session."""
+    from unittest.mock import AsyncMock
+
+    from src.api.routes.post import predictor
+    from src.engine import ProfileFeatures
+    from src.services.score_predictor import ScoringSession
+
+    profile = ProfileFeatures(
+        username="testuser",
+        tweet_count=10,
+        avg_engagement_rate=0.02,
+        avg_likes=100,
+        avg_retweets=10,
+        avg_replies=5,
+        avg_views=1000,
+        retweet_ratio=0.2,
+        quote_ratio=0.1,
+        media_ratio=0.5,
+        engagement_consistency=0.7,
+    )
+    open_session = AsyncMock(return_value=ScoringSession("original", profile))
+    monkeypatch.setattr(predictor, "open_session", open_session)
+    return open_session
+
+
+def test_live_scoring_cancels_superseded_tips(monkeypatch):
+    """라이브 스코어링: 편집마다 즉시 점수, 이전 초안의 어드바이저 호출은 취소"""
+    from unittest.mock import AsyncMock
+
+    from src.api.routes.post import predictor
+    from src.config import get_settings
+
+    open_session = _mock_live_session(monkeypatch)
+    monkeypatch.setattr(predictor.advisor, "analyze_and_suggest", AsyncMock(return_value={
+        "suggestions": [{"action": "Ask a question", "reason": "replies"}],
+    }))
+    monkeypatch.setattr(get_settings(), "live_tips_delay_seconds", 0.2)
+
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/post/live?username=testuser") as ws:
+        assert ws.receive_json() == {"type": "ready", "context": None}
+
+        ws.send_json({"content": "Shipping today", "seq": 1})
+        first = ws.receive_json()
+        ws.send_json({"content": "Shipping today! What do you think?", "seq": 2})
+        second = ws.receive_json()
+        assert (first["type"], first["seq"]) == ("scores", 1)
+        assert (second["type"], second["seq"]) == ("scores", 2)
+        assert second["quick_tips"]  # Rule-based tips come with the scores
+
+        tips = ws.receive_json()
+        assert (tips["type"], tips["seq"]) == ("tips", 2)
+        assert tips["quick_tips"][0]["tip_id"] == "algo_tip_0"
+
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+    open_session.assert_awaited_once()
+    assert predictor.advisor.analyze_and_suggest.await_count == 1
+
+
+def test_live_scoring_drops_tips_of_a_draft_already_with_the_advisor(monkeypatch):
+    """라이브 스코어링: 어드바이저 호출 중에 새 초안이 오면 이전 초안의 팁은 전송 안 함"""
+    import asyncio
+    import threading
+    import time
+
+    from src.api.routes.post import predictor
+    from src.config import get_settings
+
+    _mock_live_session(monkeypatch)
+    in_flight = threading.Event()
+    cancelled = threading.Event()
+
+    async def advise(content, **kwargs):
+        if content == "First draft":
+            in_flight.set()
+            try:
+                await asyncio.sleep(0.2)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return {"suggestions": [{"action": f"Tip for {content}", "reason": "r"}]}
+
+    monkeypatch.setattr(predictor.advisor, "analyze_and_suggest", advise)
+    monkeypatch.setattr(get_settings(), "live_tips_delay_seconds", 0)
+
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/post/live?username=testuser") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_json({"content": "First draft", "seq": 1})
+        assert ws.receive_json()["seq"] == 1
+        assert in_flight.wait(timeout=1)
+
+        ws.send_json({"content": "Second draft", "seq": 2})
+        assert ws.receive_json()["seq"] == 2
+        tips = ws.receive_json()
+        assert (tips["type"], tips["seq"]) == ("tips", 2)
+        assert "Second draft" in tips["quick_tips"][0]["description"]
+
+        # Past the first call's sleep, nothing more was sent for seq 1
+        time.sleep(0.3)
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+    assert cancelled.is_set()
+
+
+def test_live_scoring_closes_on_unexpected_errors(monkeypatch):
+    """라이브 스코어링: 바이너리 프레임 등 예기치 못한 오류는 error 전송 후 1011로 종료"""
+    import pytest
+    from fastapi import WebSocketDisconnect
+
+    _mock_live_session(monkeypatch)
+
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/post/live?username=testuser") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_bytes(b"\x00binary")
+        assert ws.receive_json()["type"] == "error"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1011
+
+
+def test_live_scoring_closes_when_tips_fail(monkeypatch):
+    """라이브 스코어링: 어드바이저 팁 생성 오류도 error 전송 후 1011로 종료"""
+    from unittest.mock import AsyncMock
+
+    import pytest
+    from fastapi import WebSocketDisconnect
+
+    from src.api.routes.post import predictor
+    from src.config import get_settings
+
+    _mock_live_session(monkeypatch)
+    monkeypatch.setattr(predictor, "draft_tips", AsyncMock(side_effect=RuntimeError("advisor down")))
+    monkeypatch.setattr(get_settings(), "live_tips_delay_seconds", 0)
+
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/post/live?username=testuser") as ws:
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_json({"content": "Shipping today", "seq": 1})
+        assert ws.receive_json()["type"] == "scores"
+        assert ws.receive_json() == {"type": "error", "detail": "advisor down"}
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1011
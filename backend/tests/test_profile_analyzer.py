@@ -1,9 +1,19 @@
 # backend/tests/test_profile_analyzer.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from unittest.mock import AsyncMock, patch
 from src.services.profile_analyzer import ProfileAnalyzer, ProfileAnalysisResult
 from src.services.sela_api_client import ProfileData, TweetData
 
+
+def _empty_store():
+    store = AsyncMock()
+    store.get_analysis_cache.return_value = None
+    return store
+
+
 @pytest.mark.asyncio
 async def test_analyze_profile():
     """프로필 분석 테스트"""
@@ -31,6 +41,7 @@ async def test_analyze_profile():
 
         analyzer = ProfileAnalyzer()
         analyzer.client = mock_client
+        analyzer.store = _empty_store()
 
         result = await analyzer.analyze("testuser")
 
@@ -38,3 +49,99 @@ async def test_analyze_profile():
         assert result.username == "testuser"
         assert result.scores is not None
         assert len(result.insights) >= 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_serves_stale_and_refreshes(monkeypatch):
+    """만료된 분석은 즉시 반환하고 백그라운드에서 갱신"""
+    now = [1000.0]
+    monkeypatch.setattr("src.cache.memory.time.monotonic", lambda: now[0])
+
+    tweets = [
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ]
+    mock_response = AsyncMock()
+    mock_response.success = True
+    mock_response.profile = ProfileData(username="testuser", tweets=tweets)
+
+    with patch("src.services.profile_analyzer.SelaAPIClient") as MockClient:
+        mock_client = MockClient.return_value
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        analyzer = ProfileAnalyzer()
+        analyzer.store = _empty_store()
+        first = await analyzer.analyze("testuser")
+        assert await analyzer.analyze("TestUser") is first
+        assert mock_client.get_twitter_profile.await_count == 1
+
+        # Past the TTL: the stale result comes back without waiting
+        now[0] += analyzer._cache.ttl_seconds + 1
+        assert await analyzer.analyze("testuser") is first
+        await asyncio.sleep(0)
+        assert mock_client.get_twitter_profile.await_count == 2
+        assert analyzer._cache.get(("testuser", 20)) is not first
+
+        # refresh=True bypasses the profile store as well
+        await analyzer.analyze("testuser", refresh=True)
+        assert mock_client.get_twitter_profile.await_args.kwargs["max_age_seconds"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analysis_shared_through_store():
+    """저장된 분석을 다른 워커가 재사용, refresh는 저장소를 건너뜀"""
+    tweets = [
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ]
+    mock_response = AsyncMock()
+    mock_response.success = True
+    mock_response.profile = ProfileData(username="testuser", tweets=tweets)
+
+    with patch("src.services.profile_analyzer.SelaAPIClient") as MockClient:
+        mock_client = MockClient.return_value
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        first_worker = ProfileAnalyzer()
+        first_worker.store = _empty_store()
+        original = await first_worker.analyze("TestUser")
+        await asyncio.sleep(0)
+
+        username, scores, data = first_worker.store.save_analysis.await_args.args
+        assert username == "testuser"
+        assert first_worker.store.save_analysis.await_args.kwargs["ttl_seconds"] > 0
+
+        # Another worker with a cold in-process cache reads the saved row
+        second_worker = ProfileAnalyzer()
+        second_worker.store = _empty_store()
+        second_worker.store.get_analysis_cache.return_value = {
+            "x_username": username,
+            "analysis_data": data,
+            "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat(),
+        }
+        shared = await second_worker.analyze("testuser")
+        assert mock_client.get_twitter_profile.await_count == 1
+        assert shared.scores == original.scores
+        assert shared.features == original.features
+        assert shared.summary == original.summary
+
+        # A different post count or an explicit refresh still scrapes
+        await second_worker.analyze("testuser", post_count=50)
+        await second_worker.analyze("testuser", refresh=True)
+        assert mock_client.get_twitter_profile.await_count == 3
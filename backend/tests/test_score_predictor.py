@@ -1,6 +1,9 @@
 # backend/tests/test_score_predictor.py
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
+from src.engine import extract_post_features
 from src.services.score_predictor import ScorePredictor, PostAnalysisResult
 from src.services.sela_api_client import ProfileData, TweetData
 
@@ -94,3 +97,311 @@ async def test_predict_reply():
         assert result.context is not None
         # Reply to popular account should have context adjustments
         assert len(result.context.context_adjustments) > 0
+
+
+@pytest.mark.asyncio
+async def test_profile_features_stale_while_revalidate(monkeypatch):
+    """만료된 프로필 피처는 즉시 사용하고 갱신은 한 번만 실행"""
+    now = [1000.0]
+    monkeypatch.setattr("src.cache.memory.time.monotonic", lambda: now[0])
+
+    tweets = [
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ]
+    mock_response = AsyncMock()
+    mock_response.success = True
+    mock_response.profile = ProfileData(username="testuser", tweets=tweets)
+
+    with patch("src.services.score_predictor.SelaAPIClient") as MockClient:
+        mock_client = MockClient.return_value
+        release = asyncio.Event()
+
+        async def slow_profile(*args, **kwargs):
+            await release.wait()
+            return mock_response
+
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        predictor = ScorePredictor()
+        predictor.cache = AsyncMock()
+        predictor.cache.get_profile_cache = AsyncMock(return_value=None)
+
+        first = await predictor._get_profile_features("testuser")
+        assert mock_client.get_twitter_profile.await_count == 1
+
+        # Stale: concurrent callers get the old features, one refresh runs
+        now[0] += predictor._profile_cache.ttl_seconds + 1
+        mock_client.get_twitter_profile = AsyncMock(side_effect=slow_profile)
+        results = await asyncio.gather(
+            *(predictor._get_profile_features("testuser") for _ in range(5))
+        )
+        assert all(r is first for r in results)
+        await asyncio.sleep(0)
+        assert mock_client.get_twitter_profile.await_count == 1
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert predictor._profile_cache.get("testuser") is not first
+
+
+@pytest.mark.asyncio
+async def test_predict_many_ranks_and_limits_advisor_calls():
+    """배치 스코어링: 프로필 1회 조회, 상위 K개만 AI 팁"""
+    tweets = [
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ]
+    mock_profile = ProfileData(username="testuser", tweets=tweets)
+
+    with patch("src.services.score_predictor.SelaAPIClient") as MockClient:
+        mock_client = MockClient.return_value
+        mock_response = AsyncMock()
+        mock_response.success = True
+        mock_response.profile = mock_profile
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        predictor = ScorePredictor()
+        predictor.cache = AsyncMock()
+        predictor.cache.get_profile_cache = AsyncMock(return_value=None)
+        predictor.advisor.analyze_and_suggest = AsyncMock(return_value={
+            "suggestions": [{"action": "Add a question", "reason": "replies"}],
+        })
+
+        contents = [
+            "ok",
+            "What do you think about this new feature? 🤔 Let me know below!",
+            "Thread: 5 lessons from shipping a product this year 🧵",
+        ]
+        ranked = await predictor.predict_many("testuser", contents, top_k=1)
+
+        assert mock_client.get_twitter_profile.await_count == 1
+        assert predictor.advisor.analyze_and_suggest.await_count == 1
+        assert sorted(r.index for r in ranked) == [0, 1, 2]
+        overall = [r.result.scores.overall for r in ranked]
+        assert overall == sorted(overall, reverse=True)
+        assert ranked[0].result.quick_tips[0].tip_id == "algo_tip_0"
+        assert all(r.content == contents[r.index] for r in ranked)
+
+
+@pytest.mark.asyncio
+async def test_identical_drafts_are_memoized():
+    """동일한 초안은 피처 추출/스코어링을 다시 하지 않음"""
+    from dataclasses import replace
+
+    tweets = [
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ]
+    mock_profile = ProfileData(username="testuser", tweets=tweets)
+
+    with patch("src.services.score_predictor.SelaAPIClient") as MockClient, \
+            patch("src.services.score_predictor.extract_post_features",
+                  wraps=extract_post_features) as extract:
+        mock_client = MockClient.return_value
+        mock_response = AsyncMock()
+        mock_response.success = True
+        mock_response.profile = mock_profile
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        predictor = ScorePredictor()
+        predictor.cache = AsyncMock()
+        predictor.cache.get_profile_cache = AsyncMock(return_value=None)
+        predictor._generate_algorithm_tips = AsyncMock(return_value=[])
+        predictor.scorer.analyze_post = Mock(wraps=predictor.scorer.analyze_post)
+
+        first = await predictor.predict("testuser", "Same draft, what do you think?")
+        second = await predictor.predict("testuser", "Same draft, what do you think?")
+        assert second.scores is first.scores
+        assert extract.call_count == 1
+        assert predictor.scorer.analyze_post.call_count == 1
+
+        # media_type is part of the key
+        await predictor.predict("testuser", "Same draft, what do you think?", media_type="image")
+        assert extract.call_count == 2
+
+        # A changed profile re-scores the same (memoized) features
+        features = predictor._profile_cache.get("testuser")
+        predictor._profile_cache.set("testuser", replace(features, avg_engagement_rate=0.5))
+        await predictor.predict("testuser", "Same draft, what do you think?")
+        assert extract.call_count == 2
+        assert predictor.scorer.analyze_post.call_count == 3
+
+        assert predictor._features_memo.stats()["hits"] == 2
+        assert predictor._scores_memo.stats()["hit_rate"] == 0.25
+
+
+@pytest.mark.asyncio
+async def test_analyze_rebuilds_target_context_from_cached_post():
+    """타깃 포스트는 포스트 컨텍스트 캐시에서 재사용, 보정치는 최신 지표로 매번 계산"""
+    from src.services import sela_api_client
+
+    target_tweet = TweetData(
+        tweet_id="555001",
+        username="bigaccount",
+        content="Hot take: tests are documentation",
+        tweet_url="/bigaccount/status/555001",
+        likes_count=5000,
+        retweets_count=300,
+        replies_count=2000,
+        views_count=900000,
+    )
+    sela_api_client._post_contexts.clear()
+    sela_api_client._post_contexts.set("555001", target_tweet)
+
+    predictor = ScorePredictor()
+    mock_response = AsyncMock()
+    mock_response.success = True
+    mock_response.profile = ProfileData(username="testuser", tweets=[target_tweet])
+    predictor.client.get_twitter_profile = AsyncMock(return_value=mock_response)
+    predictor.client._find_post_direct = AsyncMock()
+    predictor.advisor.analyze_and_suggest = AsyncMock(return_value={"suggestions": []})
+
+    async def analyze(content):
+        result = await predictor.predict(
+            username="testuser",
+            content=content,
+            post_type="reply",
+            target_post_url="https://twitter.com/BigAccount/status/555001?s=20",
+        )
+        assert result.context.target_post.tweet_id == "555001"
+        return result.context.context_adjustments
+
+    adjustments = await analyze("Agreed, and they never go stale")
+    assert "large_account_bonus" in adjustments
+    assert "reply_competition" in adjustments
+
+    # Refreshed metrics reach the next analyze call
+    sela_api_client._post_contexts.set(
+        "555001", target_tweet.model_copy(update={"replies_count": 10})
+    )
+    adjustments = await analyze("Agreed!")
+    assert "large_account_bonus" in adjustments
+    assert "reply_competition" not in adjustments
+    predictor.client._find_post_direct.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_slow_advisor_falls_back_within_budget():
+    """어드바이저가 예산을 넘기면 규칙 기반 팁을 즉시 반환, 호출은 백그라운드에서 완료"""
+    mock_profile = ProfileData(username="testuser", tweets=[
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ])
+
+    with patch("src.services.score_predictor.SelaAPIClient") as MockClient:
+        mock_client = MockClient.return_value
+        mock_response = AsyncMock()
+        mock_response.success = True
+        mock_response.profile = mock_profile
+        mock_client.get_twitter_profile = AsyncMock(return_value=mock_response)
+
+        predictor = ScorePredictor()
+        finished = asyncio.Event()
+
+        async def slow_advice(**kwargs):
+            await asyncio.sleep(0.3)
+            finished.set()
+            return {"suggestions": [{"action": "Add a question", "reason": "replies"}]}
+
+        predictor.advisor.analyze_and_suggest = AsyncMock(side_effect=slow_advice)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await predictor.predict(
+            username="testuser",
+            content="Shipping a new feature today",
+            budget_seconds=0.05,
+        )
+
+        assert loop.time() - started < 0.25
+        assert result.quick_tips
+        assert all(not t.tip_id.startswith("algo_tip") for t in result.quick_tips)
+        assert len(predictor._background_tips) == 1
+
+        # The advisor call isn't cancelled; it finishes to fill the cache
+        await asyncio.wait_for(finished.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert not predictor._background_tips
+
+        # Without a budget, the advisor's tips are awaited
+        result = await predictor.predict(
+            username="testuser",
+            content="Shipping a new feature today",
+            budget_seconds=0,
+        )
+        assert result.quick_tips[0].tip_id == "algo_tip_0"
+
+
+@pytest.mark.asyncio
+async def test_tip_budget_starts_when_the_advisor_is_called():
+    """팁 예산은 어드바이저 호출 시점부터 계산 (느린 프로필 조회가 소모하지 않음)"""
+    mock_profile = ProfileData(username="testuser", tweets=[
+        TweetData(
+            tweet_id="1",
+            username="testuser",
+            content="Hello world!",
+            tweet_url="/testuser/1",
+            likes_count=100,
+            retweets_count=10,
+            replies_count=5,
+            views_count=1000,
+        )
+    ])
+
+    with patch("src.services.score_predictor.SelaAPIClient") as MockClient:
+        mock_response = AsyncMock()
+        mock_response.success = True
+        mock_response.profile = mock_profile
+
+        async def slow_profile(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return mock_response
+
+        MockClient.return_value.get_twitter_profile = AsyncMock(side_effect=slow_profile)
+
+        predictor = ScorePredictor()
+        predictor.advisor.analyze_and_suggest = AsyncMock(return_value={
+            "suggestions": [{"action": "Add a question", "reason": "replies"}],
+        })
+        result = await predictor.predict(
+            username="slowprofile",
+            content="Shipping a new feature today",
+            budget_seconds=0.05,
+        )
+
+    assert result.quick_tips[0].tip_id == "algo_tip_0"
+    assert not predictor._background_tips
@@ -0,0 +1,351 @@
+# backend/tests/test_sela_api_client.py
+import asyncio
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from src.services.sela_api_client import (
+    SNOWFLAKE_EPOCH_MS,
+    ProfileData,
+    ProfileStore,
+    ScrapeResponse,
+    SelaAPIClient,
+    TweetData,
+    close_http_client,
+    get_http_client,
+    snowflake_to_datetime,
+)
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_reused_and_closed():
+    """공유 HTTP 클라이언트 재사용/종료 테스트"""
+    client = get_http_client()
+    assert get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+
+    # A fresh client is created on next use
+    new_client = get_http_client()
+    assert new_client is not client
+    await close_http_client()
+
+
+def _make_tweet(tweet_id: str, posted_at: datetime) -> TweetData:
+    return TweetData(
+        tweet_id=tweet_id,
+        username="testuser",
+        content=f"tweet {tweet_id}",
+        tweet_url=f"/testuser/status/{tweet_id}",
+        posted_at=posted_at,
+    )
+
+
+def _timeline(count: int, start: datetime, interval: timedelta) -> list[TweetData]:
+    return [_make_tweet(str(1000 + i), start - interval * i) for i in range(count)]
+
+
+def _client_with_timeline(tweets: list[TweetData]) -> SelaAPIClient:
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+
+    async def get_twitter_profile(username, post_count=20, max_age_seconds=None):
+        response = ScrapeResponse(success=True)
+        response.profile = ProfileData(username=username, tweets=tweets[:post_count])
+        return response
+
+    client.get_twitter_profile = AsyncMock(side_effect=get_twitter_profile)
+    client._find_post_direct = AsyncMock(return_value=None)
+    return client
+
+
+def test_snowflake_to_datetime():
+    """트윗 ID 타임스탬프 디코딩 테스트"""
+    # Snowflake ID for 2023-01-01T00:00:00Z
+    ms = int(datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    tweet_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+    assert snowflake_to_datetime(tweet_id) == datetime(2023, 1, 1, tzinfo=timezone.utc)
+    assert snowflake_to_datetime("not-a-number") is None
+    assert snowflake_to_datetime("9" * 40) is None  # Past any representable date
+
+
+@pytest.mark.asyncio
+async def test_get_post_context_out_of_range_id_falls_back_to_ladder():
+    """범위를 벗어난 트윗 ID도 타임라인 검색으로 처리"""
+    now = datetime.now(timezone.utc)
+    client = _client_with_timeline(_timeline(300, now, timedelta(hours=1)))
+
+    tweet = await client.get_post_context(f"https://x.com/testuser/status/{'9' * 40}")
+
+    assert tweet is None
+    assert client.get_twitter_profile.await_count >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_post_context_found_in_first_step():
+    """첫 단계에서 포스트 찾기"""
+    now = datetime.now(timezone.utc)
+    client = _client_with_timeline(_timeline(300, now, timedelta(hours=1)))
+
+    tweet = await client.get_post_context("https://x.com/testuser/status/1010")
+
+    assert tweet is not None and tweet.tweet_id == "1010"
+    assert client.get_twitter_profile.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_post_context_stops_past_creation_time():
+    """포스트 생성 시점을 지나면 검색 중단"""
+    now = datetime.now(timezone.utc)
+    client = _client_with_timeline(_timeline(300, now, timedelta(minutes=1)))
+
+    # Created 30 minutes ago - within the first 50 posts' time span but absent
+    ms = int((now - timedelta(minutes=30)).timestamp() * 1000)
+    missing_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+
+    tweet = await client.get_post_context(f"https://x.com/testuser/status/{missing_id}")
+
+    assert tweet is None
+    assert client.get_twitter_profile.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_post_context_skips_ladder_for_old_posts():
+    """오래된 포스트는 추가 스크랩 없이 종료"""
+    now = datetime.now(timezone.utc)
+    client = _client_with_timeline(_timeline(300, now, timedelta(minutes=1)))
+
+    # 50 posts cover ~50 minutes; a week-old post is far beyond 200 posts
+    ms = int((now - timedelta(days=7)).timestamp() * 1000)
+    old_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+
+    tweet = await client.get_post_context(f"https://x.com/testuser/status/{old_id}")
+
+    assert tweet is None
+    assert client.get_twitter_profile.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_post_context_jumps_to_estimated_step():
+    """게시 빈도로 필요한 단계로 바로 이동"""
+    now = datetime.now(timezone.utc)
+    tweets = _timeline(300, now, timedelta(hours=1))
+    # Target sits at position 130 (~130 hours ago)
+    target_time = now - timedelta(hours=130)
+    ms = int(target_time.timestamp() * 1000)
+    target_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+    tweets[130] = _make_tweet(target_id, target_time)
+    client = _client_with_timeline(tweets)
+
+    tweet = await client.get_post_context(f"https://x.com/testuser/status/{target_id}")
+
+    assert tweet is not None and tweet.tweet_id == target_id
+    counts = [c.kwargs["post_count"] for c in client.get_twitter_profile.await_args_list]
+    assert counts == [50, 150]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profile_scrapes_are_coalesced():
+    """같은 사용자 동시 스크랩 병합"""
+    now = datetime.now(timezone.utc)
+    tweets = _timeline(20, now, timedelta(hours=1))
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+
+    async def fetch(username, post_count):
+        await asyncio.sleep(0.01)
+        response = ScrapeResponse(success=True)
+        response.profile = ProfileData(username=username, tweets=tweets[:post_count])
+        return response
+
+    client._fetch_twitter_profile = AsyncMock(side_effect=fetch)
+
+    first = asyncio.create_task(client.get_twitter_profile("testuser", post_count=20))
+    await asyncio.sleep(0)
+    second, third = await asyncio.gather(
+        client.get_twitter_profile("@TestUser", post_count=10),
+        client.get_twitter_profile("testuser", post_count=20),
+    )
+
+    assert client._fetch_twitter_profile.await_count == 1
+    assert len((await first).profile.tweets) == 20
+    assert len(second.profile.tweets) == 10
+    assert len(third.profile.tweets) == 20
+
+
+@pytest.mark.asyncio
+async def test_direct_lookup_backs_off_only_on_empty_result():
+    """직접 조회: 빈 결과일 때만 비활성화, 네트워크 오류는 제외"""
+    SelaAPIClient._post_scrape_disabled_until = 0.0
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+    url = "https://x.com/testuser/status/1001"
+
+    client._scrape = AsyncMock(return_value=ScrapeResponse(success=False, error="timeout"))
+    assert await client._find_post_direct(url, "1001") is None
+    assert SelaAPIClient._post_scrape_disabled_until == 0.0
+
+    client._scrape = AsyncMock(return_value=ScrapeResponse(
+        success=True, data={"data": {"result": []}}
+    ))
+    assert await client._find_post_direct(url, "1001") is None
+    assert SelaAPIClient._post_scrape_disabled_until > 0
+
+    # Skipped while backed off
+    assert await client._find_post_direct(url, "1001") is None
+    assert client._scrape.await_count == 1
+    SelaAPIClient._post_scrape_disabled_until = 0.0
+
+
+def test_estimate_lookup_count_accepts_naive_timestamps():
+    """시간대 없는 posted_at은 UTC로 간주"""
+    now = datetime.now(timezone.utc)
+    tweets = [
+        _make_tweet(t.tweet_id, t.posted_at.replace(tzinfo=None))
+        for t in _timeline(50, now, timedelta(minutes=1))
+    ]
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+
+    assert client._estimate_lookup_count(tweets, now - timedelta(days=7), 50) is None
+    assert client._estimate_lookup_count(tweets, now - timedelta(minutes=90), 50) == 100
+
+
+def test_profile_store_serves_smaller_slices():
+    """큰 슬라이스로 작은 요청 응답"""
+    now = datetime.now(timezone.utc)
+    store = ProfileStore()
+    store.put("TestUser", ProfileData(username="testuser", tweets=_timeline(50, now, timedelta(hours=1))), 50)
+
+    profile = store.get("testuser", 10)
+    assert profile is not None
+    assert [t.tweet_id for t in profile.tweets] == [str(1000 + i) for i in range(10)]
+    assert store.get("testuser", 100) is None
+    assert store.get("testuser", 10, max_age_seconds=0) is None
+
+    # A smaller scrape doesn't replace the fresh larger slice
+    store.put("testuser", ProfileData(username="testuser", tweets=_timeline(5, now, timedelta(hours=1))), 5)
+    assert len(store.get("testuser", 50).tweets) == 50
+
+
+def test_profile_store_short_slice_does_not_cover_larger_requests():
+    """응답이 짧아도 더 큰 요청은 다시 스크랩 (과소 응답일 수 있음)"""
+    now = datetime.now(timezone.utc)
+    store = ProfileStore()
+    store.put("testuser", ProfileData(username="testuser", tweets=_timeline(3, now, timedelta(hours=1))), 20)
+
+    assert len(store.get("testuser", 20).tweets) == 3
+    assert store.get("testuser", 50) is None
+
+
+@pytest.mark.asyncio
+async def test_timeline_lookup_skips_slices_older_than_the_tweet(monkeypatch):
+    """트윗 생성 전에 저장된 프로필 슬라이스는 조회에 쓰지 않음"""
+    from src.services import sela_api_client
+
+    now = datetime.now(timezone.utc)
+    store = ProfileStore()
+    monkeypatch.setattr(sela_api_client, "_profile_store", store)
+    old_tweets = _timeline(50, now - timedelta(minutes=2), timedelta(minutes=1))
+    store.put("testuser", ProfileData(username="testuser", tweets=old_tweets), 50)
+    # Pretend the slice was scraped 2 minutes ago
+    store._profiles["testuser"].fetched_at -= 120
+
+    # Posted a minute ago, after the stored slice was fetched
+    ms = int((now - timedelta(minutes=1)).timestamp() * 1000)
+    new_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+    new_tweet = _make_tweet(new_id, now - timedelta(minutes=1))
+
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+
+    async def fetch(username, post_count):
+        response = ScrapeResponse(success=True)
+        response.profile = ProfileData(username=username, tweets=[new_tweet, *old_tweets][:post_count])
+        return response
+
+    client._fetch_twitter_profile = AsyncMock(side_effect=fetch)
+
+    tweet = await client._find_post_in_timeline("testuser", new_id)
+
+    assert tweet is not None and tweet.tweet_id == new_id
+    client._fetch_twitter_profile.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_post_context_cached_by_tweet_id():
+    """타깃 포스트 컨텍스트: 트윗 ID로 캐시, 지표 만료 후 백그라운드 갱신"""
+    from src.services import sela_api_client
+
+    sela_api_client._post_contexts.clear()
+
+    tweet = _make_tweet("777001", datetime.now(timezone.utc))
+    tweet.likes_count = 10
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+    client.post_store = AsyncMock()
+    client.post_store.get_post_context_cache.return_value = None
+
+    async def find(post_url, tweet_id):
+        await asyncio.sleep(0.01)
+        return tweet.model_copy()
+
+    client._find_post_direct = AsyncMock(side_effect=find)
+
+    # Concurrent lookups of the same post (different URL forms) share one scrape
+    results = await asyncio.gather(
+        client.get_post_context("https://x.com/testuser/status/777001"),
+        client.get_post_context("https://twitter.com/TestUser/status/777001?s=20"),
+        client.get_post_context("https://x.com/testuser/status/777001/photo/1"),
+    )
+    assert all(r.tweet_id == "777001" for r in results)
+    assert client._find_post_direct.await_count == 1
+
+    await asyncio.sleep(0)
+    saved = client.post_store.set_post_context_cache.await_args
+    assert "likes_count" not in saved.kwargs["content_data"]
+    assert saved.kwargs["metrics_data"]["likes_count"] == 10
+
+    # Metrics past their TTL: the cached post comes back, one refresh runs
+    sela_api_client._post_contexts.set("777001", results[0], ttl_seconds=-1)
+    tweet.likes_count = 50
+    stale = await client.get_post_context("https://x.com/testuser/status/777001")
+    assert stale.likes_count == 10
+    await asyncio.sleep(0.05)
+    assert client._find_post_direct.await_count == 2
+    fresh = await client.get_post_context("https://x.com/testuser/status/777001")
+    assert fresh.likes_count == 50
+
+    # A worker with a cold memory tier reads the Supabase row
+    sela_api_client._post_contexts.clear()
+    other = SelaAPIClient(base_url="http://sela.test", api_key="test")
+    other.post_store = AsyncMock()
+    other.post_store.get_post_context_cache.return_value = {
+        "content_data": saved.kwargs["content_data"],
+        "metrics_data": saved.kwargs["metrics_data"],
+    }
+    other._find_post_direct = AsyncMock()
+    stored = await other.get_post_context("https://x.com/testuser/status/777001")
+    assert stored.content == tweet.content and stored.likes_count == 10
+    other._find_post_direct.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_timeline_lookup_continues_after_a_short_slice():
+    """Sela가 요청보다 적게 반환해도 다음 단계에서 계속 검색"""
+    now = datetime.now(timezone.utc)
+    tweets = _timeline(300, now, timedelta(hours=1))
+    target = tweets[70]
+    ms = int(target.posted_at.timestamp() * 1000)
+    target.tweet_id = str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+
+    client = SelaAPIClient(base_url="http://sela.test", api_key="test")
+
+    async def get_twitter_profile(username, post_count=20, max_age_seconds=None):
+        # The 50-post slice comes back under-filled
+        count = 30 if post_count == 50 else post_count
+        response = ScrapeResponse(success=True)
+        response.profile = ProfileData(username=username, tweets=tweets[:count])
+        return response
+
+    client.get_twitter_profile = AsyncMock(side_effect=get_twitter_profile)
+
+    found = await client._find_post_in_timeline("testuser", target.tweet_id)
+
+    assert found is target
+    assert [c.kwargs["post_count"] for c in client.get_twitter_profile.await_args_list] == [50, 100]
@@ -0,0 +1,99 @@
+# backend/tests/test_supabase_cache.py
+import asyncio
+import time
+
+import pytest
+from src.db.supabase_client import SupabaseCache
+
+
+class _SlowQuery:
+    """Query builder stand-in whose execute() blocks like a network call."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def __getattr__(self, name):
+        # Builder methods (select/eq/gte/limit...) return the same query
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.delay)
+        return type("Result", (), {"data": [{"x_username": "testuser"}]})()
+
+
+class _SlowClient:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def table(self, name):
+        return _SlowQuery(self.delay)
+
+
+@pytest.mark.asyncio
+async def test_supabase_calls_do_not_block_event_loop():
+    """Supabase 호출이 이벤트 루프를 막지 않음"""
+    cache = SupabaseCache()
+    cache.client = _SlowClient(delay=0.2)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    result = await cache.get_profile_cache("testuser")
+    ticker_task.cancel()
+
+    assert result == {"x_username": "testuser"}
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_supabase_call_timeout_is_cache_miss():
+    """타임아웃은 캐시 미스로 처리"""
+    cache = SupabaseCache()
+    cache.client = _SlowClient(delay=0.5)
+    cache.timeout_seconds = 0.05
+
+    assert await cache.get_profile_cache("testuser") is None
+
+
+@pytest.mark.asyncio
+async def test_cleanup_requests_counts_without_returning_rows():
+    """만료 캐시 정리: 삭제된 행 대신 개수만 요청"""
+    from postgrest import CountMethod, ReturnMethod
+
+    deletes = []
+
+    class _DeleteQuery:
+        def __init__(self, table):
+            self.table = table
+
+        def delete(self, **kwargs):
+            deletes.append((self.table, kwargs))
+            return self
+
+        def lt(self, column, value):
+            return self
+
+        def execute(self):
+            return type("Result", (), {"data": [], "count": len(self.table)})()
+
+    cache = SupabaseCache()
+    cache.client = type("Client", (), {"table": lambda self, name: _DeleteQuery(name)})()
+
+    deleted = await cache.cleanup_expired_cache()
+
+    assert deleted == {
+        "profile_cache": len("profile_cache"),
+        "profile_analyses": len("profile_analyses"),
+        "post_context_cache": len("post_context_cache"),
+        "post_interpretations": len("post_interpretations"),
+    }
+    assert all(
+        kwargs == {"count": CountMethod.exact, "returning": ReturnMethod.minimal}
+        for _, kwargs in deletes
+    )
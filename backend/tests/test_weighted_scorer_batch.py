@@ -0,0 +1,125 @@
+# backend/tests/test_weighted_scorer_batch.py
+import itertools
+import random
+from dataclasses import astuple
+
+import numpy as np
+import pytest
+from src.engine.feature_extractor import (
+    PostFeatures,
+    ProfileFeatures,
+    extract_post_features,
+)
+from src.engine.weighted_scorer import (
+    ACTION_FIELDS,
+    DIMENSIONS,
+    SCORE_WEIGHTS,
+    WEIGHT_MATRIX,
+    WeightedScorer,
+)
+
+
+def _profile(engagement_rate: float) -> ProfileFeatures:
+    return ProfileFeatures(
+        username="test",
+        tweet_count=100,
+        avg_engagement_rate=engagement_rate,
+        avg_likes=500,
+        avg_retweets=50,
+        avg_replies=30,
+        avg_views=10000,
+        retweet_ratio=0.2,
+        quote_ratio=0.1,
+        media_ratio=0.6,
+        engagement_consistency=0.8,
+    )
+
+
+def _all_flag_combinations() -> list[PostFeatures]:
+    """Every combination of the flags the scorer looks at."""
+    posts = []
+    for question, cta, emoji, media_type, quote, char_count, hashtags in itertools.product(
+        (False, True),
+        (False, True),
+        (False, True),
+        (None, "image", "video", "gif"),
+        (False, True),
+        (10, 60, 120, 250, 400),
+        (0, 1, 3, 7),
+    ):
+        posts.append(PostFeatures(
+            char_count=char_count,
+            word_count=char_count // 5,
+            sentence_count=1,
+            has_question=question,
+            has_cta=cta,
+            has_emoji=emoji,
+            emoji_count=int(emoji),
+            has_media=media_type is not None,
+            media_type=media_type,
+            hashtag_count=hashtags,
+            mention_count=0,
+            has_url=False,
+            is_thread_starter=False,
+            is_quote=quote,
+        ))
+    return posts
+
+
+def _assert_parity(scorer, posts, profile, context_boost=None):
+    batch = scorer.analyze_posts(posts, profile, context_boost)
+    assert len(batch) == len(posts)
+    for post, (scores, probs) in zip(posts, batch):
+        expected_scores, expected_probs = scorer.analyze_post(post, profile, context_boost)
+        # Exact equality: the batch path must not drift from the scalar one
+        assert astuple(probs) == astuple(expected_probs)
+        assert astuple(scores) == astuple(expected_scores)
+
+
+def test_weight_matrix_matches_score_weights():
+    """5x14 가중치 행렬이 SCORE_WEIGHTS와 일치"""
+    assert WEIGHT_MATRIX.shape == (len(DIMENSIONS), len(ACTION_FIELDS))
+    for row, dimension in enumerate(DIMENSIONS):
+        for col, action in enumerate(ACTION_FIELDS):
+            assert WEIGHT_MATRIX[row, col] == SCORE_WEIGHTS[dimension].get(action, 0.0)
+
+
+@pytest.mark.parametrize("engagement_rate", [0.0, 0.01, 0.03, 0.08, 0.5, 3.0])
+def test_batch_matches_scalar_for_all_flag_combinations(engagement_rate):
+    """배치 경로와 단일 경로의 결과가 완전히 동일"""
+    _assert_parity(WeightedScorer(), _all_flag_combinations(), _profile(engagement_rate))
+
+
+@pytest.mark.parametrize("context_boost", [
+    {"p_click": 0.25, "p_profile_click": 0.20},
+    {"p_reply": 0.5, "p_favorite": -0.3, "not_a_field": 1.0},
+    {"p_video_view": 5.0, "p_not_interested": -1.0},
+])
+def test_batch_matches_scalar_with_context_boost(context_boost):
+    """컨텍스트 부스트 적용 시 동일성"""
+    _assert_parity(
+        WeightedScorer(), _all_flag_combinations(), _profile(0.05), context_boost
+    )
+
+
+def test_batch_matches_scalar_for_extracted_posts():
+    """실제 텍스트에서 추출한 피처로 동일성 확인"""
+    rng = random.Random(42)
+    words = ["launch", "today", "what", "think?", "🚀", "#AI", "@sela", "check", "this",
+             "out", "https://x.com", "🧵", "great", "thread", "안녕하세요", "reply"]
+    posts = [
+        extract_post_features(
+            " ".join(rng.choice(words) for _ in range(rng.randint(0, 60))),
+            media_type=rng.choice([None, "image", "video", "gif"]),
+            is_quote=rng.random() < 0.3,
+        )
+        for _ in range(500)
+    ]
+    _assert_parity(WeightedScorer(), posts, _profile(0.04), {"p_click": 0.1})
+
+
+def test_batch_with_no_posts():
+    """빈 배치 처리"""
+    scorer = WeightedScorer()
+    assert scorer.analyze_posts([], _profile(0.03)) == []
+    assert scorer.calculate_scores_batch(np.zeros((0, len(ACTION_FIELDS)))).shape == (0, 5)
@@ -0,0 +1,65 @@
+# backend/tests/test_x_algorithm_advisor.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from src.engine import PentagonScores, extract_post_features
+from src.services.x_algorithm_advisor import XAlgorithmAdvisor
+
+
+def _advisor_with_fake_llm():
+    advisor = XAlgorithmAdvisor()
+    reply = '{"suggestions": [], "optimized_content": "x", "score_predictions": {}}'
+    advisor.llm = SimpleNamespace(create=AsyncMock(return_value=SimpleNamespace(
+        content=[SimpleNamespace(text=reply)]
+    )))
+    advisor.cache.get_suggestion_cache = AsyncMock(return_value=None)
+    advisor.cache.set_suggestion_cache = AsyncMock()
+    return advisor
+
+
+async def _suggest(advisor, content):
+    return await advisor.analyze_and_suggest(
+        content,
+        PentagonScores(reach=50, engagement=40, virality=30, quality=60, longevity=20),
+        extract_post_features(content),
+        language="en",
+    )
+
+
+@pytest.mark.asyncio
+async def test_suggestions_key_on_full_text_and_reuse_near_duplicates():
+    """전체 텍스트로 캐시 키 생성, 유사한 초안은 이전 결과 재사용"""
+    advisor = _advisor_with_fake_llm()
+    draft = "We just shipped the new scoring engine for X posts. " * 2 + "Thoughts?"
+
+    first = await _suggest(advisor, draft)
+    # A one-character typo while typing reuses the previous result
+    assert await _suggest(advisor, draft.replace("scoring", "scorng", 1)) is first
+    assert await _suggest(advisor, draft.upper()) is first
+    assert advisor.llm.create.await_count == 1
+
+    # Same first 100 characters, different ending: no longer collides
+    await _suggest(advisor, draft[:100] + " Completely different second half about hiring.")
+    assert advisor.llm.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_one_draft_share_a_call():
+    """같은 초안의 동시 요청은 Claude 호출 1회 공유"""
+    import asyncio
+
+    advisor = _advisor_with_fake_llm()
+    reply = advisor.llm.create.return_value
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.05)
+        return reply
+
+    advisor.llm.create.side_effect = slow_create
+    draft = "Coalesce identical requests so a burst of typing costs one call."
+
+    results = await asyncio.gather(*(_suggest(advisor, draft) for _ in range(4)))
+    assert all(r is results[0] for r in results)
+    assert advisor.llm.create.await_count == 1
+    assert advisor.cache.get_suggestion_cache.await_count == 1